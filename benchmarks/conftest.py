@@ -0,0 +1,170 @@
+"""
+Shared setup of the benchmarks: the django settings, the SQLite table of the filter benchmarks and the distributions
+of the inputs.
+
+    python -m pytest benchmarks
+
+JALALIFY_BENCHMARK_ROWS sets the number of rows of the table (1,000,000 by default) and JALALIFY_BENCHMARK_DB a SQLite
+file to keep it in between runs (in memory by default).
+"""
+import os
+import random
+from datetime import date, datetime, timedelta, timezone
+
+import django
+import pytest
+from django.conf import settings
+
+ROWS = int(os.environ.get("JALALIFY_BENCHMARK_ROWS", 1_000_000))
+DATABASE = os.environ.get("JALALIFY_BENCHMARK_DB", ":memory:")
+# number of values each benchmark round converts
+SAMPLE_SIZE = 1000
+INSERT_BATCH_SIZE = 50_000
+
+if not settings.configured:
+    settings.configure(
+        DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": DATABASE}},
+        INSTALLED_APPS=[
+            "django.contrib.admin.apps.SimpleAdminConfig",
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "django.contrib.messages",
+            "django.contrib.sessions",
+            "django_jalalify",
+        ],
+        SECRET_KEY="django-jalalify-benchmarks",
+        USE_TZ=True,
+        TIME_ZONE="Asia/Tehran",
+    )
+    django.setup()
+
+from django.db import connection, models  # noqa: E402
+
+from django_jalalify import JalaliDatetime  # noqa: E402
+from django_jalalify.mixins import FieldDateTimeInJalaliGeneratorMixin  # noqa: E402
+from django_jalalify.timezone import TEHRAN_ZONE  # noqa: E402
+
+
+class Payment(FieldDateTimeInJalaliGeneratorMixin, models.Model):
+    created_at = models.DateTimeField(db_index=True)
+    amount = models.IntegerField()
+
+    class Meta:
+        app_label = "django_jalalify"
+        db_table = "django_jalalify_benchmark_payment"
+
+
+# the parts of machine_info which make the timings of two runs comparable
+COMPARED_MACHINE_INFO = ["machine", "python_implementation", "python_version"]
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    output_json["rows"] = ROWS
+    # the comparisons only read the stats, without the timings of every round the baseline stays small
+    for benchmark in output_json["benchmarks"]:
+        benchmark["stats"].pop("data", None)
+
+
+def pytest_benchmark_compare_machine_info(config, benchmarksession, machine_info, compared_benchmark):
+    compared_machine_info = compared_benchmark["machine_info"]
+    same_machine = all(machine_info.get(key) == compared_machine_info.get(key) for key in COMPARED_MACHINE_INFO)
+    same_cpu = machine_info.get("cpu", {}).get("brand_raw") == compared_machine_info.get("cpu", {}).get("brand_raw")
+    if not (same_machine and same_cpu and compared_benchmark.get("rows") == ROWS):
+        # --benchmark-compare-fail still applies, the differences may come from the machine rather than the code
+        benchmarksession.logger.warning("The baseline was recorded on another machine or with another number of "
+                                        "rows, record a baseline here or run without comparing (-o addopts=\"\").")
+
+
+# 1400/01/01 and 1403/01/01 in Tehran, the rows of the table are spread evenly between them
+ROWS_START = datetime(2021, 3, 20, 20, 30, tzinfo=timezone.utc)
+ROWS_END = datetime(2024, 3, 19, 20, 30, tzinfo=timezone.utc)
+
+
+def _uniform(rng, start, end, size):
+    seconds = int((end - start).total_seconds())
+    return [start + timedelta(seconds=rng.randrange(seconds), microseconds=rng.randrange(10 ** 6)) for _ in range(size)]
+
+
+def _recent(rng, size):
+    """
+    the last 30 days, most of them in the last few: the dates a dashboard or an API mostly sees.
+    """
+    return [ROWS_END - timedelta(days=rng.expovariate(1 / 3) % 30, microseconds=rng.randrange(10 ** 6))
+            for _ in range(size)]
+
+
+def _midnights(rng, size):
+    """
+    within two minutes of a Tehran local midnight: the dates at which a day based cache or rounding is tested hardest.
+    """
+    days = (ROWS_END - ROWS_START).days
+    moments = []
+    for _ in range(size):
+        local_date = date(2021, 3, 21) + timedelta(days=rng.randrange(days))
+        midnight = datetime.combine(local_date, datetime.min.time(), TEHRAN_ZONE).astimezone(timezone.utc)
+        moments.append(midnight + timedelta(seconds=rng.uniform(-120, 120)))
+    return moments
+
+
+DATETIME_DISTRIBUTIONS = {
+    "recent": _recent,
+    "uniform": lambda rng, size: _uniform(rng, ROWS_START, ROWS_END, size),
+    # 1357 to 1401, through every DST period of the zone
+    "historical": lambda rng, size: _uniform(rng, datetime(1978, 3, 21, tzinfo=timezone.utc), ROWS_START, size),
+    "midnights": _midnights,
+}
+
+
+@pytest.fixture(scope="session", params=DATETIME_DISTRIBUTIONS, ids=DATETIME_DISTRIBUTIONS)
+def datetimes(request):
+    """
+    SAMPLE_SIZE aware UTC datetimes of each distribution.
+    """
+    return DATETIME_DISTRIBUTIONS[request.param](random.Random(0), SAMPLE_SIZE)
+
+
+@pytest.fixture(scope="session")
+def jalali_datetimes(datetimes):
+    return [JalaliDatetime(value.astimezone(TEHRAN_ZONE)) for value in datetimes]
+
+
+@pytest.fixture(scope="session")
+def jalali_strings(jalali_datetimes):
+    """
+    "YYYY/mm/dd HH:MM:SS" jalali strings of the datetimes in Tehran.
+    """
+    return [value.strftime("%Y/%m/%d %H:%M:%S") for value in jalali_datetimes]
+
+
+def _create_payments():
+    with connection.cursor() as cursor:
+        if Payment._meta.db_table in connection.introspection.table_names(cursor):
+            if Payment.objects.count() == ROWS:
+                return
+            with connection.schema_editor() as editor:
+                editor.delete_model(Payment)
+    with connection.schema_editor() as editor:
+        editor.create_model(Payment)
+    rng = random.Random(0)
+    start = ROWS_START.replace(tzinfo=None)
+    step = (ROWS_END - ROWS_START) / ROWS
+    insert = "INSERT INTO %s (created_at, amount) VALUES (?, ?)" % Payment._meta.db_table
+    # straight to sqlite3, as django's cursor wrapper is the slowest part of inserting a million rows
+    with connection.connection:
+        for batch_start in range(0, ROWS, INSERT_BATCH_SIZE):
+            # like a log table, the rows are created in order: each one at a random moment of its own slot of step
+            rows = [
+                ((start + step * (row + rng.random())).isoformat(" ", "microseconds"), rng.randrange(10 ** 6))
+                for row in range(batch_start, min(batch_start + INSERT_BATCH_SIZE, ROWS))
+            ]
+            # the way django stores aware datetimes on SQLite: naive UTC
+            connection.connection.executemany(insert, rows)
+
+
+@pytest.fixture(scope="session")
+def payments():
+    """
+    the Payment model, with its table of ROWS rows.
+    """
+    _create_payments()
+    return Payment
@@ -0,0 +1,43 @@
+import pytest
+from django.contrib import admin
+from django.test import RequestFactory
+
+from django_jalalify.admin.filters import DateRangeFilter
+
+# the ranges an admin user picks: a day, a month and a year of the rows
+RANGES = {
+    "day": {"created_at__range__gte": "1401-06-15", "created_at__range__lte": "1401-06-15"},
+    "month": {"created_at__range__gte": "1401-06-01", "created_at__range__lte": "1401-06-31"},
+    "year": {"created_at__range__gte": "1401-01-01", "created_at__range__lte": "1401-12-29"},
+    "open_ended": {"created_at__range__gte": "1402-10-01"},
+}
+MODES = {"closed": False, "half_open": True}
+
+
+@pytest.mark.parametrize("params", RANGES.values(), ids=RANGES.keys())
+@pytest.mark.parametrize("half_open_range", MODES.values(), ids=MODES.keys())
+def test_date_range_filter_queryset(benchmark, payments, params, half_open_range):
+    filter_class = type("BenchmarkDateRangeFilter", (DateRangeFilter,), {"half_open_range": half_open_range})
+    model_admin = admin.ModelAdmin(payments, admin.site)
+    field = payments._meta.get_field("created_at")
+
+    def filter_and_count():
+        request = RequestFactory().get("/")
+        range_filter = filter_class(field, request, dict(params), payments, model_admin, "created_at")
+        return range_filter.queryset(request, payments.objects.all()).count()
+
+    assert benchmark(filter_and_count) > 0
+
+
+@pytest.mark.parametrize("shortcut", ["today", "this_month", "last_30_days"])
+def test_date_range_filter_shortcut_queryset(benchmark, payments, shortcut):
+    model_admin = admin.ModelAdmin(payments, admin.site)
+    field = payments._meta.get_field("created_at")
+    params = {"created_at__range__shortcut": shortcut}
+
+    def filter_and_count():
+        request = RequestFactory().get("/")
+        range_filter = DateRangeFilter(field, request, dict(params), payments, model_admin, "created_at")
+        return range_filter.queryset(request, payments.objects.all()).count()
+
+    benchmark(filter_and_count)
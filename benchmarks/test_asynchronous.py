@@ -0,0 +1,54 @@
+"""
+Load test of the async batch conversions: concurrent coroutines convert large batches while probes measure how late
+the event loop serves a 1ms sleep. The 99th percentile of the lag (the median of the rounds) is saved as the
+"p99_lag_ms" extra info.
+"""
+import asyncio
+import time
+
+import pytest
+
+from django_jalalify.asynchronous import aconvert_many, convert_many
+
+BATCH_SIZE = 20_000
+BATCHES = 8
+PROBES = 50
+PROBE_SLEEP = 0.001
+
+
+async def _inline_convert_many(datetimes):
+    return convert_many(datetimes)
+
+
+CONVERTERS = {"inline": _inline_convert_many, "offloaded": aconvert_many}
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def _load(convert, datetimes):
+    lags = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(PROBE_SLEEP)
+            lags.append(time.perf_counter() - started - PROBE_SLEEP)
+
+    async def batches():
+        await asyncio.gather(*(convert(datetimes) for _ in range(BATCHES)))
+        done.set()
+
+    await asyncio.gather(batches(), *(probe() for _ in range(PROBES)))
+    return _percentile(lags, 99)
+
+
+@pytest.mark.parametrize("convert", CONVERTERS.values(), ids=CONVERTERS.keys())
+def test_event_loop_lag_under_load(benchmark, datetimes, convert):
+    batch = (datetimes * (BATCH_SIZE // len(datetimes) + 1))[:BATCH_SIZE]
+    lags = []
+    benchmark.pedantic(lambda: lags.append(asyncio.run(_load(convert, batch))), rounds=5)
+    benchmark.extra_info["p99_lag_ms"] = _percentile(lags, 50) * 1000
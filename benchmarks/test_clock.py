@@ -0,0 +1,15 @@
+from django_jalalify import JalaliDatetime
+from django_jalalify.timezone import TehranTimezone
+from django_jalalify.utils import get_now_tehran_jalali_date_intftime, get_now_tehran_jalali_time_intftime
+
+
+def test_now_date_and_time_ints(benchmark):
+    benchmark(lambda: (get_now_tehran_jalali_date_intftime(), get_now_tehran_jalali_time_intftime()))
+
+
+def test_khayyam_now_date_and_time_ints(benchmark):
+    def date_and_time_ints():
+        return (int(JalaliDatetime.now(TehranTimezone()).strftime("%Y%m%d")),
+                int(JalaliDatetime.now(TehranTimezone()).strftime("%H%M%S")))
+
+    benchmark(date_and_time_ints)
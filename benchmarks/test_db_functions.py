@@ -0,0 +1,25 @@
+from collections import Counter
+
+import pytest
+from django.db.models import Count
+
+from django_jalalify.db_functions import JalaliTruncMonth, JalaliTruncWeek, JalaliTruncYear
+from django_jalalify.utils import convert_datetime_to_custom_jalali_date
+
+TRUNCS = {"year": JalaliTruncYear, "month": JalaliTruncMonth, "week": JalaliTruncWeek}
+
+
+@pytest.mark.parametrize("trunc", TRUNCS.values(), ids=TRUNCS.keys())
+def test_group_by_jalali_period(benchmark, payments, trunc):
+    benchmark(lambda: list(payments.objects.values(period=trunc("created_at")).annotate(count=Count("id"))))
+
+
+def test_group_by_jalali_month_in_python(benchmark, payments):
+    """
+    the report the database functions replace: every row is fetched and bucketed in python.
+    """
+    def group():
+        return Counter(convert_datetime_to_custom_jalali_date(created_at) // 100
+                       for created_at in payments.objects.values_list("created_at", flat=True).iterator())
+
+    benchmark(group)
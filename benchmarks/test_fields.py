@@ -0,0 +1,53 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from django_jalalify.fields import (
+    JalaliDateField, JalaliDateRangeField, JalaliDateTimeField, JalaliDateTimeRangeField,
+)
+from django_jalalify.parsing import PERSIAN_DIGITS
+
+DIGITS = {"ascii": str.maketrans("", ""), "persian": str.maketrans("0123456789", PERSIAN_DIGITS)}
+
+
+@pytest.fixture(params=DIGITS, ids=DIGITS)
+def form_values(request, jalali_strings):
+    """
+    the jalali strings the way users type them, in ascii or persian digits.
+    """
+    return [value.translate(DIGITS[request.param]) for value in jalali_strings]
+
+
+def clean_all(field, values):
+    """
+    clean every value, the local times made ambiguous by the end of a DST period are rejected by the field.
+    """
+    cleaned = []
+    for value in values:
+        try:
+            cleaned.append(field.clean(value))
+        except ValidationError:
+            cleaned.append(None)
+    return cleaned
+
+
+def test_jalali_date_time_field_clean(benchmark, form_values):
+    field = JalaliDateTimeField()
+    benchmark(clean_all, field, form_values)
+
+
+def test_jalali_date_field_clean(benchmark, form_values):
+    field = JalaliDateField()
+    dates = [value[:10] for value in form_values]
+    benchmark(clean_all, field, dates)
+
+
+def test_jalali_date_range_field_clean(benchmark, form_values):
+    field = JalaliDateRangeField()
+    ranges = [[first[:10], second[:10]] for first, second in zip(form_values, reversed(form_values))]
+    benchmark(clean_all, field, ranges)
+
+
+def test_jalali_date_time_range_field_clean(benchmark, form_values):
+    field = JalaliDateTimeRangeField()
+    ranges = [[first, second] for first, second in zip(form_values, reversed(form_values))]
+    benchmark(clean_all, field, ranges)
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+import pytest
+
+from django_jalalify import JalaliDatetime
+from django_jalalify.formatting import jalali_strftime
+
+VALUE = datetime(2023, 3, 29, 10, 20, 30)
+FORMATS = ["%Y/%m/%d %H:%M:%S", "%A %d %B %Y"]
+
+
+@pytest.mark.parametrize("fmt", FORMATS, ids=["numeric", "names"])
+def test_jalali_strftime(benchmark, fmt):
+    benchmark(jalali_strftime, VALUE, fmt)
+
+
+@pytest.mark.parametrize("fmt", FORMATS, ids=["numeric", "names"])
+def test_khayyam_strftime(benchmark, fmt):
+    benchmark(lambda: JalaliDatetime(VALUE).strftime(fmt))
@@ -0,0 +1,16 @@
+from django_jalalify import functions
+
+
+def test_convert_date_to_int(benchmark, jalali_strings):
+    dates = [value[:10].replace("/", "-") for value in jalali_strings]
+    benchmark(lambda: [functions.convert_date_to_int(value) for value in dates])
+
+
+def test_convert_time_to_int(benchmark, jalali_strings):
+    times = [value[11:] for value in jalali_strings]
+    benchmark(lambda: [functions.convert_time_to_int(value) for value in times])
+
+
+def test_int_of_time_to_str(benchmark, jalali_strings):
+    times = [int(value[11:].replace(":", "")) for value in jalali_strings]
+    benchmark(lambda: [functions.int_of_time_to_str(value) for value in times])
@@ -0,0 +1,15 @@
+import pytest
+
+from django_jalalify import instrumentation, utils
+
+MODES = {"disabled": False, "enabled": True}
+
+
+@pytest.mark.parametrize("enabled", MODES.values(), ids=MODES.keys())
+def test_instrumented_convert_datetime_to_custom_jalali_date(benchmark, datetimes, enabled):
+    if enabled:
+        instrumentation.enable()
+    try:
+        benchmark(lambda: [utils.convert_datetime_to_custom_jalali_date(value) for value in datetimes])
+    finally:
+        instrumentation.disable()
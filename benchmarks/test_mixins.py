@@ -0,0 +1,3 @@
+def test_field_datetime_in_jalali(benchmark, payments, datetimes):
+    instances = [payments(created_at=value, amount=0) for value in datetimes]
+    benchmark(lambda: [instance._field_datetime_in_jalali("created_at") for instance in instances])
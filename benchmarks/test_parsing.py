@@ -0,0 +1,23 @@
+import pytest
+
+from django_jalalify import JalaliDate, JalaliDatetime
+from django_jalalify.parsing import parse_jalali_date, parse_jalali_datetime
+
+DATETIME_VALUES = ["1402/01/09 10:20:30", "۱۴۰۲/۰۱/۰۹ ۱۰:۲۰:۳۰"]
+
+
+@pytest.mark.parametrize("value", DATETIME_VALUES, ids=["ascii", "persian"])
+def test_parse_jalali_datetime(benchmark, value):
+    benchmark(parse_jalali_datetime, value)
+
+
+def test_khayyam_datetime_strptime(benchmark):
+    benchmark(lambda: JalaliDatetime.strptime("1402/01/09 10:20:30", "%Y/%m/%d %H:%M:%S").todatetime())
+
+
+def test_parse_jalali_date(benchmark):
+    benchmark(parse_jalali_date, "1402/01/09")
+
+
+def test_khayyam_date_strptime(benchmark):
+    benchmark(lambda: JalaliDate.strptime("1402/01/09", "%Y/%m/%d").todate())
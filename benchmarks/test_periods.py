@@ -0,0 +1,34 @@
+import pytz
+
+from django_jalalify import JalaliDatetime
+from django_jalalify.periods import filter_jalali_period, jalali_period_bounds, month_start_cache
+
+TEHRAN = pytz.timezone("Asia/Tehran")
+# the months of the last two years, as a dashboard shows them
+MONTHS = [(year, month) for year in (1401, 1402) for month in range(1, 13)]
+
+
+def _khayyam_bounds(year, month):
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return (TEHRAN.localize(JalaliDatetime(year, month, 1).todatetime()).astimezone(pytz.utc),
+            TEHRAN.localize(JalaliDatetime(next_year, next_month, 1).todatetime()).astimezone(pytz.utc))
+
+
+def test_period_bounds(benchmark):
+    benchmark(lambda: [jalali_period_bounds(year, month) for year, month in MONTHS])
+
+
+def test_period_bounds_cold(benchmark):
+    def bounds():
+        month_start_cache.clear()
+        return [jalali_period_bounds(year, month) for year, month in MONTHS]
+
+    benchmark(bounds)
+
+
+def test_khayyam_period_bounds(benchmark):
+    benchmark(lambda: [_khayyam_bounds(year, month) for year, month in MONTHS])
+
+
+def test_filter_jalali_period(benchmark, payments):
+    benchmark(lambda: filter_jalali_period(payments.objects.all(), "created_at", 1402, quarter=3).count())
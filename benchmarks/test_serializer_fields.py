@@ -0,0 +1,41 @@
+import random
+
+import pytest
+from rest_framework import serializers
+
+from django_jalalify.serializer_fields import JalaliDateTimeSerializerField
+
+from conftest import DATETIME_DISTRIBUTIONS
+
+# the size of a large API response
+OBJECTS = 10_000
+
+
+class PaymentSerializer(serializers.Serializer):
+    amount = serializers.IntegerField()
+    created_at = JalaliDateTimeSerializerField()
+
+
+class MixinPaymentSerializer(serializers.Serializer):
+    """
+    the serializers the field replaces: a method field which calls the mixin.
+    """
+    amount = serializers.IntegerField()
+    created_at = serializers.SerializerMethodField()
+
+    def get_created_at(self, obj):
+        return obj._field_datetime_in_jalali("created_at")
+
+
+SERIALIZERS = {"serializer_field": PaymentSerializer, "mixin_method_field": MixinPaymentSerializer}
+
+
+@pytest.fixture(scope="module", params=["recent", "uniform"])
+def instances(request, payments):
+    datetimes = DATETIME_DISTRIBUTIONS[request.param](random.Random(0), OBJECTS)
+    return [payments(created_at=value, amount=index) for index, value in enumerate(datetimes)]
+
+
+@pytest.mark.parametrize("serializer_class", SERIALIZERS.values(), ids=SERIALIZERS.keys())
+def test_serialize_many(benchmark, instances, serializer_class):
+    benchmark(lambda: serializer_class(instances, many=True).data)
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+import pytest
+
+from django_jalalify import conversion, parsing
+
+try:
+    from django_jalalify import _speedups
+except ImportError:
+    _speedups = None
+
+IMPLEMENTATIONS = {"python": SimpleNamespace(**conversion.PYTHON_IMPLEMENTATION, **parsing.PYTHON_IMPLEMENTATION)}
+if _speedups is not None:
+    IMPLEMENTATIONS["speedups"] = _speedups
+
+
+@pytest.fixture(params=IMPLEMENTATIONS, ids=IMPLEMENTATIONS)
+def implementation(request):
+    return IMPLEMENTATIONS[request.param]
+
+
+def test_ordinal_to_int_jalali_date(benchmark, implementation, datetimes):
+    ordinals = [value.toordinal() for value in datetimes]
+    benchmark(lambda: [implementation.ordinal_to_int_jalali_date(ordinal) for ordinal in ordinals])
+
+
+def test_jalali_to_ordinal(benchmark, implementation, jalali_datetimes):
+    dates = [(value.year, value.month, value.day) for value in jalali_datetimes]
+    benchmark(lambda: [implementation.jalali_to_ordinal(*value) for value in dates])
+
+
+def test_parse_datetime_parts(benchmark, implementation, jalali_strings):
+    benchmark(lambda: [implementation.parse_datetime_parts(value) for value in jalali_strings])
@@ -0,0 +1,43 @@
+"""
+Memory and speed of JalaliStamp against the khayyam objects, datetimes and string tuples it replaces. The retained
+memory per value is saved as the "bytes_per_value" extra info.
+"""
+import tracemalloc
+
+import pytest
+
+from django_jalalify import JalaliDatetime
+from django_jalalify.stamp import JalaliStamp
+from django_jalalify.timezone import TEHRAN_ZONE
+from django_jalalify.utils import jalali_datetime_to_int
+
+VALUES = {
+    "jalali_stamp": JalaliStamp.from_datetime,
+    "khayyam": lambda value: JalaliDatetime(value.astimezone(TEHRAN_ZONE)),
+    "datetime": lambda value: value.astimezone(TEHRAN_ZONE),
+    "string_tuple": lambda value: jalali_datetime_to_int(JalaliDatetime(value.astimezone(TEHRAN_ZONE))),
+}
+
+
+def _bytes_per_value(build, datetimes):
+    # the caches the conversions fill are not counted
+    [build(value) for value in datetimes]
+    tracemalloc.start()
+    try:
+        values = [build(value) for value in datetimes]
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return retained / len(values)
+
+
+@pytest.mark.parametrize("build", VALUES.values(), ids=VALUES.keys())
+def test_build(benchmark, datetimes, build):
+    benchmark.extra_info["bytes_per_value"] = _bytes_per_value(build, datetimes)
+    benchmark(lambda: [build(value) for value in datetimes])
+
+
+@pytest.mark.parametrize("build", [JalaliStamp.from_datetime, VALUES["khayyam"]], ids=["jalali_stamp", "khayyam"])
+def test_sort(benchmark, datetimes, build):
+    values = [build(value) for value in datetimes]
+    benchmark(sorted, values)
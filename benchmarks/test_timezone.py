@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+import pytest
+import pytz
+
+from django_jalalify.timezone import TEHRAN_ZONE, TehranTimezone
+
+MOMENTS = {"dst": datetime(2021, 6, 1, 10, 20, 30, tzinfo=timezone.utc),
+           "standard": datetime(2023, 6, 1, 10, 20, 30, tzinfo=timezone.utc)}
+ZONES = {"tehran_zone": TEHRAN_ZONE, "pytz": pytz.timezone("Asia/Tehran"), "fixed_offset": TehranTimezone()}
+
+
+@pytest.mark.parametrize("moment", MOMENTS.values(), ids=MOMENTS.keys())
+@pytest.mark.parametrize("zone", ZONES.values(), ids=ZONES.keys())
+def test_astimezone(benchmark, zone, moment):
+    benchmark(moment.astimezone, zone)
+
+
+def test_local_utcoffset(benchmark):
+    local = datetime(2021, 6, 1, 10, 20, 30, tzinfo=TEHRAN_ZONE)
+    benchmark(local.utcoffset)
+
+
+def test_pytz_localize(benchmark):
+    benchmark(pytz.timezone("Asia/Tehran").localize, datetime(2021, 6, 1, 10, 20, 30))
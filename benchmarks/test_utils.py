@@ -0,0 +1,52 @@
+from django_jalalify import utils
+
+
+def test_convert_datetime_to_custom_jalali_date(benchmark, datetimes):
+    benchmark(lambda: [utils.convert_datetime_to_custom_jalali_date(value) for value in datetimes])
+
+
+def test_get_tehran_timestamp_with_three_digits_of_microsecond_accuracy(benchmark, datetimes):
+    benchmark(lambda: [utils.get_tehran_timestamp_with_three_digits_of_microsecond_accuracy(value)
+                       for value in datetimes])
+
+
+def test_jalali_datetime_to_int(benchmark, jalali_datetimes):
+    benchmark(lambda: [utils.jalali_datetime_to_int(value) for value in jalali_datetimes])
+
+
+def test_get_jalali_tehran_datetime_from_date_string(benchmark, jalali_strings):
+    benchmark(lambda: [utils.get_jalali_tehran_datetime_from_date_string(value) for value in jalali_strings])
+
+
+def test_int_jalali_date_to_jalali_datetime(benchmark, jalali_strings):
+    dates = [int(value[:10].replace("/", "")) for value in jalali_strings]
+    benchmark(lambda: [utils.int_jalali_date_to_jalali_datetime(value) for value in dates])
+
+
+def test_str_of_int_to_jalali_datetime(benchmark, jalali_strings):
+    dates_and_times = [(value[:10].replace("/", ""), value[11:].replace(":", "")) for value in jalali_strings]
+    benchmark(lambda: [utils.str_of_int_to_jalali_datetime(*value) for value in dates_and_times])
+
+
+def test_tehran_now(benchmark):
+    benchmark(utils.tehran_now)
+
+
+def test_get_now_tehran_jalali_datetime(benchmark):
+    benchmark(utils.get_now_tehran_jalali_datetime)
+
+
+def test_get_now_tehran_jalali_date_strftime(benchmark):
+    benchmark(utils.get_now_tehran_jalali_date_strftime)
+
+
+def test_get_now_tehran_jalali_time_strftime(benchmark):
+    benchmark(utils.get_now_tehran_jalali_time_strftime)
+
+
+def test_get_now_tehran_jalali_date_intftime(benchmark):
+    benchmark(utils.get_now_tehran_jalali_date_intftime)
+
+
+def test_get_now_tehran_jalali_time_intftime(benchmark):
+    benchmark(utils.get_now_tehran_jalali_time_intftime)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+import pytz
+
+from django_jalalify import vectorized
+from django_jalalify.utils import convert_datetime_to_custom_jalali_date
+
+SIZE = 100_000
+
+
+@pytest.fixture(scope="module")
+def epoch_seconds():
+    # a year worth of random instants around now, the way a reporting job sees a column
+    return np.random.default_rng(0).integers(1672531200, 1704067200, SIZE)
+
+
+@pytest.fixture(scope="module")
+def datetimes(epoch_seconds):
+    return epoch_seconds.astype("datetime64[s]").astype(object)
+
+
+def test_scalar_convert_datetime_to_custom_jalali_date(benchmark, datetimes):
+    aware_datetimes = [pytz.utc.localize(value) for value in datetimes]
+    benchmark(lambda: [convert_datetime_to_custom_jalali_date(value) for value in aware_datetimes])
+
+
+def test_vectorized_to_jalali_ints(benchmark, epoch_seconds):
+    benchmark(vectorized.to_jalali_ints, epoch_seconds)
+
+
+def test_vectorized_from_jalali_ints(benchmark, epoch_seconds):
+    dates, times = vectorized.to_jalali_ints(epoch_seconds)
+    benchmark(vectorized.from_jalali_ints, dates, times)
@@ -1,5 +1,3 @@
-from khayyam import JalaliDate, JalaliDatetime
-
 default_app_config = "django_jalalify.apps.DjangoJalalifyConfig"
 
 __author__ = "Mohammad Javad Nikbakht"
@@ -8,3 +6,17 @@ __email__ = "javadnikbakht@mail.com"
 __version__ = "1.2.0"
 
 __all__ = ["JalaliDate", "JalaliDatetime"]
+
+
+def __getattr__(name):
+    # khayyam is imported on the first use of its classes, the integer helpers do not need it
+    if name in __all__:
+        import khayyam
+
+        value = globals()[name] = getattr(khayyam, name)
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
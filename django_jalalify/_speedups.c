@@ -0,0 +1,326 @@
+/*
+ * Compiled versions of the calendar math of django_jalalify.conversion and the fixed format parsers of
+ * django_jalalify.parsing. The extension is optional (see setup.py), both modules replace their pure python functions
+ * with these ones when it is built, so every function here must behave exactly like its python version.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#define MINYEAR 1
+#define MAXYEAR 3178
+/* ordinals further than this from the epoch can not be multiplied by 2820 without overflowing */
+#define MAX_ORDINAL 1000000000000000LL
+
+static const long long MONTH_OFFSETS[13] = {0, 0, 31, 62, 93, 124, 155, 186, 216, 246, 276, 306, 336};
+
+static long long
+floor_div(long long a, long long b)
+{
+    long long quotient = a / b;
+    if ((a % b != 0) && ((a < 0) != (b < 0))) {
+        quotient--;
+    }
+    return quotient;
+}
+
+static long long
+floor_mod(long long a, long long b)
+{
+    return a - floor_div(a, b) * b;
+}
+
+/* ordinal of the first day of a jalali year, the 2820 years cycle arithmetic of khayyam */
+static long long
+year_start(long long year)
+{
+    long long base = year >= 0 ? year - 474 : year - 473;
+    long long cycle_year = 474 + floor_mod(base, 2820);
+    return floor_div(cycle_year * 682 - 110, 2816) + (cycle_year - 1) * 365 + floor_div(base, 2820) * 1029983 + 226896;
+}
+
+static long long
+days_in_month(long long year, long long month)
+{
+    if (month <= 6) {
+        return 31;
+    }
+    if (month <= 11) {
+        return 30;
+    }
+    return year_start(year + 1) - year_start(year) == 366 ? 30 : 29;
+}
+
+/* sets a ValueError and returns -1 when the date does not exist */
+static int
+to_ordinal(long long year, long long month, long long day, long long *ordinal)
+{
+    if (month < 1 || month > 12) {
+        PyErr_Format(PyExc_ValueError, "Month must be between 1 and 12, but it is: %lld", month);
+        return -1;
+    }
+    if (year < MINYEAR || year > MAXYEAR) {
+        PyErr_Format(PyExc_ValueError, "Year must be between %d and %d, but it is: %lld", MINYEAR, MAXYEAR, year);
+        return -1;
+    }
+    if ((day < 1 || day > 29) && !(1 <= day && day <= days_in_month(year, month))) {
+        PyErr_Format(PyExc_ValueError, "Day must be between 1 and %lld, but it is: %lld",
+                     days_in_month(year, month), day);
+        return -1;
+    }
+    *ordinal = year_start(year) + MONTH_OFFSETS[month] + day - 1;
+    return 0;
+}
+
+/* sets a ValueError and returns -1 when the year of the ordinal is out of range */
+static int
+from_ordinal(long long ordinal, long long *year, long long *month, long long *day)
+{
+    long long day_of_year;
+
+    if (ordinal < -MAX_ORDINAL || ordinal > MAX_ORDINAL) {
+        PyErr_Format(PyExc_ValueError, "Year must be between %d and %d, but it is: %lld", MINYEAR, MAXYEAR,
+                     floor_div(ordinal - 226895, 1029983) * 2820 + 1);
+        return -1;
+    }
+    /* estimate the year from the average length of a jalali year and fix it up */
+    *year = floor_div((ordinal - 226895) * 2820, 1029983) + 1;
+    while (year_start(*year) > ordinal) {
+        (*year)--;
+    }
+    while (year_start(*year + 1) <= ordinal) {
+        (*year)++;
+    }
+    if (*year < MINYEAR || *year > MAXYEAR) {
+        PyErr_Format(PyExc_ValueError, "Year must be between %d and %d, but it is: %lld", MINYEAR, MAXYEAR, *year);
+        return -1;
+    }
+    day_of_year = ordinal - year_start(*year);
+    if (day_of_year < 186) {
+        *month = day_of_year / 31 + 1;
+        *day = day_of_year % 31 + 1;
+    }
+    else {
+        day_of_year -= 186;
+        *month = day_of_year / 30 + 7;
+        *day = day_of_year % 30 + 1;
+    }
+    return 0;
+}
+
+static PyObject *
+jalali_to_ordinal(PyObject *module, PyObject *args)
+{
+    long long year, month, day, ordinal;
+
+    if (!PyArg_ParseTuple(args, "LLL:jalali_to_ordinal", &year, &month, &day)) {
+        return NULL;
+    }
+    if (to_ordinal(year, month, day, &ordinal) < 0) {
+        return NULL;
+    }
+    return PyLong_FromLongLong(ordinal);
+}
+
+static PyObject *
+ordinal_to_jalali(PyObject *module, PyObject *arg)
+{
+    long long ordinal, year, month, day;
+
+    ordinal = PyLong_AsLongLong(arg);
+    if (ordinal == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (from_ordinal(ordinal, &year, &month, &day) < 0) {
+        return NULL;
+    }
+    return Py_BuildValue("(LLL)", year, month, day);
+}
+
+static PyObject *
+ordinal_to_int_jalali_date(PyObject *module, PyObject *arg)
+{
+    long long ordinal, year, month, day;
+
+    ordinal = PyLong_AsLongLong(arg);
+    if (ordinal == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (from_ordinal(ordinal, &year, &month, &day) < 0) {
+        return NULL;
+    }
+    return PyLong_FromLongLong(year * 10000 + month * 100 + day);
+}
+
+static PyObject *
+pack(PyObject *args, const char *format)
+{
+    long long high, middle, low;
+
+    if (!PyArg_ParseTuple(args, format, &high, &middle, &low)) {
+        return NULL;
+    }
+    return PyLong_FromLongLong(high * 10000 + middle * 100 + low);
+}
+
+static PyObject *
+unpack(PyObject *arg)
+{
+    long long value = PyLong_AsLongLong(arg);
+
+    if (value == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    return Py_BuildValue("(LLL)", floor_div(value, 10000), floor_mod(floor_div(value, 100), 100), floor_mod(value, 100));
+}
+
+static PyObject *
+jalali_date_to_int(PyObject *module, PyObject *args)
+{
+    return pack(args, "LLL:jalali_date_to_int");
+}
+
+static PyObject *
+int_to_jalali_date(PyObject *module, PyObject *arg)
+{
+    return unpack(arg);
+}
+
+static PyObject *
+time_to_int(PyObject *module, PyObject *args)
+{
+    return pack(args, "LLL:time_to_int");
+}
+
+static PyObject *
+int_to_time(PyObject *module, PyObject *arg)
+{
+    return unpack(arg);
+}
+
+/* the number written by the ascii digits of value[start:end], or -1 when any of them is not an ascii digit */
+static long long
+read_digits(int kind, const void *data, Py_ssize_t start, Py_ssize_t end)
+{
+    long long number = 0;
+    Py_ssize_t index;
+
+    for (index = start; index < end; index++) {
+        Py_UCS4 character = PyUnicode_READ(kind, data, index);
+        if (character < '0' || character > '9') {
+            return -1;
+        }
+        number = number * 10 + (character - '0');
+    }
+    return number;
+}
+
+/* the ordinal of the "YYYY/mm/dd" prefix of value, sets a ValueError and returns -1 when it is not a valid date */
+static int
+read_date(PyObject *value, int kind, const void *data, long long *ordinal)
+{
+    long long year, month, day;
+
+    year = read_digits(kind, data, 0, 4);
+    month = read_digits(kind, data, 5, 7);
+    day = read_digits(kind, data, 8, 10);
+    if (PyUnicode_READ(kind, data, 4) != '/' || PyUnicode_READ(kind, data, 7) != '/' || year < 0 || month < 0 ||
+        day < 0) {
+        PyErr_Format(PyExc_ValueError, "time data %R does not match format '%%Y/%%m/%%d'", value);
+        return -1;
+    }
+    return to_ordinal(year, month, day, ordinal);
+}
+
+static PyObject *
+parse_date_ordinal(PyObject *module, PyObject *value)
+{
+    long long ordinal;
+
+    if (!PyUnicode_Check(value)) {
+        PyErr_Format(PyExc_TypeError, "parse_date_ordinal() argument must be str, not %.200s", Py_TYPE(value)->tp_name);
+        return NULL;
+    }
+    if (PyUnicode_READY(value) < 0) {
+        return NULL;
+    }
+    if (PyUnicode_GET_LENGTH(value) != 10) {
+        Py_RETURN_NONE;
+    }
+    if (read_date(value, PyUnicode_KIND(value), PyUnicode_DATA(value), &ordinal) < 0) {
+        return NULL;
+    }
+    return PyLong_FromLongLong(ordinal);
+}
+
+static PyObject *
+parse_datetime_parts(PyObject *module, PyObject *value)
+{
+    long long ordinal, hour, minute, second;
+    int kind;
+    const void *data;
+
+    if (!PyUnicode_Check(value)) {
+        PyErr_Format(PyExc_TypeError, "parse_datetime_parts() argument must be str, not %.200s",
+                     Py_TYPE(value)->tp_name);
+        return NULL;
+    }
+    if (PyUnicode_READY(value) < 0) {
+        return NULL;
+    }
+    if (PyUnicode_GET_LENGTH(value) != 19) {
+        Py_RETURN_NONE;
+    }
+    kind = PyUnicode_KIND(value);
+    data = PyUnicode_DATA(value);
+    if (PyUnicode_READ(kind, data, 10) != ' ' || PyUnicode_READ(kind, data, 13) != ':' ||
+        PyUnicode_READ(kind, data, 16) != ':') {
+        Py_RETURN_NONE;
+    }
+    hour = read_digits(kind, data, 11, 13);
+    minute = read_digits(kind, data, 14, 16);
+    second = read_digits(kind, data, 17, 19);
+    if (hour < 0 || minute < 0 || second < 0) {
+        Py_RETURN_NONE;
+    }
+    if (read_date(value, kind, data, &ordinal) < 0) {
+        return NULL;
+    }
+    return Py_BuildValue("(LLLL)", ordinal, hour, minute, second);
+}
+
+static PyMethodDef speedups_methods[] = {
+    {"jalali_to_ordinal", jalali_to_ordinal, METH_VARARGS,
+     "convert a jalali date to the gregorian proleptic ordinal: (1402, 1, 9) => 738608"},
+    {"ordinal_to_jalali", ordinal_to_jalali, METH_O,
+     "convert a gregorian proleptic ordinal to a jalali (year, month, day) tuple: 738608 => (1402, 1, 9)"},
+    {"ordinal_to_int_jalali_date", ordinal_to_int_jalali_date, METH_O,
+     "convert a gregorian proleptic ordinal to an integer jalali date: 738608 => 14020109"},
+    {"jalali_date_to_int", jalali_date_to_int, METH_VARARGS,
+     "pack a jalali date into an integer: (1402, 1, 9) => 14020109"},
+    {"int_to_jalali_date", int_to_jalali_date, METH_O, "unpack an integer jalali date: 14020109 => (1402, 1, 9)"},
+    {"time_to_int", time_to_int, METH_VARARGS, "pack a time into an integer: (10, 20, 30) => 102030"},
+    {"int_to_time", int_to_time, METH_O, "unpack an integer time: 102030 => (10, 20, 30)"},
+    {"parse_date_ordinal", parse_date_ordinal, METH_O,
+     "the gregorian ordinal of a \"YYYY/mm/dd\" jalali date, None when value is not 10 characters long"},
+    {"parse_datetime_parts", parse_datetime_parts, METH_O,
+     "(ordinal, hour, minute, second) of a \"YYYY/mm/dd HH:MM:SS\" jalali datetime, None when value has another shape"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "django_jalalify._speedups",
+    "Compiled calendar math and fixed format parsers of django_jalalify.",
+    -1,
+    speedups_methods,
+    NULL,
+    NULL,
+    NULL,
+    NULL
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    return PyModule_Create(&speedups_module);
+}
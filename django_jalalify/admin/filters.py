@@ -16,15 +16,32 @@ from collections import OrderedDict
 from django import forms
 from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
 from django.utils.html import format_html
 from django.utils import timezone
 from django.template.defaultfilters import slugify
 from django.templatetags.static import StaticNode
-from django.utils.translation import ugettext as _
+from django.utils.translation import gettext_lazy as _
 from django.utils.encoding import force_text
 from django_jalali.admin.widgets import AdminSplitjDateTime, AdminjDateWidget
 from django_jalali import forms as jforms
 
+from django_jalalify.cache import get_day_start
+from django_jalalify.periods import get_shortcut_days
+
+# DateRangeForm classes built by the filters, per (filter class, field_path).
+_form_class_cache = {}
+
+SHORTCUT_LABELS = {
+    "today": _("Today"),
+    "yesterday": _("Yesterday"),
+    "this_week": _("This week"),
+    "this_month": _("This month"),
+    "this_quarter": _("This quarter"),
+    "this_year": _("This year"),
+}
+
 
 class AdminSplitDateTime(AdminSplitjDateTime):
     def format_output(self, rendered_widgets):
@@ -34,15 +51,39 @@ class AdminSplitDateTime(AdminSplitjDateTime):
 
 
 class DateRangeFilter(admin.filters.FieldListFilter):
+    # filter by [from date start, day after to date start) instead of [from date start, to date end], defaults to the
+    # JALALIFY_HALF_OPEN_RANGES setting when None.
+    half_open_range = None
+    # the quick choices shown above the range form, see periods.get_shortcut_days. they always filter by
+    # [first day start, day after the last day start), relative to the date of today in the filter timezone.
+    shortcuts = ["today", "yesterday", "this_week", "this_month", "this_quarter", "this_year", "last_7_days",
+                 "last_30_days"]
+
     def __init__(self, field, request, params, model, model_admin, field_path):
         self.lookup_kwarg_gte = "{0}__range__gte".format(field_path)
         self.lookup_kwarg_lte = "{0}__range__lte".format(field_path)
+        self.lookup_kwarg_shortcut = "{0}__range__shortcut".format(field_path)
 
         super(DateRangeFilter, self).__init__(
             field, request, params, model, model_admin, field_path)
         self.request = request
         self.form = self.get_form(request)
 
+    def __init_subclass__(cls, **kwargs):
+        # the shortcuts of a filter class are checked once, when it is defined, rather than on every request
+        super().__init_subclass__(**kwargs)
+        cls.validate_shortcuts()
+
+    @classmethod
+    def validate_shortcuts(cls):
+        today = datetime.date.today().toordinal()
+        for shortcut in cls.shortcuts:
+            try:
+                get_shortcut_days(shortcut, today)
+            except ValueError:
+                raise ImproperlyConfigured("%s.shortcuts has an unknown date range shortcut: %r" % (
+                    cls.__name__, shortcut))
+
     def jalali_to_gregorian(self, date_time):
         return date_time.togregorian()
 
@@ -59,24 +100,73 @@ class DateRangeFilter(admin.filters.FieldListFilter):
                 value = default_tz.localize(value)
         return value
 
+    def use_half_open_range(self):
+        if self.half_open_range is None:
+            return getattr(settings, "JALALIFY_HALF_OPEN_RANGES", False)
+        return self.half_open_range
+
+    def get_day_start(self, date, request):
+        """
+        the first moment of the date in the filter timezone, precomputed in UTC and cached per date.
+        """
+        if not isinstance(self.field, models.DateTimeField):
+            return date
+        if not settings.USE_TZ:
+            return datetime.datetime.combine(date, datetime.time.min)
+        return get_day_start(date.toordinal(), self.get_timezone(request))
+
+    def get_today(self, request) -> int:
+        """
+        the gregorian ordinal of today in the filter timezone.
+        """
+        if settings.USE_TZ:
+            return timezone.localtime(timezone.now(), self.get_timezone(request)).toordinal()
+        return timezone.now().toordinal()
+
+    def get_shortcut_label(self, shortcut):
+        if shortcut in SHORTCUT_LABELS:
+            return SHORTCUT_LABELS[shortcut]
+        return _("Last %s days") % shortcut.split("_")[1]
+
     def choices(self, cl):
         yield {
             # slugify converts any non-unicode characters to empty characters
             # but system_name is required, if title converts to empty string use id
             # https://github.com/silentsokolov/django-admin-rangefilter/issues/18
             "system_name": force_text(slugify(self.title) if slugify(self.title) else id(self.title)),
+            # the range of the form narrows the selected shortcut, the reset button removes both
             "query_string": cl.get_query_string(
                 {}, remove=self._get_expected_fields()
-            )
+            ),
+            "reset_query_string": cl.get_query_string(
+                {}, remove=self.expected_parameters()
+            ),
         }
+        selected = self.used_parameters.get(self.lookup_kwarg_shortcut)
+        for shortcut in self.shortcuts:
+            yield {
+                "shortcut": shortcut,
+                "selected": shortcut == selected,
+                "query_string": cl.get_query_string(
+                    {self.lookup_kwarg_shortcut: shortcut}, remove=self._get_expected_fields()
+                ),
+                "display": self.get_shortcut_label(shortcut),
+            }
 
     def expected_parameters(self):
-        return self._get_expected_fields()
+        return self._get_expected_fields() + [self.lookup_kwarg_shortcut]
 
     def queryset(self, request, queryset):
+        shortcut = self.used_parameters.get(self.lookup_kwarg_shortcut)
+        if shortcut in self.shortcuts:
+            queryset = queryset.filter(**self._make_shortcut_query_filter(request, shortcut))
         if self.form.is_valid():
             validated_data = dict(self.form.cleaned_data.items())
             if validated_data:
+                if self.use_half_open_range():
+                    return queryset.filter(
+                        **self._make_half_open_query_filter(request, validated_data)
+                    )
                 return queryset.filter(
                     **self._make_query_filter(request, validated_data)
                 )
@@ -105,6 +195,27 @@ class DateRangeFilter(admin.filters.FieldListFilter):
 
         return query_params
 
+    def _make_half_open_query_filter(self, request, validated_data):
+        query_params = {}
+        date_value_gte = validated_data.get(self.lookup_kwarg_gte, None)
+        date_value_lte = validated_data.get(self.lookup_kwarg_lte, None)
+
+        if date_value_gte:
+            date_value_gte = self.jalali_to_gregorian(date_value_gte)
+            query_params["{0}__gte".format(self.field_path)] = self.get_day_start(date_value_gte, request)
+        if date_value_lte:
+            date_value_lte = self.jalali_to_gregorian(date_value_lte) + datetime.timedelta(days=1)
+            query_params["{0}__lt".format(self.field_path)] = self.get_day_start(date_value_lte, request)
+
+        return query_params
+
+    def _make_shortcut_query_filter(self, request, shortcut):
+        first, end = get_shortcut_days(shortcut, self.get_today(request))
+        return {
+            "{0}__gte".format(self.field_path): self.get_day_start(datetime.date.fromordinal(first), request),
+            "{0}__lt".format(self.field_path): self.get_day_start(datetime.date.fromordinal(end), request),
+        }
+
     def get_template(self):
         if django.VERSION[:2] <= (1, 8):
             return "django_jalalify/date_filter_1_8.html"
@@ -114,25 +225,29 @@ class DateRangeFilter(admin.filters.FieldListFilter):
 
     def get_form(self, request):
         form_class = self._get_form_class()
-        return form_class(self.used_parameters)
-
-    def _get_form_class(self):
-        fields = self._get_form_fields()
-
-        form_class = type(
-            str("DateRangeForm"),
-            (forms.BaseForm,),
-            {"base_fields": fields}
-        )
-        form_class.media = self._get_media()
+        form = form_class(self.used_parameters)
         # lines below ensure that the js static files are loaded just once
         # even if there is more than one DateRangeFilter in use
         request_key = "DJANGO_RANGEFILTER_ADMIN_JS_SET"
-        if (getattr(self.request, request_key, False)):
-            form_class.js = []
+        if (getattr(request, request_key, False)):
+            form.js = []
         else:
-            setattr(self.request, request_key, True)
-            form_class.js = self.get_js()
+            setattr(request, request_key, True)
+            form.js = self.get_js()
+        return form
+
+    def _get_form_class(self):
+        # the form class only depends on the filter class and the field, so it is built once per process.
+        # form instances deep copy base_fields, so sharing the class between requests and threads is safe.
+        cache_key = (self.__class__, self.field_path)
+        form_class = _form_class_cache.get(cache_key)
+        if form_class is None:
+            form_class = type(
+                str("DateRangeForm"),
+                (forms.BaseForm,),
+                {"base_fields": self._get_form_fields(), "media": self._get_media()}
+            )
+            form_class = _form_class_cache.setdefault(cache_key, form_class)
         return form_class
 
     def _get_form_fields(self):
@@ -182,6 +297,10 @@ class DateTimeRangeFilter(DateRangeFilter):
     def jalali_to_gregorian(self, date_time):
         return date_time
 
+    def use_half_open_range(self):
+        # the bounds are exact datetimes
+        return False
+
     def _get_expected_fields(self):
         expected_fields = []
         for field in [self.lookup_kwarg_gte, self.lookup_kwarg_lte]:
@@ -1,6 +1,29 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class DjangoJalalifyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'django_jalalify'
+
+    def ready(self):
+        # registers the jalali functions on new SQLite connections
+        from django_jalalify import db_functions  # noqa: F401
+        from django_jalalify.cache import tehran_day_cache
+        from django_jalalify.clock import tehran_clock
+
+        day_cache_size = getattr(settings, "JALALIFY_DAY_CACHE_SIZE", None)
+        if day_cache_size is not None:
+            tehran_day_cache.resize(day_cache_size)
+
+        clock_tick = getattr(settings, "JALALIFY_CLOCK_TICK", None)
+        if clock_tick is not None:
+            tehran_clock.tick = clock_tick
+
+        if getattr(settings, "JALALIFY_INSTRUMENTATION", False):
+            from django_jalalify import instrumentation
+
+            instrumentation.enable()
+            stats_dir = getattr(settings, "JALALIFY_INSTRUMENTATION_DIR", None)
+            if stats_dir:
+                instrumentation.save_snapshots(stats_dir)
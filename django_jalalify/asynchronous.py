@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Batch conversions for async views and ASGI consumers.
+
+The helpers of the package are pure CPU bound functions which do no I/O, so a single call can be made from a coroutine
+as it is. A large batch of them is what stalls the event loop: aconvert_many(), aformat_many() and aparse_many() run
+batches of up to chunk_size values inline and split larger ones into chunks which are converted on a shared executor
+(a thread pool by default, see set_executor() to use a process pool), so other coroutines keep being served meanwhile.
+"""
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from threading import Lock
+from typing import Iterable, List, Optional
+
+from django_jalalify.bulk import DEFAULT_DATE_FORMAT, DEFAULT_DATETIME_FORMAT, jalalify_value
+from django_jalalify.cache import get_tehran_jalali_date_int
+from django_jalalify.parsing import parse_jalali_datetime
+
+DEFAULT_ASYNC_CHUNK_SIZE = 1000
+DEFAULT_ASYNC_WORKERS = 4
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_executor() -> Executor:
+    """
+    the executor the chunks of large batches are converted on, a thread pool created on first use.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DEFAULT_ASYNC_WORKERS,
+                                               thread_name_prefix="django_jalalify")
+    return _executor
+
+
+def set_executor(executor: Optional[Executor]):
+    """
+    use executor for the chunks of large batches, e.g. a ProcessPoolExecutor. None goes back to the default thread
+    pool. the previous executor is not shut down.
+    """
+    global _executor
+    with _executor_lock:
+        _executor = executor
+
+
+def convert_many(datetimes: Iterable[datetime]) -> List[int]:
+    """
+    Tehran jalali dates of datetimes as YYYYMMDD integers, the same as convert_datetime_to_custom_jalali_date.
+    """
+    return [get_tehran_jalali_date_int(value) for value in datetimes]
+
+
+def format_many(values: Iterable, fmt=DEFAULT_DATETIME_FORMAT, date_fmt=DEFAULT_DATE_FORMAT) -> List:
+    """
+    datetimes (in Tehran) and dates formatted as jalali strings, other values as they are. see bulk.jalalify_value.
+    """
+    return [jalalify_value(value, fmt, date_fmt) for value in values]
+
+
+def parse_many(values: Iterable[str]) -> List[datetime]:
+    """
+    naive gregorian datetimes of "YYYY/mm/dd HH:MM:SS" jalali strings.
+    """
+    return [parse_jalali_datetime(value) for value in values]
+
+
+async def _run_in_chunks(function, values, chunk_size) -> list:
+    values = values if isinstance(values, list) else list(values)
+    if len(values) <= chunk_size:
+        return function(values)
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(executor, function, values[start:start + chunk_size])
+        for start in range(0, len(values), chunk_size)
+    ))
+    return [value for chunk in results for value in chunk]
+
+
+async def aconvert_many(datetimes: Iterable[datetime], chunk_size=DEFAULT_ASYNC_CHUNK_SIZE) -> List[int]:
+    """
+    convert_many() which converts batches larger than chunk_size on the shared executor.
+    """
+    return await _run_in_chunks(convert_many, datetimes, chunk_size)
+
+
+async def aformat_many(values: Iterable, fmt=DEFAULT_DATETIME_FORMAT, date_fmt=DEFAULT_DATE_FORMAT,
+                       chunk_size=DEFAULT_ASYNC_CHUNK_SIZE) -> List:
+    """
+    format_many() which formats batches larger than chunk_size on the shared executor.
+    """
+    return await _run_in_chunks(partial(format_many, fmt=fmt, date_fmt=date_fmt), values, chunk_size)
+
+
+async def aparse_many(values: Iterable[str], chunk_size=DEFAULT_ASYNC_CHUNK_SIZE) -> List[datetime]:
+    """
+    parse_many() which parses batches larger than chunk_size on the shared executor.
+    :raise ValueError, TypeError: when any of the values is not a valid jalali datetime.
+    """
+    return await _run_in_chunks(parse_many, values, chunk_size)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Backfill of jalali integer columns from a datetime or date column, for the jalalify_backfill management command.
+
+The table is walked in primary key order, in chunks of chunk_size rows which start after the last primary key of the
+previous one, so every chunk is a primary key range read from the index. The values of a chunk are converted to
+YYYYMMDD dates and HHMMSS times in Tehran (the same as convert_datetime_to_custom_jalali_date and
+jalali_datetime_to_int), in worker processes when there are more than one, and written back with bulk_update. With
+workers, a batch of one chunk per worker is converted while the previous batch is written and the next one is read.
+The last primary key of every written chunk is saved to the checkpoint file, so an interrupted backfill resumes
+after it.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from django_jalalify.asynchronous import convert_many
+from django_jalalify.conversion import ordinal_to_int_jalali_date
+from django_jalalify.timezone import TEHRAN_ZONE
+
+DEFAULT_BACKFILL_CHUNK_SIZE = 2000
+
+
+class BackfillProgress(NamedTuple):
+    # rows written so far, in this run, and the rows this run started with
+    done: int
+    total: int
+    # seconds since the start of this run
+    elapsed: float
+    last_pk: object
+
+    @property
+    def rate(self) -> float:
+        """
+        rows written per second.
+        """
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+
+def convert_chunk(values: List, with_time: bool) -> List[Tuple[Optional[int], Optional[int]]]:
+    """
+    (YYYYMMDD jalali date, HHMMSS time) in Tehran of each datetime of values, (jalali date, None) of dates and
+    (None, None) of None values.
+    """
+    datetimes = [value for value in values if isinstance(value, datetime)]
+    dates = iter(convert_many(datetimes))
+    times = iter([])
+    if with_time:
+        times = iter([local.hour * 10000 + local.minute * 100 + local.second
+                      for local in (value.astimezone(TEHRAN_ZONE) for value in datetimes)])
+    converted = []
+    for value in values:
+        if value is None:
+            converted.append((None, None))
+        elif isinstance(value, datetime):
+            converted.append((next(dates), next(times) if with_time else None))
+        else:
+            converted.append((ordinal_to_int_jalali_date(value.toordinal()), None))
+    return converted
+
+
+def read_checkpoint(path, task: dict):
+    """
+    the last primary key saved in the checkpoint file of task, None when there is none.
+    :raise ValueError: when the file is the checkpoint of another backfill.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as file:
+        checkpoint = json.load(file)
+    if checkpoint["task"] != task:
+        raise ValueError("%s is the checkpoint of another backfill: %s" % (path, checkpoint["task"]))
+    return checkpoint["last_pk"]
+
+
+def write_checkpoint(path, task: dict, last_pk):
+    with open(path + ".tmp", "w") as file:
+        json.dump({"task": task, "last_pk": last_pk}, file, cls=DjangoJSONEncoder)
+    # an interruption never leaves a partly written checkpoint
+    os.replace(path + ".tmp", path)
+
+
+def iter_chunks(queryset, source: str, chunk_size: int, last_pk=None) -> Iterator[List[Tuple]]:
+    """
+    yield the (pk, source value) rows of queryset in primary key order, chunk_size rows at a time, after last_pk.
+    """
+    queryset = queryset.order_by("pk").values_list("pk", source)
+    while True:
+        chunk = list((queryset if last_pk is None else queryset.filter(pk__gt=last_pk))[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def backfill(
+    model,
+    source: str,
+    date_field: str,
+    time_field: Optional[str] = None,
+    chunk_size: int = DEFAULT_BACKFILL_CHUNK_SIZE,
+    workers: int = 1,
+    checkpoint: Optional[str] = None,
+    only_null: bool = False,
+    progress: Optional[Callable[[BackfillProgress], None]] = None,
+) -> BackfillProgress:
+    """
+    fill date_field (and time_field) of every row of model with the jalali date (and time) in Tehran of its source
+    field, resuming after the primary key saved in the checkpoint file.
+    :param workers: number of processes the chunks are converted in, 1 converts them in this process.
+    :param only_null: only the rows whose date_field is null.
+    :param progress: called with the progress after every written chunk.
+    """
+    meta = model._meta
+    for field_name in filter(None, [source, date_field, time_field]):
+        meta.get_field(field_name)
+    task = {"model": meta.label, "source": source, "date_field": date_field, "time_field": time_field,
+            "only_null": only_null}
+    last_pk = read_checkpoint(checkpoint, task)
+    queryset = model._default_manager.all()
+    if only_null:
+        queryset = queryset.filter(**{"%s__isnull" % date_field: True})
+    total = (queryset if last_pk is None else queryset.filter(pk__gt=last_pk)).count()
+    update_fields = [date_field] + ([time_field] if time_field else [])
+    default_timezone = timezone.get_default_timezone()
+    started = time.perf_counter()
+    done = 0
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    with_time = bool(time_field)
+
+    def submit(batch):
+        # the next batch of chunks is sent to the workers before the previous one is written
+        values = [[_aware(value, default_timezone) for _, value in chunk] for chunk in batch]
+        if executor is None:
+            return [convert_chunk(chunk_values, with_time) for chunk_values in values]
+        return [executor.submit(convert_chunk, chunk_values, with_time) for chunk_values in values]
+
+    try:
+        chunks = iter_chunks(queryset, source, chunk_size, last_pk)
+        batch = [chunk for _, chunk in zip(range(workers), chunks)]
+        pending = submit(batch)
+        while batch:
+            next_batch = [chunk for _, chunk in zip(range(workers), chunks)]
+            next_pending = submit(next_batch)
+            for chunk, converted in zip(batch, pending):
+                if executor is not None:
+                    converted = converted.result()
+                objs = []
+                for (pk, _), (date_int, time_int) in zip(chunk, converted):
+                    obj = model(pk=pk)
+                    setattr(obj, date_field, date_int)
+                    if time_field:
+                        setattr(obj, time_field, time_int)
+                    objs.append(obj)
+                with transaction.atomic(using=queryset.db):
+                    model._default_manager.db_manager(queryset.db).bulk_update(objs, update_fields,
+                                                                               batch_size=chunk_size)
+                last_pk = chunk[-1][0]
+                if checkpoint:
+                    write_checkpoint(checkpoint, task, last_pk)
+                done += len(chunk)
+                if progress is not None:
+                    progress(BackfillProgress(done, total, time.perf_counter() - started, last_pk))
+            batch, pending = next_batch, next_pending
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return BackfillProgress(done, total, time.perf_counter() - started, last_pk)
+
+
+def _aware(value, default_timezone):
+    # naive datetimes (USE_TZ = False) are in the default timezone
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return timezone.make_aware(value, default_timezone)
+    return value
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, Sequence, Tuple, Union
+
+from django.db.models import QuerySet
+
+from django_jalalify.formatting import get_formatter
+from django_jalalify.timezone import TEHRAN_ZONE, make_aware
+
+DEFAULT_DATETIME_FORMAT = "%Y/%m/%d %H:%M:%S"
+DEFAULT_DATE_FORMAT = "%Y/%m/%d"
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def jalalify_value(value, fmt=DEFAULT_DATETIME_FORMAT, date_fmt=DEFAULT_DATE_FORMAT):
+    """
+    format a datetime (in Tehran) or a date, or a khayyam.JalaliDatetime or khayyam.JalaliDate, as a jalali string,
+    other values are returned as they are. naive datetimes are taken in the current django timezone (TIME_ZONE by
+    default) and converted to Tehran.
+    """
+    if isinstance(value, datetime):
+        return get_formatter(fmt).format_datetime(make_aware(value).astimezone(TEHRAN_ZONE))
+    if isinstance(value, date):
+        return get_formatter(date_fmt, date_only=True).format_date(value)
+    if hasattr(value, "todatetime"):
+        return get_formatter(fmt).format_datetime(make_aware(value.todatetime()).astimezone(TEHRAN_ZONE))
+    if hasattr(value, "todate"):
+        # a khayyam.JalaliDate, e.g. the value of a JalaliIntDateField
+        return get_formatter(date_fmt, date_only=True).format_jalali(value)
+    return value
+
+
+def _iter_rows(source, fields, chunk_size) -> Iterator[Sequence]:
+    """
+    yield the values of fields of each item of source as a sequence, resolving how to read them only once.
+    """
+    if isinstance(source, QuerySet):
+        # no model instances are built and the rows are fetched in chunks, so the memory stays flat
+        yield from source.values_list(*fields).iterator(chunk_size=chunk_size)
+        return
+    iterator = iter(source)
+    for first in iterator:
+        if isinstance(first, dict):
+            yield tuple(first[field] for field in fields)
+            for row in iterator:
+                yield tuple(row[field] for field in fields)
+        else:
+            attnames = [first._meta.get_field(field).attname for field in fields]
+            yield tuple(getattr(first, attname) for attname in attnames)
+            for obj in iterator:
+                yield tuple(getattr(obj, attname) for attname in attnames)
+
+
+def jalalify_iter(
+    source: Union[QuerySet, Iterable],
+    fields: Sequence[str],
+    fmt: str = DEFAULT_DATETIME_FORMAT,
+    date_fmt: str = DEFAULT_DATE_FORMAT,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    as_tuples: bool = False,
+) -> Iterator[Union[Dict, Tuple]]:
+    """
+    Stream the values of fields from a queryset, or an iterable of model instances or dicts, with datetimes and
+    dates formatted as jalali strings (datetimes in Tehran). e.g:
+        for row in jalalify_iter(Transaction.objects.all(), ["id", "created_at"]):
+            row == {"id": 1, "created_at": "1402/01/09 10:00:00"}
+    :param chunk_size: number of rows fetched from the database at once, for querysets.
+    :param as_tuples: yield tuples of the values in the order of fields instead of dicts.
+    """
+    for row in _iter_rows(source, fields, chunk_size):
+        values = tuple(jalalify_value(value, fmt, date_fmt) for value in row)
+        yield values if as_tuples else dict(zip(fields, values))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+
+from django_jalalify import timezone as jalalify_timezone
+from django_jalalify.conversion import ordinal_to_int_jalali_date
+
+DEFAULT_DAY_CACHE_SIZE = 4096
+DEFAULT_DAY_START_CACHE_SIZE = 1024
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A thread safe mapping which keeps at most maxsize items and evicts the least recently used one when it is full.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, factory):
+        """
+        return the cached value of key, calling factory(key) to compute and store it on a miss.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory(key)
+            self.set(key, value)
+        return value
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def reset_info(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "maxsize": self.maxsize, "currsize": len(self._data)}
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+tehran_day_cache = LRUCache(maxsize=DEFAULT_DAY_CACHE_SIZE)
+day_start_cache = LRUCache(maxsize=DEFAULT_DAY_START_CACHE_SIZE)
+
+
+def get_tehran_day(local_ordinal) -> int:
+    """
+    return the cached jalali date integer of a Tehran local date, given as a gregorian ordinal.
+    """
+    return tehran_day_cache.get_or_set(local_ordinal, ordinal_to_int_jalali_date)
+
+
+def get_tehran_jalali_date_int(date_time: datetime) -> int:
+    """
+    Tehran jalali date of the datetime as an integer, using the tehran day cache.
+    e.g: datetime(2023, 3, 29, 6, 30, tzinfo=utc) => 1402/01/09 => 14020109
+    the datetime is converted to Tehran first (naive values are in the system local time, the same way
+    datetime.astimezone() treats them), so the cache is keyed by the local date and the DST changes of the zone are
+    taken into account.
+    """
+    return get_tehran_day(date_time.astimezone(jalalify_timezone.TEHRAN_ZONE).toordinal())
+
+
+def get_tehran_day_start(ordinal) -> datetime:
+    """
+    the aware UTC datetime at which the Tehran local date of a gregorian ordinal starts.
+    e.g: date(2023, 3, 29).toordinal() => datetime(2023, 3, 28, 20, 30, tzinfo=timezone.utc)
+    """
+    # a midnight skipped by the start of DST is taken with the offset before it (fold=0), which is the instant of the
+    # transition itself, when the local date starts
+    return datetime.fromordinal(ordinal).replace(tzinfo=jalalify_timezone.TEHRAN_ZONE).astimezone(timezone.utc)
+
+
+def _build_day_start(key) -> datetime:
+    tz, ordinal = key
+    if str(tz) == "Asia/Tehran":
+        return get_tehran_day_start(ordinal)
+    midnight = datetime.fromordinal(ordinal)
+    if hasattr(tz, "localize"):
+        # pytz timezones must be attached by localize() to get the right offset
+        return tz.localize(midnight).astimezone(timezone.utc)
+    return midnight.replace(tzinfo=tz).astimezone(timezone.utc)
+
+
+def get_day_start(ordinal, tz) -> datetime:
+    """
+    the aware UTC datetime at which the date of a gregorian ordinal starts in the tz timezone, cached per (tz, date).
+    """
+    return day_start_cache.get_or_set((tz, ordinal), _build_day_start)
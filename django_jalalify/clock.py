@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+A coarse cached "now" in Tehran.
+
+The jalali date and time parts of the current instant are computed once per tick (one second by default, see the
+JALALIFY_CLOCK_TICK setting) and the get_now_tehran_jalali_*_strftime and *_intftime helpers are served from that
+snapshot, so the dates and times they return always come from the same instant. The clock reads time.time(), so
+it follows freezegun, and tehran_clock.reset() drops the snapshot.
+"""
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+from django_jalalify import timezone as jalalify_timezone
+from django_jalalify.conversion import ordinal_to_jalali
+
+DEFAULT_TICK = 1.0
+
+
+class TehranNow(NamedTuple):
+    # the instant of the snapshot in Tehran
+    datetime: datetime
+    year: int
+    month: int
+    day: int
+    # YYYYMMDD and HHMMSS
+    date_int: int
+    time_int: int
+    # the snapshot is served while started <= time.time() < expires
+    started: float
+    expires: float
+
+
+class TehranClock:
+    """
+    serves the Tehran jalali date and time of now from a snapshot which is taken at most once per tick seconds.
+    a tick of 0 takes a new snapshot on every call.
+    """
+
+    def __init__(self, tick=DEFAULT_TICK):
+        self.tick = tick
+        self._snapshot = None
+
+    def _take_snapshot(self, current) -> TehranNow:
+        local = datetime.fromtimestamp(current, jalalify_timezone.TEHRAN_ZONE)
+        year, month, day = ordinal_to_jalali(local.toordinal())
+        if self.tick:
+            # snapshots end on the tick boundaries, so two processes with the same tick agree on them
+            expires = (current // self.tick + 1) * self.tick
+        else:
+            expires = current
+        return TehranNow(
+            local, year, month, day, year * 10000 + month * 100 + day,
+            local.hour * 10000 + local.minute * 100 + local.second, current, expires,
+        )
+
+    def now(self) -> TehranNow:
+        current = time.time()
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.started <= current < snapshot.expires:
+            # the snapshot is replaced as a whole, so concurrent readers never see parts of two instants
+            snapshot = self._snapshot = self._take_snapshot(current)
+        return snapshot
+
+    def reset(self):
+        self._snapshot = None
+
+
+tehran_clock = TehranClock()
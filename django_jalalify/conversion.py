@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Table driven Jalali <-> Gregorian conversion.
+
+The ordinal of the first day of every Jalali year inside a configurable window is precomputed once, so converting a
+date is a couple of integer operations and a binary search instead of building khayyam objects. Ordinals are the same
+as ``datetime.date.toordinal()`` (0001-01-01 is day 1), and the leap year rule is the 2820 years cycle used by
+khayyam, so the results are identical to it.
+"""
+from bisect import bisect_right
+from typing import List, Tuple
+
+MINYEAR = 1
+MAXYEAR = 3178
+
+DEFAULT_FIRST_YEAR = 1300
+DEFAULT_LAST_YEAR = 1500
+
+# number of days passed from the start of the year to the first day of each month, index 0 is unused.
+_MONTH_OFFSETS = (0, 0, 31, 62, 93, 124, 155, 186, 216, 246, 276, 306, 336)
+
+_first_year = DEFAULT_FIRST_YEAR
+_last_year = DEFAULT_LAST_YEAR
+_year_starts = []
+_leap_years = bytearray()
+
+
+def _arithmetic_year_start(year) -> int:
+    """
+    ordinal of the first day of a jalali year, computed with the 2820 years cycle arithmetic of khayyam.
+    """
+    base = year - 474 if year >= 0 else year - 473
+    cycle_year = 474 + base % 2820
+    return (cycle_year * 682 - 110) // 2816 + (cycle_year - 1) * 365 + (base // 2820) * 1029983 + 226896
+
+
+def set_year_window(first_year=DEFAULT_FIRST_YEAR, last_year=DEFAULT_LAST_YEAR):
+    """
+    Rebuild the lookup tables for the jalali years between first_year and last_year (inclusive).
+    years outside of the window are still supported but are computed arithmetically.
+    """
+    global _first_year, _last_year, _year_starts, _leap_years
+    if not MINYEAR <= first_year <= last_year <= MAXYEAR:
+        raise ValueError("Year window must be between %s and %s, but it is: %s-%s" % (
+            MINYEAR, MAXYEAR, first_year, last_year))
+    # one extra entry is kept to know the length of the last year of the window
+    starts = [_arithmetic_year_start(year) for year in range(first_year, last_year + 2)]
+    _year_starts = starts
+    _leap_years = bytearray(starts[i + 1] - starts[i] == 366 for i in range(len(starts) - 1))
+    _first_year = first_year
+    _last_year = last_year
+
+
+def get_year_window() -> Tuple[int, int]:
+    return _first_year, _last_year
+
+
+def get_year_starts() -> Tuple[int, List[int]]:
+    """
+    return the first year of the window and the ordinals of the first day of each year of it. the list has one more
+    item than the number of years, which is the start of the year after the window.
+    """
+    return _first_year, _year_starts
+
+
+def year_start_ordinal(year) -> int:
+    if _first_year <= year <= _last_year:
+        return _year_starts[year - _first_year]
+    if not MINYEAR <= year <= MAXYEAR:
+        raise ValueError("Year must be between %s and %s, but it is: %s" % (MINYEAR, MAXYEAR, year))
+    return _arithmetic_year_start(year)
+
+
+def is_leap_year(year) -> bool:
+    if _first_year <= year <= _last_year:
+        return _leap_years[year - _first_year] == 1
+    return _arithmetic_year_start(year + 1) - year_start_ordinal(year) == 366
+
+
+def days_in_month(year, month) -> int:
+    if month <= 6:
+        return 31
+    if month <= 11:
+        return 30
+    return 30 if is_leap_year(year) else 29
+
+
+def jalali_to_ordinal(year, month, day) -> int:
+    """
+    convert a jalali date to the gregorian proleptic ordinal: (1402, 1, 9) => 738608 == date(2023, 3, 29).toordinal()
+    """
+    if not 1 <= month <= 12:
+        raise ValueError("Month must be between 1 and 12, but it is: %s" % month)
+    if _first_year <= year <= _last_year:
+        start = _year_starts[year - _first_year]
+    else:
+        start = year_start_ordinal(year)
+    # every month has at least 29 days, so the month length is looked up only for the last days of a month
+    if (day < 1 or day > 29) and not 1 <= day <= days_in_month(year, month):
+        raise ValueError("Day must be between 1 and %s, but it is: %s" % (days_in_month(year, month), day))
+    return start + _MONTH_OFFSETS[month] + day - 1
+
+
+def ordinal_to_jalali(ordinal) -> Tuple[int, int, int]:
+    """
+    convert a gregorian proleptic ordinal to a jalali (year, month, day) tuple: 738608 => (1402, 1, 9)
+    """
+    starts = _year_starts
+    if starts[0] <= ordinal < starts[-1]:
+        index = bisect_right(starts, ordinal) - 1
+        year = _first_year + index
+        day_of_year = ordinal - starts[index]
+    else:
+        # estimate the year from the average length of a jalali year and fix it up
+        year = (ordinal - 226895) * 2820 // 1029983 + 1
+        while _arithmetic_year_start(year) > ordinal:
+            year -= 1
+        while _arithmetic_year_start(year + 1) <= ordinal:
+            year += 1
+        if not MINYEAR <= year <= MAXYEAR:
+            raise ValueError("Year must be between %s and %s, but it is: %s" % (MINYEAR, MAXYEAR, year))
+        day_of_year = ordinal - _arithmetic_year_start(year)
+    if day_of_year < 186:
+        return year, day_of_year // 31 + 1, day_of_year % 31 + 1
+    day_of_year -= 186
+    return year, day_of_year // 30 + 7, day_of_year % 30 + 1
+
+
+def jalali_date_to_int(year, month, day) -> int:
+    """
+    pack a jalali date into an integer: (1402, 1, 9) => 14020109
+    """
+    return year * 10000 + month * 100 + day
+
+
+def int_to_jalali_date(value) -> Tuple[int, int, int]:
+    """
+    unpack an integer jalali date: 14020109 => (1402, 1, 9)
+    """
+    return value // 10000, value // 100 % 100, value % 100
+
+
+def ordinal_to_int_jalali_date(ordinal) -> int:
+    year, month, day = ordinal_to_jalali(ordinal)
+    return year * 10000 + month * 100 + day
+
+
+def time_to_int(hour, minute, second) -> int:
+    """
+    pack a time into an integer: (10, 20, 30) => 102030
+    """
+    return hour * 10000 + minute * 100 + second
+
+
+def int_to_time(value) -> Tuple[int, int, int]:
+    """
+    unpack an integer time: 102030 => (10, 20, 30)
+    """
+    return value // 10000, value // 100 % 100, value % 100
+
+
+set_year_window()
+
+# the pure python versions of the functions which are compiled by the optional django_jalalify._speedups extension
+# (see setup.py), the compiled ones replace them when it is built.
+PYTHON_IMPLEMENTATION = {
+    function.__name__: function for function in (
+        jalali_to_ordinal, ordinal_to_jalali, ordinal_to_int_jalali_date, jalali_date_to_int, int_to_jalali_date,
+        time_to_int, int_to_time,
+    )
+}
+
+try:
+    from django_jalalify._speedups import (  # noqa: F811
+        int_to_jalali_date, int_to_time, jalali_date_to_int, jalali_to_ordinal, ordinal_to_int_jalali_date,
+        ordinal_to_jalali, time_to_int,
+    )
+    SPEEDUPS = True
+except ImportError:
+    SPEEDUPS = False
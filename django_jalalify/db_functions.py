@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Database functions which compute the jalali calendar parts of a date or datetime column inside the database, so rows
+can be grouped by jalali periods in a single query::
+
+    Transaction.objects.values(month=JalaliMonth("created_at")).annotate(total=Sum("amount"))
+    Transaction.objects.values(month=JalaliTruncMonth("created_at")).annotate(total=Sum("amount"))
+
+On PostgreSQL the parts are computed in SQL from the ordinal of the local date and the table of jalali year starts
+(see django_jalalify.conversion), on SQLite by a function which is registered on every new connection.
+"""
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import NotSupportedError
+from django.db.backends.signals import connection_created
+from django.db.backends.utils import typecast_timestamp
+from django.db.models import Func, IntegerField
+from django.dispatch import receiver
+
+from django_jalalify.cache import get_tehran_jalali_date_int
+from django_jalalify.conversion import (
+    get_year_starts, get_year_window, int_to_jalali_date, jalali_to_ordinal, ordinal_to_int_jalali_date
+)
+from django_jalalify.timezone import get_zone
+
+TEHRAN_TZNAME = "Asia/Tehran"
+
+SQLITE_FUNCTION_NAME = "django_jalalify_jalali_extract"
+
+
+def _sqlite_jalali_extract(value, part, tzname):
+    """
+    return the jalali part ("year", "month", "day", "date" or the first "year_start", "month_start" or "week_start"
+    date of its period) of a date or UTC datetime stored by django on SQLite.
+    """
+    if value is None:
+        return None
+    value = typecast_timestamp(value)
+    if not isinstance(value, datetime):
+        jalali_date = ordinal_to_int_jalali_date(value.toordinal())
+    elif tzname is None:
+        jalali_date = ordinal_to_int_jalali_date(value.toordinal())
+    elif tzname == TEHRAN_TZNAME:
+        jalali_date = get_tehran_jalali_date_int(value.replace(tzinfo=timezone.utc))
+    else:
+        local_value = value.replace(tzinfo=timezone.utc).astimezone(get_zone(tzname))
+        jalali_date = ordinal_to_int_jalali_date(local_value.toordinal())
+    if part == "year":
+        return jalali_date // 10000
+    if part == "month":
+        return jalali_date // 100 % 100
+    if part == "day":
+        return jalali_date % 100
+    if part == "year_start":
+        return jalali_date // 10000 * 10000 + 101
+    if part == "month_start":
+        return jalali_date // 100 * 100 + 1
+    if part == "week_start":
+        ordinal = jalali_to_ordinal(*int_to_jalali_date(jalali_date))
+        return ordinal_to_int_jalali_date(ordinal - _days_since_shanbeh(ordinal))
+    return jalali_date
+
+
+def _days_since_shanbeh(ordinal) -> int:
+    # the ordinal 1 (0001-01-01) is a monday, two days after a shanbeh
+    return (ordinal + 1) % 7
+
+
+@receiver(connection_created)
+def register_sqlite_functions(sender, connection, **kwargs):
+    if connection.vendor == "sqlite":
+        connection.connection.create_function(SQLITE_FUNCTION_NAME, 3, _sqlite_jalali_extract, deterministic=True)
+
+
+@lru_cache(maxsize=8)
+def _postgresql_year_starts(year_window):
+    """
+    the year starts of the current window (year_window is only the cache key) as a PostgreSQL array literal.
+    """
+    first_year, starts = get_year_starts()
+    return "'{%s}'::integer[]" % ",".join(str(start) for start in starts)
+
+
+class JalaliExtract(Func):
+    """
+    Base class of the jalali part functions. The expression is converted to the local date of tzname (Tehran by
+    default) first, when USE_TZ is enabled.
+    """
+    part = None
+    output_field = IntegerField()
+
+    def __init__(self, expression, tzname=TEHRAN_TZNAME, **extra):
+        self.tzname = tzname
+        super().__init__(expression, **extra)
+
+    def get_tzname(self):
+        return self.tzname if settings.USE_TZ else None
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError("%s is only supported on PostgreSQL and SQLite." % self.__class__.__name__)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.get_source_expressions()[0])
+        return "%s(%s, %%s, %%s)" % (SQLITE_FUNCTION_NAME, sql), [*params, self.part, self.get_tzname()]
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.get_source_expressions()[0])
+        tzname = self.get_tzname()
+        if tzname is not None and self.get_source_expressions()[0].output_field.get_internal_type() == "DateTimeField":
+            sql, params = "(%s AT TIME ZONE %%s)" % sql, [*params, tzname]
+        return self.get_postgresql_template() % {"ordinal": "((%s)::date - DATE '0001-01-01' + 1)" % sql}, params
+
+    def get_postgresql_template(self):
+        """
+        a scalar subquery which computes the ordinal of the local date (o) once, then the jalali year (y) and the day
+        of the year (d) from it, and the part from y and d. OFFSET 0 keeps PostgreSQL from inlining the subqueries into
+        each reference. dates outside the year window raise an error instead of giving NULL or a wrong year.
+        """
+        first_year, last_year = get_year_window()
+        ordinal = "SELECT %%(ordinal)s AS o, %s AS s OFFSET 0" % _postgresql_year_starts((first_year, last_year))
+        if self.part == "week_start":
+            # the date of the shanbeh which starts the week, the ordinal 1 (0001-01-01) is a monday
+            ordinal = "SELECT o - MOD(o + 1, 7) AS o, s FROM (%s) AS jalali_local OFFSET 0" % ordinal
+        # s[1] is the start of the first year of the window and s[n] the start of the year after the last one
+        year_index = (
+            "SELECT o, s, CASE WHEN o >= s[1] AND o < s[%d] THEN width_bucket(o, s) "
+            "ELSE CAST('jalali date out of the year window, ordinal: ' || o AS integer) END AS i "
+            "FROM (%s) AS jalali_ordinal OFFSET 0"
+        ) % (last_year - first_year + 2, ordinal)
+        year_and_day = "SELECT %d + i AS y, o - s[i] AS d FROM (%s) AS jalali_year OFFSET 0" % (
+            first_year - 1, year_index)
+        return "(SELECT %s FROM (%s) AS jalali_day)" % (self.get_postgresql_part(self.part), year_and_day)
+
+    def get_postgresql_part(self, part):
+        month = "(CASE WHEN d < 186 THEN d / 31 + 1 ELSE (d - 186) / 30 + 7 END)"
+        day = "(CASE WHEN d < 186 THEN MOD(d, 31) + 1 ELSE MOD(d - 186, 30) + 1 END)"
+        if part == "year":
+            return "y"
+        if part == "month":
+            return month
+        if part == "day":
+            return day
+        if part == "year_start":
+            return "y * 10000 + 101"
+        if part == "month_start":
+            return "y * 10000 + %s * 100 + 1" % month
+        return "y * 10000 + %s * 100 + %s" % (month, day)
+
+
+class JalaliYear(JalaliExtract):
+    part = "year"
+
+
+class JalaliMonth(JalaliExtract):
+    part = "month"
+
+
+class JalaliDay(JalaliExtract):
+    part = "day"
+
+
+class JalaliDateInt(JalaliExtract):
+    """
+    the jalali date as an integer of the YYYYMMDD format, the same as convert_datetime_to_custom_jalali_date.
+    """
+    part = "date"
+
+
+class JalaliTruncYear(JalaliExtract):
+    """
+    the first day of the jalali year as a YYYYMMDD integer: 1402/07/15 => 14020101. output_field=JalaliIntDateField()
+    loads it as a JalaliDate.
+    """
+    part = "year_start"
+
+
+class JalaliTruncMonth(JalaliExtract):
+    """
+    the first day of the jalali month as a YYYYMMDD integer: 1402/07/15 => 14020701.
+    """
+    part = "month_start"
+
+
+class JalaliTruncWeek(JalaliExtract):
+    """
+    the shanbeh which starts the week as a YYYYMMDD integer: 1402/07/15 (a yekshanbeh) => 14020714.
+    """
+    part = "week_start"
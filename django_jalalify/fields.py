@@ -4,7 +4,7 @@ from django.forms.utils import from_current_timezone
 from django.utils.translation import gettext_lazy as _
 from django_filters import fields, widgets
 
-from django_jalalify import JalaliDate, JalaliDatetime
+from django_jalalify.parsing import parse_jalali_date, parse_jalali_datetime
 
 
 class JalaliDateTimeField(DateTimeField):
@@ -21,7 +21,7 @@ class JalaliDateTimeField(DateTimeField):
         if value in self.empty_values:
             return None
         try:
-            dt = JalaliDatetime.strptime(value, "%Y/%m/%d %H:%M:%S").todatetime()
+            dt = parse_jalali_datetime(value)
         except (ValueError, TypeError):
             raise ValidationError(message={"datetime_jalali": [self.error_messages["invalid"]]}, code="invalid")
         return from_current_timezone(dt)
@@ -37,11 +37,18 @@ class JalaliDateField(DateTimeField):
         if value in self.empty_values:
             return None
         try:
-            dt = JalaliDate.strptime(value, "%Y/%m/%d").todate()
+            dt = parse_jalali_date(value)
         except (ValueError, TypeError):
             raise ValidationError(self.error_messages["invalid"], code="invalid")
         return dt
 
+    def prepare_value(self, value):
+        from django_jalalify import JalaliDate
+
+        if isinstance(value, JalaliDate):
+            return value.strftime("%Y/%m/%d")
+        return super().prepare_value(value)
+
 
 class JalaliDateRangeField(fields.RangeField):
     widget = widgets.DateRangeWidget
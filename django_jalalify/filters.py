@@ -1,5 +1,12 @@
+import datetime
+
 import django_filters
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django_filters.utils import get_model_field
 
+from django_jalalify.cache import get_day_start
 from django_jalalify.fields import JalaliDateRangeField, JalaliDateTimeRangeField
 
 
@@ -7,8 +14,41 @@ class JalaliDateFromToRangeFilter(django_filters.DateFromToRangeFilter):
     """
     An extension on django_filters.IsoDateTimeFromToRangeFilter which accepts Jalali date as input and then
      converts it to datetime instance.
+    With half_open_range (or the JALALIFY_HALF_OPEN_RANGES setting when it is None) the dates are filtered as
+     [from date start, day after to date start) in the current timezone, precomputed in UTC.
     """
     field_class = JalaliDateRangeField
+    half_open_range = None
+
+    def use_half_open_range(self):
+        if self.half_open_range is None:
+            return getattr(settings, "JALALIFY_HALF_OPEN_RANGES", False)
+        return self.half_open_range
+
+    @staticmethod
+    def get_day_start(date, model_field):
+        """
+        the first moment of the date in the current timezone for datetime fields, the date itself for other fields.
+        """
+        if not isinstance(model_field, models.DateTimeField):
+            return date
+        if not settings.USE_TZ:
+            return datetime.datetime.combine(date, datetime.time.min)
+        return get_day_start(date.toordinal(), timezone.get_current_timezone())
+
+    def filter(self, qs, value):
+        if not value or not self.use_half_open_range():
+            return super().filter(qs, value)
+        model_field = get_model_field(qs.model, self.field_name)
+        lookups = {}
+        if value.start is not None:
+            lookups["%s__gte" % self.field_name] = self.get_day_start(value.start, model_field)
+        if value.stop is not None:
+            lookups["%s__lt" % self.field_name] = self.get_day_start(value.stop + datetime.timedelta(days=1),
+                                                                     model_field)
+        if self.distinct:
+            qs = qs.distinct()
+        return self.get_method(qs)(**lookups)
 
 
 class JalaliIsoDateTimeFromToRangeFilter(django_filters.IsoDateTimeFromToRangeFilter):
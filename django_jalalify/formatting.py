@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Precompiled jalali strftime.
+
+khayyam parses the format string on every strftime call. A JalaliFormatter compiles it once into a printf style
+template and the list of values to put in it, so formatting is a single ``%`` operation on the integer calendar parts.
+The numeric directives (%Y %y %m %d %j %H %M %S %f %%) are rendered directly, any other khayyam directive (names of
+months and weekdays, persian digits, ...) is delegated to khayyam, so the output is the same as khayyam strftime.
+"""
+import re
+from datetime import date, datetime
+from operator import itemgetter
+
+from django_jalalify.cache import LRUCache
+from django_jalalify.conversion import _MONTH_OFFSETS, ordinal_to_jalali
+
+DEFAULT_FORMATTER_CACHE_SIZE = 256
+
+FORMAT_DIRECTIVE_REGEX = re.compile("%[a-zA-Z%]")
+
+# directive: (template, index of the value in (year, month, day, hour, minute, second, microsecond) or a function)
+_DATE_DIRECTIVES = {
+    "Y": ("%04d", 0),
+    "m": ("%02d", 1),
+    "d": ("%02d", 2),
+    "y": ("%02d", lambda parts: parts[0] % 100),
+    "j": ("%03d", lambda parts: _MONTH_OFFSETS[parts[1]] + parts[2]),
+}
+_TIME_DIRECTIVES = {
+    "H": ("%02d", 3),
+    "M": ("%02d", 4),
+    "S": ("%02d", 5),
+    "f": ("%06d", 6),
+}
+
+formatter_cache = LRUCache(maxsize=DEFAULT_FORMATTER_CACHE_SIZE)
+
+
+class JalaliFormatter:
+    """
+    A jalali strftime format string, compiled once. date_only formatters behave like khayyam.JalaliDate.strftime,
+    which leaves the time directives as they are.
+    """
+
+    def __init__(self, format_string, date_only=False):
+        self.format_string = format_string
+        self.date_only = date_only
+        self._template, self._values = self._compile()
+        if all(isinstance(value, int) for value in self._values):
+            # the common case: every value is one of the parts, taken by a single itemgetter call
+            getter = itemgetter(*self._values) if self._values else (lambda parts: ())
+            self._getter = (lambda parts: (getter(parts),)) if len(self._values) == 1 else getter
+        else:
+            self._getter = None
+
+    def _compile(self):
+        directives = dict(_DATE_DIRECTIVES) if self.date_only else {**_DATE_DIRECTIVES, **_TIME_DIRECTIVES}
+        khayyam_directives = None
+        template, values, index = [], [], 0
+        for match in FORMAT_DIRECTIVE_REGEX.finditer(self.format_string):
+            key = match.group()[1:]
+            if key == "%":
+                template.append(self.format_string[index:match.start()].replace("%", "%%") + "%%")
+            elif key in directives:
+                directive_template, value = directives[key]
+                template.append(self.format_string[index:match.start()].replace("%", "%%") + directive_template)
+                values.append(value)
+            else:
+                if khayyam_directives is None:
+                    from khayyam.formatting.directives import DATE_FORMAT_DIRECTIVES, DATETIME_FORMAT_DIRECTIVES
+
+                    directive_db = DATE_FORMAT_DIRECTIVES if self.date_only else DATETIME_FORMAT_DIRECTIVES
+                    khayyam_directives = {directive.key: directive for directive in directive_db}
+                if key not in khayyam_directives:
+                    # unknown directives are left as they are, the same as khayyam
+                    continue
+                template.append(self.format_string[index:match.start()].replace("%", "%%") + "%s")
+                values.append(khayyam_directives[key])
+            index = match.end()
+        template.append(self.format_string[index:].replace("%", "%%"))
+        return "".join(template), values
+
+    def _khayyam_object(self, parts, tzinfo):
+        from django_jalalify import JalaliDate, JalaliDatetime
+
+        if self.date_only:
+            return JalaliDate(*parts[:3])
+        return JalaliDatetime(*parts, tzinfo=tzinfo)
+
+    def format(self, year, month, day, hour=0, minute=0, second=0, microsecond=0, tzinfo=None) -> str:
+        """
+        format jalali calendar parts: (1402, 1, 9, 10, 20, 30) with "%Y/%m/%d %H:%M:%S" => "1402/01/09 10:20:30"
+        """
+        parts = (year, month, day, hour, minute, second, microsecond)
+        if self._getter is not None:
+            return self._template % self._getter(parts)
+        khayyam_object = None
+        args = []
+        for value in self._values:
+            if isinstance(value, int):
+                args.append(parts[value])
+            elif callable(value):
+                args.append(value(parts))
+            else:
+                # a khayyam directive
+                if khayyam_object is None:
+                    khayyam_object = self._khayyam_object(parts, tzinfo)
+                args.append(value.format(khayyam_object))
+        return self._template % tuple(args)
+
+    def format_datetime(self, value: datetime) -> str:
+        """
+        format a gregorian datetime as jalali, in its own timezone.
+        """
+        year, month, day = ordinal_to_jalali(value.toordinal())
+        return self.format(year, month, day, value.hour, value.minute, value.second, value.microsecond, value.tzinfo)
+
+    def format_date(self, value: date) -> str:
+        year, month, day = ordinal_to_jalali(value.toordinal())
+        return self.format(year, month, day)
+
+    def format_jalali(self, value) -> str:
+        """
+        format a khayyam.JalaliDate or khayyam.JalaliDatetime.
+        """
+        if hasattr(value, "hour"):
+            return self.format(value.year, value.month, value.day, value.hour, value.minute, value.second,
+                               value.microsecond, value.tzinfo)
+        return self.format(value.year, value.month, value.day)
+
+
+def get_formatter(format_string, date_only=False) -> JalaliFormatter:
+    """
+    return the compiled formatter of format_string, cached by the format string.
+    """
+    return formatter_cache.get_or_set((format_string, date_only), lambda key: JalaliFormatter(*key))
+
+
+def jalali_strftime(value, format_string) -> str:
+    """
+    format a gregorian datetime or date, or a khayyam object, with a jalali strftime format string:
+    datetime(2023, 3, 29, 10, 20, 30) with "%Y/%m/%d %H:%M:%S" => "1402/01/09 10:20:30"
+    """
+    if isinstance(value, datetime):
+        return get_formatter(format_string).format_datetime(value)
+    if isinstance(value, date):
+        return get_formatter(format_string, date_only=True).format_date(value)
+    return get_formatter(format_string, date_only=not hasattr(value, "hour")).format_jalali(value)
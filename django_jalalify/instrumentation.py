@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in call counters and timings of django_jalalify.
+
+enable() replaces the public functions of django_jalalify.utils, the to_python methods of the jalali form fields and
+DateRangeFilter.queryset by wrappers which count their calls and their cumulative time, and disable() puts the
+original functions back. Nothing is wrapped until enable() is called (the JALALIFY_INSTRUMENTATION setting calls it
+when the app is ready), so the instrumentation costs nothing while it is disabled. Calls through names which were
+imported from django_jalalify.utils before enable() are not counted.
+
+snapshot() returns the counters and the hit rates of the caches of the package. report() sends it with the
+stats_reported signal, and save_snapshots() writes it to a directory on each report and at exit, where the
+jalalify_stats management command adds up the snapshots of every process.
+"""
+import atexit
+import inspect
+import json
+import os
+import time
+from functools import wraps
+from importlib import import_module
+from threading import Lock
+from typing import Dict, Iterable
+
+from django_jalalify.signals import call_measured, stats_reported
+
+# (module, "Class.method"), None instruments every public function defined in the module
+INSTRUMENTED_TARGETS = [
+    ("django_jalalify.utils", None),
+    ("django_jalalify.fields", "JalaliDateTimeField.to_python"),
+    ("django_jalalify.fields", "JalaliDateField.to_python"),
+    ("django_jalalify.admin.filters", "DateRangeFilter.queryset"),
+]
+
+# (module, name) of the LRUCache instances and the functools.lru_cache functions of the package
+INSTRUMENTED_CACHES = [
+    ("django_jalalify.cache", "tehran_day_cache"),
+    ("django_jalalify.cache", "day_start_cache"),
+    ("django_jalalify.formatting", "formatter_cache"),
+    ("django_jalalify.periods", "month_start_cache"),
+    ("django_jalalify.periods", "shortcut_cache"),
+    ("django_jalalify.timezone", "get_tehran_utc_transitions"),
+    ("django_jalalify.db_functions", "_postgresql_year_starts"),
+]
+
+# {name: [calls, seconds]}, the lists are updated in place by the wrappers
+_counters = {}
+# (owner, attribute, original) of the installed wrappers
+_installed = []
+_lock = Lock()
+# whether report() is registered to run at exit, by save_snapshots()
+_report_at_exit = False
+
+
+def _measure(name, function):
+    counter = _counters.setdefault(name, [0, 0.0])
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - started
+            with _lock:
+                counter[0] += 1
+                counter[1] += duration
+            if call_measured.receivers:
+                call_measured.send(sender=None, name=name, duration=duration)
+
+    return wrapper
+
+
+def _iter_targets():
+    for module_name, attribute in INSTRUMENTED_TARGETS:
+        try:
+            module = import_module(module_name)
+        except ImportError:
+            # the admin filters need django_jalali and jdatetime, which are not installed with the package
+            continue
+        if attribute is None:
+            for name, value in list(vars(module).items()):
+                if inspect.isfunction(value) and value.__module__ == module_name and not name.startswith("_"):
+                    yield module, name, "%s.%s" % (module_name, name)
+        else:
+            class_name, name = attribute.split(".")
+            yield getattr(module, class_name), name, "%s.%s" % (module_name, attribute)
+
+
+def enable():
+    """
+    install the wrappers, calling it again while they are installed does nothing.
+    """
+    with _lock:
+        if _installed:
+            return
+        for owner, name, qualified_name in _iter_targets():
+            original = vars(owner)[name]
+            _installed.append((owner, name, original))
+            setattr(owner, name, _measure(qualified_name, original))
+
+
+def disable():
+    """
+    put the original functions back, the counters are kept.
+    """
+    with _lock:
+        while _installed:
+            owner, name, original = _installed.pop()
+            setattr(owner, name, original)
+
+
+def is_enabled() -> bool:
+    return bool(_installed)
+
+
+def reset():
+    """
+    zero the call counters and the hits and misses of the LRUCache caches. the counts of the lru_cache functions can
+    not be reset without dropping what they cache, so they count since the start of the process.
+    """
+    with _lock:
+        for counter in _counters.values():
+            counter[0], counter[1] = 0, 0.0
+    for cache in _iter_caches():
+        if hasattr(cache, "reset_info"):
+            cache.reset_info()
+
+
+def _iter_caches():
+    for module_name, name in INSTRUMENTED_CACHES:
+        yield getattr(import_module(module_name), name)
+
+
+def _cache_info(cache) -> dict:
+    if hasattr(cache, "cache_info"):
+        info = cache.cache_info()._asdict()
+    else:
+        info = cache.info()
+    lookups = info["hits"] + info["misses"]
+    info["hit_rate"] = info["hits"] / lookups if lookups else None
+    return info
+
+
+def snapshot() -> dict:
+    """
+    the counters of the process: {"pid": ..., "enabled": ..., "functions": {name: {"calls", "total_time"}},
+    "caches": {name: {"hits", "misses", "maxsize", "currsize", "hit_rate"}}}, times are in seconds.
+    """
+    with _lock:
+        functions = {name: {"calls": calls, "total_time": total_time}
+                     for name, (calls, total_time) in _counters.items()}
+    caches = {
+        "%s.%s" % (module_name, name): _cache_info(cache)
+        for (module_name, name), cache in zip(INSTRUMENTED_CACHES, _iter_caches())
+    }
+    return {"pid": os.getpid(), "enabled": is_enabled(), "functions": functions, "caches": caches}
+
+
+def merge_snapshots(snapshots: Iterable[dict]) -> dict:
+    """
+    add up the snapshots of several processes into one of the same shape, with the number of processes.
+    """
+    merged = {"processes": 0, "functions": {}, "caches": {}}
+    for process_snapshot in snapshots:
+        merged["processes"] += 1
+        for name, function in process_snapshot["functions"].items():
+            total = merged["functions"].setdefault(name, {"calls": 0, "total_time": 0.0})
+            total["calls"] += function["calls"]
+            total["total_time"] += function["total_time"]
+        for name, info in process_snapshot["caches"].items():
+            total = merged["caches"].setdefault(name, {
+                "hits": 0, "misses": 0, "maxsize": info["maxsize"], "currsize": 0,
+            })
+            for key in ["hits", "misses", "currsize"]:
+                total[key] += info[key]
+    for info in merged["caches"].values():
+        lookups = info["hits"] + info["misses"]
+        info["hit_rate"] = info["hits"] / lookups if lookups else None
+    return merged
+
+
+def report() -> dict:
+    """
+    send the snapshot of the process with the stats_reported signal and return it.
+    """
+    process_snapshot = snapshot()
+    stats_reported.send(sender=None, snapshot=process_snapshot)
+    return process_snapshot
+
+
+def snapshot_path(directory, pid) -> str:
+    return os.path.join(directory, "%s.json" % pid)
+
+
+def save_snapshots(directory):
+    """
+    write the snapshot of the process to directory/<pid>.json on every report() and at exit.
+    """
+    global _report_at_exit
+    os.makedirs(directory, exist_ok=True)
+
+    def write_snapshot(sender, snapshot, **kwargs):
+        path = snapshot_path(directory, snapshot["pid"])
+        with open(path + ".tmp", "w") as file:
+            json.dump(snapshot, file)
+        # readers never see a partly written snapshot
+        os.replace(path + ".tmp", path)
+
+    stats_reported.connect(write_snapshot, weak=False, dispatch_uid=("django_jalalify.save_snapshots", directory))
+    with _lock:
+        if not _report_at_exit:
+            atexit.register(report)
+            _report_at_exit = True
+
+
+def load_snapshots(directory) -> Dict[str, dict]:
+    """
+    the snapshots saved in directory by save_snapshots(), by file name.
+    """
+    snapshots = {}
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(".json"):
+            with open(os.path.join(directory, file_name)) as file:
+                snapshots[file_name] = json.load(file)
+    return snapshots
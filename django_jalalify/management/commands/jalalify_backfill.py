@@ -0,0 +1,67 @@
+import os
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+
+from django_jalalify.backfill import DEFAULT_BACKFILL_CHUNK_SIZE, backfill
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill a jalali integer date column (YYYYMMDD) and optionally a time column (HHMMSS) of every row of a model "
+        "from its datetime or date column, in Tehran. An interrupted backfill resumes from its checkpoint file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="app_label.Model")
+        parser.add_argument("source", help="the datetime or date field to convert.")
+        parser.add_argument("date_field", help="the integer field of the jalali dates.")
+        parser.add_argument("time_field", nargs="?", help="the integer field of the times.")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_BACKFILL_CHUNK_SIZE,
+                            help="rows read, converted and written at once.")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="processes the chunks are converted in, while the previous chunks are written.")
+        parser.add_argument(
+            "--checkpoint",
+            help="file in which the last written primary key is saved, jalalify_backfill.<model>.<date_field>.json "
+                 "in the current directory by default.",
+        )
+        parser.add_argument("--restart", action="store_true",
+                            help="ignore the checkpoint and start from the first row.")
+        parser.add_argument("--only-null", action="store_true", help="only the rows whose date field is null.")
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+        checkpoint = options["checkpoint"] or "jalalify_backfill.%s.%s.json" % (
+            model._meta.label_lower, options["date_field"])
+        if options["restart"]:
+            self.remove_checkpoint(checkpoint)
+        try:
+            result = backfill(
+                model, options["source"], options["date_field"], options["time_field"],
+                chunk_size=options["chunk_size"], workers=options["workers"], checkpoint=checkpoint,
+                only_null=options["only_null"], progress=self.write_progress,
+            )
+        except (FieldDoesNotExist, ValueError) as e:
+            raise CommandError(e)
+        self.remove_checkpoint(checkpoint)
+        self.stdout.write(self.style.SUCCESS(
+            "%d rows backfilled in %.1fs (%.0f rows/s)." % (result.done, result.elapsed, result.rate)
+        ))
+
+    def write_progress(self, progress):
+        percent = progress.done / progress.total * 100 if progress.total else 100
+        self.stdout.write("%d/%d rows (%.1f%%), %.0f rows/s, last pk %s" % (
+            progress.done, progress.total, percent, progress.rate, progress.last_pk))
+
+    @staticmethod
+    def remove_checkpoint(path):
+        for file_path in [path, path + ".tmp"]:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
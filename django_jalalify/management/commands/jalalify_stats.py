@@ -0,0 +1,52 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from django_jalalify import instrumentation
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the call counters and the cache hit rates of django_jalalify, added up over the snapshots which the "
+        "processes saved in JALALIFY_INSTRUMENTATION_DIR, or of this process when it is not set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir", default=getattr(settings, "JALALIFY_INSTRUMENTATION_DIR", None),
+            help="directory of the saved snapshots, JALALIFY_INSTRUMENTATION_DIR by default.",
+        )
+        parser.add_argument("--json", action="store_true", help="print the stats as JSON.")
+        parser.add_argument("--reset", action="store_true", help="delete the saved snapshots after showing them.")
+
+    def handle(self, *args, **options):
+        directory = options["dir"]
+        if directory:
+            snapshots = instrumentation.load_snapshots(directory) if os.path.isdir(directory) else {}
+            stats = instrumentation.merge_snapshots(snapshots.values())
+        else:
+            stats = instrumentation.merge_snapshots([instrumentation.snapshot()])
+        if options["json"]:
+            self.stdout.write(json.dumps(stats, indent=2, sort_keys=True))
+        else:
+            self.write_table(stats)
+        if options["reset"]:
+            if directory:
+                for file_name in snapshots:
+                    os.remove(os.path.join(directory, file_name))
+            else:
+                instrumentation.reset()
+
+    def write_table(self, stats):
+        self.stdout.write("processes: %d" % stats["processes"])
+        self.stdout.write("%-70s %10s %12s %12s" % ("function", "calls", "total (ms)", "mean (us)"))
+        for name, function in sorted(stats["functions"].items()):
+            calls, total_time = function["calls"], function["total_time"]
+            mean = total_time / calls * 1e6 if calls else 0
+            self.stdout.write("%-70s %10d %12.3f %12.3f" % (name, calls, total_time * 1e3, mean))
+        self.stdout.write("%-70s %10s %12s %12s" % ("cache", "hits", "misses", "hit rate"))
+        for name, info in sorted(stats["caches"].items()):
+            hit_rate = "-" if info["hit_rate"] is None else "%.1f%%" % (info["hit_rate"] * 100)
+            self.stdout.write("%-70s %10d %12d %12s" % (name, info["hits"], info["misses"], hit_rate))
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+from datetime import date, datetime, time
+
+from django import forms
+from django.core import exceptions
+from django.db import models
+from django.db.models.lookups import Exact, GreaterThan, GreaterThanOrEqual, LessThan, LessThanOrEqual
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from django_jalalify.cache import get_tehran_jalali_date_int
+from django_jalalify.conversion import jalali_date_to_int, jalali_to_ordinal, ordinal_to_int_jalali_date
+from django_jalalify.fields import JalaliDateField
+from django_jalalify.timezone import make_aware
+
+
+def _integer_division(sql, divisor, connection):
+    if connection.vendor == "mysql":
+        return "(%s DIV %d)" % (sql, divisor)
+    if connection.vendor == "oracle":
+        return "TRUNC(%s / %d)" % (sql, divisor)
+    return "(%s / %d)" % (sql, divisor)
+
+
+class JalaliIntDateField(models.IntegerField):
+    """
+    A jalali date stored as an integer of the YYYYMMDD format (e.g. 14020109) and represented as a
+    khayyam.JalaliDate in python. JalaliDate, date, datetime (taken in Tehran, naive ones are in the current django
+    timezone), int and "YYYY/mm/dd" string values are accepted.
+    """
+    description = _("Jalali date (stored as an integer YYYYMMDD)")
+    default_error_messages = {
+        "invalid": _("“%(value)s” value has an invalid jalali date format. It must be in YYYY/mm/dd format."),
+    }
+
+    @cached_property
+    def validators(self):
+        # the integer range validators of IntegerField can not compare against JalaliDate values
+        return [*self.default_validators, *self._validators]
+
+    def to_int(self, value):
+        if value is None or isinstance(value, int):
+            return value
+        from django_jalalify import JalaliDate
+
+        if isinstance(value, JalaliDate):
+            return jalali_date_to_int(value.year, value.month, value.day)
+        if isinstance(value, datetime):
+            return get_tehran_jalali_date_int(make_aware(value))
+        if isinstance(value, date):
+            return ordinal_to_int_jalali_date(value.toordinal())
+        try:
+            value = str(value).replace("/", "").replace("-", "")
+            if len(value) != 8:
+                raise ValueError(value)
+            return int(value)
+        except ValueError:
+            raise exceptions.ValidationError(self.error_messages["invalid"], code="invalid", params={"value": value})
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        return self.to_int(value)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        from django_jalalify import JalaliDate
+
+        return JalaliDate(value // 10000, value // 100 % 100, value % 100)
+
+    def to_python(self, value):
+        from django_jalalify import JalaliDate
+
+        if value is None or isinstance(value, JalaliDate):
+            return value
+        value = self.to_int(value)
+        year, month, day = value // 10000, value // 100 % 100, value % 100
+        try:
+            jalali_to_ordinal(year, month, day)
+        except ValueError:
+            raise exceptions.ValidationError(self.error_messages["invalid"], code="invalid", params={"value": value})
+        return JalaliDate(year, month, day)
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return "" if value is None else value.strftime("%Y/%m/%d")
+
+    def formfield(self, **kwargs):
+        return models.Field.formfield(self, **{"form_class": JalaliDateField, **kwargs})
+
+
+class JalaliIntTimeField(models.IntegerField):
+    """
+    A time stored as an integer of the HHMMSS format (e.g. 101010) and represented as a datetime.time in python.
+    """
+    description = _("Time (stored as an integer HHMMSS)")
+    default_error_messages = {
+        "invalid": _("“%(value)s” value has an invalid time format. It must be in HH:MM:SS format."),
+    }
+
+    @cached_property
+    def validators(self):
+        return [*self.default_validators, *self._validators]
+
+    def to_int(self, value):
+        if value is None or isinstance(value, int):
+            return value
+        if isinstance(value, time):
+            return value.hour * 10000 + value.minute * 100 + value.second
+        try:
+            value = str(value).replace(":", "")
+            if len(value) != 6:
+                raise ValueError(value)
+            return int(value)
+        except ValueError:
+            raise exceptions.ValidationError(self.error_messages["invalid"], code="invalid", params={"value": value})
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        return self.to_int(value)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return time(value // 10000, value // 100 % 100, value % 100)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, time):
+            return value
+        value = self.to_int(value)
+        try:
+            return time(value // 10000, value // 100 % 100, value % 100)
+        except ValueError:
+            raise exceptions.ValidationError(self.error_messages["invalid"], code="invalid", params={"value": value})
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return "" if value is None else value.strftime("%H:%M:%S")
+
+    def formfield(self, **kwargs):
+        return models.Field.formfield(self, **{"form_class": forms.TimeField, **kwargs})
+
+
+class JalaliIntYear(models.Transform):
+    """
+    The jalali year of a JalaliIntDateField: 14020109 => 1402. comparing it against a literal year is compiled to a
+    range on the column itself, so an index on the column can be used.
+    """
+    lookup_name = "year"
+    output_field = models.IntegerField()
+    # the packed dates of one value of the transform: 1402 => 14020000 to 14029999
+    scale = 10000
+
+    def as_sql(self, compiler, connection):
+        lhs, params = compiler.compile(self.lhs)
+        return _integer_division(lhs, self.scale, connection), params
+
+
+class JalaliIntYearMonth(JalaliIntYear):
+    """
+    The jalali year and month of a JalaliIntDateField as YYYYMM: 14020109 => 140201. like __year, comparing it against
+    a literal value is compiled to a range on the column: __year_month=140207 => BETWEEN 14020700 AND 14020799.
+    """
+    lookup_name = "year_month"
+    scale = 100
+
+
+class JalaliIntMonth(models.Transform):
+    """
+    The jalali month of a JalaliIntDateField: 14020109 => 1. the months of every year can not be one range of the
+    column, so it is computed for each row, filter by __year_month to use an index on the column.
+    """
+    lookup_name = "month"
+    output_field = models.IntegerField()
+
+    def as_sql(self, compiler, connection):
+        lhs, params = compiler.compile(self.lhs)
+        year_and_month = _integer_division(lhs, 100, connection)
+        return "(%s - %s * 100)" % (year_and_month, _integer_division(lhs, 10000, connection)), params * 2
+
+
+class JalaliIntYearLookup(models.Lookup):
+    """
+    Compile the comparison of a JalaliIntYear or JalaliIntYearMonth against a literal value to a comparison on the
+    integer column.
+    """
+
+    def get_bound(self, value):
+        """
+        the (operator, params) of the comparison on the column, e.g: year 1402 > => (">= %s", (14030000,))
+        """
+        start, end = value * self.lhs.scale, (value + 1) * self.lhs.scale
+        return {
+            "exact": ("BETWEEN %s AND %s", (start, end - 1)),
+            "gt": (">= %s", (end,)),
+            "gte": (">= %s", (start,)),
+            "lt": ("< %s", (start,)),
+            "lte": ("< %s", (end,)),
+        }[self.lookup_name]
+
+    def as_sql(self, compiler, connection):
+        if self.rhs_is_direct_value():
+            lhs, params = self.process_lhs(compiler, connection, self.lhs.lhs)
+            operator, bound = self.get_bound(int(self.rhs))
+            return "%s %s" % (lhs, operator), [*params, *bound]
+        return super().as_sql(compiler, connection)
+
+
+@JalaliIntYear.register_lookup
+class JalaliIntYearExact(JalaliIntYearLookup, Exact):
+    pass
+
+
+@JalaliIntYear.register_lookup
+class JalaliIntYearGt(JalaliIntYearLookup, GreaterThan):
+    pass
+
+
+@JalaliIntYear.register_lookup
+class JalaliIntYearGte(JalaliIntYearLookup, GreaterThanOrEqual):
+    pass
+
+
+@JalaliIntYear.register_lookup
+class JalaliIntYearLt(JalaliIntYearLookup, LessThan):
+    pass
+
+
+@JalaliIntYear.register_lookup
+class JalaliIntYearLte(JalaliIntYearLookup, LessThanOrEqual):
+    pass
+
+
+JalaliIntDateField.register_lookup(JalaliIntYear)
+JalaliIntDateField.register_lookup(JalaliIntYearMonth)
+JalaliIntDateField.register_lookup(JalaliIntMonth)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed format parsers of jalali dates and datetimes.
+
+The formats used by the form fields ("%Y/%m/%d" and "%Y/%m/%d %H:%M:%S" with zero padded parts) are parsed by
+slicing the string and converted straight to gregorian with django_jalalify.conversion. Any other shape of the value
+(e.g. "1402/1/9") falls back to khayyam strptime. Persian and Arabic-Indic digits are accepted as well.
+"""
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+from django_jalalify.conversion import jalali_to_ordinal
+
+DATE_FORMAT = "%Y/%m/%d"
+DATETIME_FORMAT = "%Y/%m/%d %H:%M:%S"
+
+PERSIAN_DIGITS = "۰۱۲۳۴۵۶۷۸۹"
+ARABIC_INDIC_DIGITS = "٠١٢٣٤٥٦٧٨٩"
+_DIGITS_TRANSLATION = str.maketrans(PERSIAN_DIGITS + ARABIC_INDIC_DIGITS, "0123456789" * 2)
+
+
+def normalize_digits(value: str) -> str:
+    """
+    replace Persian and Arabic-Indic digits with ASCII digits: "۱۴۰۲/۰۱/۰۹" => "1402/01/09"
+    """
+    if value.isascii():
+        return value
+    return value.translate(_DIGITS_TRANSLATION)
+
+
+def _is_ascii_digits(value: str) -> bool:
+    return value.isascii() and value.isdigit()
+
+
+def _parse_date_part(value) -> int:
+    """
+    return the gregorian ordinal of a "YYYY/mm/dd" prefix of value, or raise ValueError.
+    """
+    year, month, day = value[0:4], value[5:7], value[8:10]
+    if value[4] != "/" or value[7] != "/" or not (
+        _is_ascii_digits(year) and _is_ascii_digits(month) and _is_ascii_digits(day)
+    ):
+        raise ValueError("time data %r does not match format %r" % (value, DATE_FORMAT))
+    return jalali_to_ordinal(int(year), int(month), int(day))
+
+
+def parse_date_ordinal(value: str) -> Optional[int]:
+    """
+    the gregorian ordinal of a "YYYY/mm/dd" jalali date in ascii digits: "1402/01/09" => 738608
+    :return: None when value is not 10 characters long.
+    :raise ValueError: when value is not a valid jalali date.
+    """
+    if len(value) != 10:
+        return None
+    return _parse_date_part(value)
+
+
+def parse_datetime_parts(value: str) -> Optional[Tuple[int, int, int, int]]:
+    """
+    the gregorian ordinal and the time of a "YYYY/mm/dd HH:MM:SS" jalali datetime in ascii digits:
+    "1402/01/09 10:20:30" => (738608, 10, 20, 30)
+    :return: None when value has another shape.
+    :raise ValueError: when the date part of value is not a valid jalali date.
+    """
+    if len(value) != 19 or value[10] != " " or value[13] != ":" or value[16] != ":":
+        return None
+    hour, minute, second = value[11:13], value[14:16], value[17:19]
+    if not (_is_ascii_digits(hour) and _is_ascii_digits(minute) and _is_ascii_digits(second)):
+        return None
+    return _parse_date_part(value), int(hour), int(minute), int(second)
+
+
+# the pure python versions of the parsers which are compiled by the optional django_jalalify._speedups extension
+# (see setup.py), the compiled ones replace them when it is built.
+PYTHON_IMPLEMENTATION = {"parse_date_ordinal": parse_date_ordinal, "parse_datetime_parts": parse_datetime_parts}
+
+try:
+    from django_jalalify._speedups import parse_date_ordinal, parse_datetime_parts  # noqa: F811
+except ImportError:
+    pass
+
+
+def parse_jalali_date(value) -> date:
+    """
+    parse a "YYYY/mm/dd" jalali date to a gregorian date: "1402/01/09" => date(2023, 3, 29)
+    :raise ValueError, TypeError: when value is not a valid jalali date.
+    """
+    if isinstance(value, str):
+        ordinal = parse_date_ordinal(normalize_digits(value))
+        if ordinal is not None:
+            return date.fromordinal(ordinal)
+    from django_jalalify import JalaliDate
+
+    return JalaliDate.strptime(value, DATE_FORMAT).todate()
+
+
+def parse_jalali_datetime(value) -> datetime:
+    """
+    parse a "YYYY/mm/dd HH:MM:SS" jalali datetime to a naive gregorian datetime:
+    "1402/01/09 10:20:30" => datetime(2023, 3, 29, 10, 20, 30)
+    :raise ValueError, TypeError: when value is not a valid jalali datetime.
+    """
+    if isinstance(value, str):
+        value = normalize_digits(value)
+        parts = parse_datetime_parts(value)
+        if parts is not None:
+            ordinal, hour, minute, second = parts
+            return datetime.fromordinal(ordinal).replace(hour=hour, minute=minute, second=second)
+    from django_jalalify import JalaliDatetime
+
+    return JalaliDatetime.strptime(value, DATETIME_FORMAT).todatetime()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+UTC bounds of jalali months, quarters and years in Tehran.
+
+A period is the half-open range [start, end) of aware UTC datetimes between the Tehran local midnights of its first day
+and of the first day after it, so the DST changes of the zone are taken into account. The starts of the months are
+computed once and kept in month_start_cache, and filter_jalali_period() applies the bounds to a queryset as an
+index friendly ``field >= start AND field < end`` range.
+
+The shortcut periods of the admin date range filters (today, this week, the last 7 days, ...) are relative to the
+current Tehran date, so their days are cached per (shortcut, today) and computed once a day.
+"""
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+from django_jalalify.cache import LRUCache, get_tehran_day_start
+from django_jalalify.clock import tehran_clock
+from django_jalalify.conversion import jalali_to_ordinal, ordinal_to_jalali
+
+DEFAULT_MONTH_START_CACHE_SIZE = 1024
+DEFAULT_SHORTCUT_CACHE_SIZE = 256
+# the shortcuts of get_shortcut_days(), besides "last_<n>_days"
+SHORTCUTS = ["today", "yesterday", "this_week", "this_month", "this_quarter", "this_year"]
+
+month_start_cache = LRUCache(maxsize=DEFAULT_MONTH_START_CACHE_SIZE)
+shortcut_cache = LRUCache(maxsize=DEFAULT_SHORTCUT_CACHE_SIZE)
+
+
+def _build_month_start(key) -> datetime:
+    year, month = key
+    return get_tehran_day_start(jalali_to_ordinal(year, month, 1))
+
+
+def get_month_start(year, month) -> datetime:
+    """
+    the aware UTC datetime at which a jalali month starts in Tehran, cached per month.
+    e.g: (1402, 1) => datetime(2023, 3, 20, 20, 30, tzinfo=timezone.utc)
+    month 13 is the first month of the next year.
+    """
+    if month == 13:
+        year, month = year + 1, 1
+    return month_start_cache.get_or_set((year, month), _build_month_start)
+
+
+def jalali_period_bounds(year, month=None, quarter=None) -> Tuple[datetime, datetime]:
+    """
+    the aware UTC (start, end) bounds of a jalali year, or of one of its months or quarters, in Tehran.
+    e.g: (1402, month=7) => (datetime(2023, 9, 22, 20, 30, tzinfo=utc), datetime(2023, 10, 22, 20, 30, tzinfo=utc))
+    :raise ValueError: when both month and quarter are given or when either of them is out of range.
+    """
+    if month is not None and quarter is not None:
+        raise ValueError("Only one of month and quarter can be given")
+    if month is not None:
+        if not 1 <= month <= 12:
+            raise ValueError("Month must be between 1 and 12, but it is: %s" % month)
+        first_month, last_month = month, month
+    elif quarter is not None:
+        if not 1 <= quarter <= 4:
+            raise ValueError("Quarter must be between 1 and 4, but it is: %s" % quarter)
+        first_month, last_month = quarter * 3 - 2, quarter * 3
+    else:
+        first_month, last_month = 1, 12
+    return get_month_start(year, first_month), get_month_start(year, last_month + 1)
+
+
+def iter_jalali_months(
+    start: Tuple[int, int], end: Tuple[int, int]
+) -> Iterator[Tuple[int, int, datetime, datetime]]:
+    """
+    yield (year, month, UTC start, UTC end) of every jalali month from start to end, both included:
+    ((1402, 11), (1403, 1)) => (1402, 11, ...), (1402, 12, ...), (1403, 1, ...)
+    """
+    year, month = start
+    period_start = get_month_start(year, month)
+    while (year, month) <= tuple(end):
+        period_end = get_month_start(year, month + 1)
+        yield year, month, period_start, period_end
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        period_start = period_end
+
+
+def filter_jalali_period(queryset, field_name: str, year: int, month: Optional[int] = None,
+                         quarter: Optional[int] = None):
+    """
+    filter a queryset by a datetime field within a jalali period in Tehran, as a half-open range:
+        filter_jalali_period(Transaction.objects.all(), "created_at", 1402, quarter=3)
+    """
+    start, end = jalali_period_bounds(year, month, quarter)
+    return queryset.filter(**{"%s__gte" % field_name: start, "%s__lt" % field_name: end})
+
+
+def _build_shortcut_days(key) -> Tuple[int, int]:
+    shortcut, today = key
+    year, month, _ = ordinal_to_jalali(today)
+    if shortcut == "today":
+        return today, today + 1
+    if shortcut == "yesterday":
+        return today - 1, today
+    if shortcut == "this_week":
+        # the ordinal 1 (0001-01-01) is a monday, two days after a shanbeh
+        first = today - (today + 1) % 7
+        return first, first + 7
+    if shortcut == "this_month":
+        return jalali_to_ordinal(year, month, 1), _month_start_ordinal(year, month + 1)
+    if shortcut == "this_quarter":
+        first_month = (month - 1) // 3 * 3 + 1
+        return jalali_to_ordinal(year, first_month, 1), _month_start_ordinal(year, first_month + 3)
+    if shortcut == "this_year":
+        return jalali_to_ordinal(year, 1, 1), jalali_to_ordinal(year + 1, 1, 1)
+    prefix, _, days = shortcut.partition("_")
+    days, _, suffix = days.partition("_")
+    if prefix == "last" and suffix == "days" and days.isdigit() and int(days) > 0:
+        # today included
+        return today - int(days) + 1, today + 1
+    raise ValueError("Unknown date range shortcut: %s" % shortcut)
+
+
+def _month_start_ordinal(year, month) -> int:
+    if month == 13:
+        year, month = year + 1, 1
+    return jalali_to_ordinal(year, month, 1)
+
+
+def get_shortcut_days(shortcut: str, today: int) -> Tuple[int, int]:
+    """
+    the gregorian ordinals of the first day of a shortcut period and of the day after it, relative to the today
+    ordinal, cached per (shortcut, today). weeks start on shanbeh.
+    e.g: ("this_month", date(2023, 3, 29).toordinal()) => the ordinals of 1402/01/01 and 1402/02/01
+    :param shortcut: one of SHORTCUTS or "last_<n>_days", the last n days with today.
+    :raise ValueError: when the shortcut is unknown.
+    """
+    return shortcut_cache.get_or_set((shortcut, today), _build_shortcut_days)
+
+
+def get_shortcut_bounds(shortcut: str, today: Optional[int] = None) -> Tuple[datetime, datetime]:
+    """
+    the aware UTC (start, end) bounds of a shortcut period in Tehran, relative to the Tehran date of now by default.
+    e.g: "today" on 1402/01/09 => (datetime(2023, 3, 28, 20, 30, tzinfo=utc), datetime(2023, 3, 29, 20, 30, tzinfo=utc))
+    :raise ValueError: when the shortcut is unknown.
+    """
+    if today is None:
+        today = tehran_clock.now().datetime.toordinal()
+    first, end = get_shortcut_days(shortcut, today)
+    return get_tehran_day_start(first), get_tehran_day_start(end)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Django REST Framework fields which render datetimes and dates as jalali strings and parse them back.
+
+Every serializer instance gets its own copy of its fields, so the jalali dates a field computes are cached on the field
+for the lifetime of the serializer: a ``many=True`` list converts each local date once, however many of its rows fall
+on it.
+"""
+from datetime import date, datetime
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from pytz.exceptions import InvalidTimeError
+from rest_framework import serializers
+
+from django_jalalify.conversion import ordinal_to_jalali
+from django_jalalify.formatting import get_formatter
+from django_jalalify.parsing import parse_jalali_date, parse_jalali_datetime
+from django_jalalify.timezone import TEHRAN_ZONE
+
+DEFAULT_DATETIME_FORMAT = "%Y/%m/%d %H:%M:%S"
+DEFAULT_DATE_FORMAT = "%Y/%m/%d"
+# the number of dates a field keeps, it is emptied once it grows past it
+DEFAULT_SERIALIZER_CACHE_SIZE = 1024
+
+
+class JalaliDateTimeSerializerField(serializers.Field):
+    """
+    renders a datetime in default_timezone (Tehran by default) as a jalali string: "1402/01/09 10:20:30", and parses
+    a "YYYY/mm/dd HH:MM:SS" jalali string to a datetime in that timezone, aware when USE_TZ is enabled.
+    """
+    default_error_messages = {
+        "invalid": _("Enter a valid datetime of the format YYYY/mm/dd HH:MM:SS."),
+        "make_aware": _('Invalid datetime for the timezone "{timezone}".'),
+    }
+
+    def __init__(self, format=DEFAULT_DATETIME_FORMAT, default_timezone=TEHRAN_ZONE, **kwargs):
+        self.format = format
+        self.default_timezone = default_timezone
+        self._formatter = get_formatter(format)
+        # {gregorian ordinal of the local date: jalali (year, month, day)}
+        self._dates = {}
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if value is None:
+            return None
+        if not isinstance(value, datetime):
+            # a khayyam.JalaliDatetime
+            value = value.todatetime()
+        if value.tzinfo is not None:
+            value = value.astimezone(self.default_timezone)
+        ordinal = value.toordinal()
+        parts = self._dates.get(ordinal)
+        if parts is None:
+            if len(self._dates) >= DEFAULT_SERIALIZER_CACHE_SIZE:
+                self._dates.clear()
+            parts = self._dates[ordinal] = ordinal_to_jalali(ordinal)
+        return self._formatter.format(*parts, value.hour, value.minute, value.second, value.microsecond, value.tzinfo)
+
+    def to_internal_value(self, data):
+        if isinstance(data, datetime):
+            value = data
+        else:
+            try:
+                value = parse_jalali_datetime(data)
+            except (ValueError, TypeError):
+                self.fail("invalid")
+        if settings.USE_TZ and value.tzinfo is None:
+            try:
+                return timezone.make_aware(value, self.default_timezone)
+            except InvalidTimeError:
+                self.fail("make_aware", timezone=self.default_timezone)
+        return value
+
+
+class JalaliDateSerializerField(serializers.Field):
+    """
+    renders a date or a khayyam.JalaliDate as a jalali string: "1402/01/09", and parses a "YYYY/mm/dd" jalali string
+    to a date.
+    """
+    default_error_messages = {
+        "invalid": _("Enter a valid date of the format YYYY/mm/dd."),
+    }
+
+    def __init__(self, format=DEFAULT_DATE_FORMAT, **kwargs):
+        self.format = format
+        self._formatter = get_formatter(format, date_only=True)
+        # {gregorian ordinal: rendered jalali date}
+        self._dates = {}
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if value is None:
+            return None
+        if not isinstance(value, date):
+            # a khayyam.JalaliDate, as JalaliIntDateField loads them
+            value = value.todate()
+        ordinal = value.toordinal()
+        rendered = self._dates.get(ordinal)
+        if rendered is None:
+            if len(self._dates) >= DEFAULT_SERIALIZER_CACHE_SIZE:
+                self._dates.clear()
+            rendered = self._dates[ordinal] = self._formatter.format(*ordinal_to_jalali(ordinal))
+        return rendered
+
+    def to_internal_value(self, data):
+        if isinstance(data, date) and not isinstance(data, datetime):
+            return data
+        try:
+            return parse_jalali_date(data)
+        except (ValueError, TypeError):
+            self.fail("invalid")
@@ -0,0 +1,8 @@
+from django.dispatch import Signal
+
+# sent after every instrumented call while the instrumentation is enabled, with the name and the duration (in seconds)
+# of the call. see django_jalalify.instrumentation
+call_measured = Signal()
+
+# sent by django_jalalify.instrumentation.report() with the snapshot of the counters of the process
+stats_reported = Signal()
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+A compact jalali date and time in Tehran.
+
+A JalaliStamp keeps the Tehran wall clock date and time of an instant as two integers: the jalali date as YYYYMMDD
+(the format of JalaliIntDateField and functions.convert_date_to_int) and the time as HHMMSS followed by six digits of
+microseconds, plus FOLD for the second occurrence of a wall clock time repeated at the end of a DST period (the fold of
+datetime). Tehran repeated the last hour of the day, so the stamps of the repeated hour still sort after the first
+ones. It has no __dict__ and no tzinfo, and the stamps of the same day share their date integer, so a
+stamp takes about half the memory of a khayyam.JalaliDatetime and less than a jalali_datetime_to_int string tuple.
+Stamps are ordered, hashed and compared as a pair of integers, and datetime and JalaliDatetime objects are only built
+when todatetime() or tojalali() is called.
+"""
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from django_jalalify.conversion import jalali_to_ordinal, ordinal_to_jalali
+from django_jalalify.formatting import get_formatter
+from django_jalalify.timezone import TEHRAN_ZONE, make_aware
+
+MICROSECONDS_PER_DAY = 86400 * 10 ** 6
+# added to the time of a stamp with fold=1
+FOLD = 10 ** 12
+# the number of distinct date integers shared between stamps, the dates of later days are not shared
+DATE_INTERN_SIZE = 1 << 16
+
+_dates = {}
+
+
+def _intern_date(date: int) -> int:
+    shared = _dates.get(date)
+    if shared is not None:
+        return shared
+    if len(_dates) < DATE_INTERN_SIZE:
+        _dates[date] = date
+    return date
+
+
+class JalaliStamp:
+    """
+    JalaliStamp(14020109, 102030000000) is 1402/01/09 10:20:30 in Tehran, and JalaliStamp(14000630, FOLD + 233000000000)
+    the second 1400/06/30 23:30:00. the integers are not validated, the from_* constructors build stamps of valid dates.
+    """
+    __slots__ = ("date", "time")
+
+    def __init__(self, date: int, time: int = 0):
+        object.__setattr__(self, "date", date)
+        object.__setattr__(self, "time", time)
+
+    @classmethod
+    def from_ints(cls, date: int, time: int = 0, microsecond: int = 0) -> "JalaliStamp":
+        """
+        build a stamp from a YYYYMMDD jalali date and a HHMMSS time: (14020109, 102030) => 1402/01/09 10:20:30
+        :raise ValueError: when the date does not exist.
+        """
+        jalali_to_ordinal(date // 10000, date // 100 % 100, date % 100)
+        return cls(date, time * 10 ** 6 + microsecond)
+
+    @classmethod
+    def from_datetime(cls, value: datetime) -> "JalaliStamp":
+        """
+        the stamp of a datetime in Tehran, naive datetimes are taken in the current django timezone (TIME_ZONE by
+        default). the fold of the Tehran time is kept.
+        """
+        value = make_aware(value).astimezone(TEHRAN_ZONE)
+        year, month, day = ordinal_to_jalali(value.toordinal())
+        return cls(_intern_date(year * 10000 + month * 100 + day),
+                   (value.hour * 10000 + value.minute * 100 + value.second) * 10 ** 6 + value.microsecond
+                   + value.fold * FOLD)
+
+    @classmethod
+    def from_jalali(cls, value) -> "JalaliStamp":
+        """
+        the stamp of a khayyam.JalaliDatetime (in Tehran when it is aware) or khayyam.JalaliDate.
+        """
+        if not hasattr(value, "hour"):
+            return cls(value.year * 10000 + value.month * 100 + value.day)
+        return cls.from_datetime(value.todatetime())
+
+    @classmethod
+    def _from_ordinal(cls, ordinal, microseconds) -> "JalaliStamp":
+        year, month, day = ordinal_to_jalali(ordinal)
+        seconds, microsecond = divmod(microseconds, 10 ** 6)
+        minutes, second = divmod(seconds, 60)
+        hour, minute = divmod(minutes, 60)
+        return cls(_intern_date(year * 10000 + month * 100 + day),
+                   (hour * 10000 + minute * 100 + second) * 10 ** 6 + microsecond)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("JalaliStamp is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("JalaliStamp is immutable")
+
+    def __reduce__(self):
+        return self.__class__, (self.date, self.time)
+
+    @property
+    def year(self) -> int:
+        return self.date // 10000
+
+    @property
+    def month(self) -> int:
+        return self.date // 100 % 100
+
+    @property
+    def day(self) -> int:
+        return self.date % 100
+
+    @property
+    def hour(self) -> int:
+        return self.time // 10 ** 10 % 100
+
+    @property
+    def minute(self) -> int:
+        return self.time // 10 ** 8 % 100
+
+    @property
+    def second(self) -> int:
+        return self.time // 10 ** 6 % 100
+
+    @property
+    def microsecond(self) -> int:
+        return self.time % 10 ** 6
+
+    @property
+    def fold(self) -> int:
+        return self.time // FOLD
+
+    @property
+    def time_int(self) -> int:
+        """
+        the time as HHMMSS, the format of JalaliIntTimeField and functions.convert_time_to_int.
+        """
+        return self.time // 10 ** 6 % 10 ** 6
+
+    def to_ints(self) -> Tuple[int, int]:
+        """
+        (YYYYMMDD, HHMMSS): 1402/01/09 10:20:30 => (14020109, 102030)
+        """
+        return self.date, self.time // 10 ** 6 % 10 ** 6
+
+    def toordinal(self) -> int:
+        """
+        the gregorian proleptic ordinal of the date, the same as todatetime().toordinal().
+        """
+        date = self.date
+        return jalali_to_ordinal(date // 10000, date // 100 % 100, date % 100)
+
+    def _day_microseconds(self) -> int:
+        time = self.time
+        seconds = (time // 10 ** 10 % 100 * 60 + time // 10 ** 8 % 100) * 60 + time // 10 ** 6 % 100
+        return seconds * 10 ** 6 + time % 10 ** 6
+
+    def todatetime(self, tzinfo=TEHRAN_ZONE) -> datetime:
+        """
+        the gregorian datetime of the stamp in Tehran, naive when tzinfo is None, with the fold of the stamp.
+        """
+        time = self.time
+        return datetime.fromordinal(self.toordinal()).replace(
+            hour=time // 10 ** 10 % 100, minute=time // 10 ** 8 % 100, second=time // 10 ** 6 % 100,
+            microsecond=time % 10 ** 6, tzinfo=tzinfo, fold=time // FOLD,
+        )
+
+    def tojalali(self):
+        """
+        the khayyam.JalaliDatetime of the stamp in Tehran, which has no fold.
+        """
+        from django_jalalify import JalaliDatetime
+
+        return JalaliDatetime(self.year, self.month, self.day, self.hour, self.minute, self.second, self.microsecond,
+                              tzinfo=TEHRAN_ZONE)
+
+    def strftime(self, format_string) -> str:
+        return get_formatter(format_string).format(self.year, self.month, self.day, self.hour, self.minute,
+                                                   self.second, self.microsecond, TEHRAN_ZONE)
+
+    def __add__(self, other):
+        """
+        wall clock arithmetic, the same as with naive datetimes: stamp + timedelta(days=1) is the same time tomorrow.
+        the result has fold=0.
+        """
+        if not isinstance(other, timedelta):
+            return NotImplemented
+        days, microseconds = divmod(
+            self._day_microseconds() + (other.days * 86400 + other.seconds) * 10 ** 6 + other.microseconds,
+            MICROSECONDS_PER_DAY,
+        )
+        return self._from_ordinal(self.toordinal() + days, microseconds)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, timedelta):
+            return self + -other
+        if isinstance(other, JalaliStamp):
+            return timedelta(days=self.toordinal() - other.toordinal(),
+                             microseconds=self._day_microseconds() - other._day_microseconds())
+        return NotImplemented
+
+    def __eq__(self, other):
+        if isinstance(other, JalaliStamp):
+            return self.date == other.date and self.time == other.time
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, JalaliStamp):
+            return self.date != other.date or self.time != other.time
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, JalaliStamp):
+            return self.date < other.date or (self.date == other.date and self.time < other.time)
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, JalaliStamp):
+            return self.date < other.date or (self.date == other.date and self.time <= other.time)
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, JalaliStamp):
+            return self.date > other.date or (self.date == other.date and self.time > other.time)
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, JalaliStamp):
+            return self.date > other.date or (self.date == other.date and self.time >= other.time)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.date, self.time))
+
+    def __repr__(self):
+        return "JalaliStamp(%d, %d)" % (self.date, self.time)
+
+    def __str__(self):
+        return self.strftime("%Y/%m/%d %H:%M:%S.%f" if self.time % 10 ** 6 else "%Y/%m/%d %H:%M:%S")
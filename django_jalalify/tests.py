@@ -1,9 +1,102 @@
-from django.test import TestCase
+from datetime import date, datetime, time, timedelta
+from unittest import mock, skipUnless
+
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from types import SimpleNamespace
+
+import pytz
+from django.contrib import admin
+from django.core.management import CommandError, call_command
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import DatabaseError, connection, models, transaction as db_transaction
+from django.test import RequestFactory, TestCase, override_settings
 from django.utils import timezone
 from freezegun import freeze_time
+from rest_framework import serializers
+
+from django_jalalify import JalaliDate, JalaliDatetime
+from django_jalalify import asynchronous, conversion, instrumentation, parsing, utils
+from django_jalalify.admin.filters import DateRangeFilter, DateTimeRangeFilter, jDateRangeFilter
+from django_jalalify.formatting import JalaliFormatter, formatter_cache, get_formatter, jalali_strftime
+from django_jalalify.fields import JalaliDateField, JalaliDateTimeField
+from django_jalalify.filters import JalaliDateFromToRangeFilter
+from django_jalalify.parsing import parse_jalali_date, parse_jalali_datetime
+from django_jalalify.signals import call_measured, stats_reported
+from django_jalalify.stamp import FOLD, JalaliStamp
+from django_jalalify.serializer_fields import JalaliDateSerializerField, JalaliDateTimeSerializerField
+from django_jalalify.periods import (
+    filter_jalali_period, get_shortcut_bounds, get_shortcut_days, iter_jalali_months, jalali_period_bounds,
+    month_start_cache, shortcut_cache,
+)
+from django_jalalify.db_functions import (
+    JalaliDateInt, JalaliDay, JalaliMonth, JalaliTruncMonth, JalaliTruncWeek, JalaliTruncYear, JalaliYear
+)
+from django_jalalify.mixins import FieldDateTimeInJalaliGeneratorMixin
+from django_jalalify.model_fields import JalaliIntDateField, JalaliIntTimeField
+from django_jalalify.backfill import backfill, read_checkpoint
+from django_jalalify.bulk import jalalify_iter
+from django_jalalify.clock import TehranClock, tehran_clock
+from django_jalalify.cache import LRUCache, get_tehran_jalali_date_int, tehran_day_cache
+from django_jalalify.timezone import (
+    TEHRAN_ZONE, TEHRAN_LMT_ZONE, TehranTimezone, get_tehran_utc_offset, get_tehran_utc_transitions, get_zone, _zoneinfo
+)
+try:
+    from django_jalalify import _speedups
+except ImportError:
+    _speedups = None
+try:
+    import numpy as np
+    from django_jalalify import vectorized
+except ImportError:
+    np = None
+from django_jalalify.utils import (
+    convert_datetime_to_custom_jalali_date, get_jalali_tehran_datetime_from_date_string,
+    get_now_tehran_jalali_date_intftime, get_now_tehran_jalali_date_strftime, get_now_tehran_jalali_time_intftime,
+    get_now_tehran_jalali_time_strftime, int_jalali_date_to_jalali_datetime, str_of_int_to_jalali_datetime,
+)
+
+
+class Transaction(models.Model):
+    created_at = models.DateTimeField(null=True)
+    jalali_date = JalaliIntDateField(null=True, db_index=True)
+    jalali_time = JalaliIntTimeField(null=True)
+    amount = models.IntegerField(default=0)
+
+    class Meta:
+        app_label = "django_jalalify"
 
-from django_jalalify import JalaliDatetime
-from django_jalalify.timezone import TEHRAN_ZONE, TehranTimezone
+
+class TransactionSerializer(serializers.Serializer):
+    created_at = JalaliDateTimeSerializerField(allow_null=True)
+    jalali_date = JalaliDateSerializerField(required=False)
+
+
+class ModelTestCase(TestCase):
+    """
+    The app has no migrations for the test models, so their tables are created here.
+    """
+    models = [Transaction]
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            for model in cls.models:
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in cls.models:
+                editor.delete_model(model)
 
 
 class TehranTimezoneTestCase(TestCase):
@@ -28,3 +121,1206 @@ class TehranTimezoneTestCase(TestCase):
         now_casting_with_custom_tehran_timezone = now.astimezone(TehranTimezone()).strftime(
             "%Y/%m/%d %H:%M:%S.%f")
         self.assertEqual(now_casting_checkout_app, now_casting_with_custom_tehran_timezone)
+
+
+class TehranZoneInfoTestCase(TestCase):
+
+    def test_zone_is_zoneinfo(self):
+        self.assertIsInstance(TEHRAN_ZONE, _zoneinfo().ZoneInfo)
+        self.assertEqual(TEHRAN_ZONE.key, "Asia/Tehran")
+        self.assertIs(get_zone("Asia/Tehran"), TEHRAN_ZONE)
+        self.assertEqual(str(get_zone("Europe/London")), "Europe/London")
+        self.assertIs(pickle.loads(pickle.dumps(TEHRAN_ZONE)), TEHRAN_ZONE)
+
+    def test_transitions_are_the_same_as_zoneinfo(self):
+        instants, offsets = get_tehran_utc_transitions()
+        self.assertEqual(list(instants), sorted(instants))
+        for transition in instants[1:]:
+            for seconds in (-3601, -1, 0, 1, 3600):
+                moment = datetime.fromtimestamp(transition + seconds, pytz.utc)
+                self.assertEqual(get_tehran_utc_offset(transition + seconds),
+                                 moment.astimezone(TEHRAN_ZONE).utcoffset().total_seconds(), moment)
+        for hours in range(0, 120 * 365 * 24, 997):
+            moment = datetime(1910, 1, 1, tzinfo=pytz.utc) + timedelta(hours=hours)
+            self.assertEqual(get_tehran_utc_offset(moment.timestamp()),
+                             moment.astimezone(TEHRAN_ZONE).utcoffset().total_seconds(), moment)
+
+    def test_historical_dst(self):
+        self.assertEqual(datetime(2022, 6, 1, 12, tzinfo=TEHRAN_ZONE).utcoffset(), timedelta(hours=4, minutes=30))
+        self.assertEqual(datetime(2023, 6, 1, 12, tzinfo=TEHRAN_ZONE).utcoffset(), timedelta(hours=3, minutes=30))
+        self.assertEqual(datetime(2022, 9, 21, 23, 30, tzinfo=TEHRAN_ZONE).tzname(), "+0430")
+        self.assertEqual(datetime(2022, 9, 21, 23, 30, fold=1, tzinfo=TEHRAN_ZONE).tzname(), "+0330")
+        self.assertEqual(JalaliDatetime(1401, 3, 11, 12, tzinfo=TEHRAN_ZONE).utcoffset(), timedelta(hours=4, minutes=30))
+
+    def test_compatibility_zones(self):
+        # TehranTimezone keeps its fixed offset and TEHRAN_LMT_ZONE is still the pytz zone
+        self.assertEqual(datetime(2022, 6, 1, 12, tzinfo=TehranTimezone()).utcoffset(), timedelta(hours=3, minutes=30))
+        self.assertEqual(TEHRAN_LMT_ZONE.localize(datetime(2022, 6, 1, 12)).utcoffset(), timedelta(hours=4, minutes=30))
+        self.assertEqual(TEHRAN_LMT_ZONE.zone, "Asia/Tehran")
+
+
+class JalaliConversionTestCase(TestCase):
+
+    def tearDown(self):
+        conversion.set_year_window()
+
+    def assert_equivalent_to_khayyam(self, first_ordinal, last_ordinal):
+        for ordinal in range(first_ordinal, last_ordinal + 1):
+            jalali_date = JalaliDate(date.fromordinal(ordinal))
+            expected = (jalali_date.year, jalali_date.month, jalali_date.day)
+            self.assertEqual(conversion.ordinal_to_jalali(ordinal), expected)
+            self.assertEqual(conversion.jalali_to_ordinal(*expected), ordinal)
+
+    def test_year_starts_and_leap_years_are_equivalent_to_khayyam(self):
+        for year in range(conversion.MINYEAR, conversion.MAXYEAR + 1):
+            self.assertEqual(conversion.year_start_ordinal(year), JalaliDate(year, 1, 1).todate().toordinal())
+            self.assertEqual(conversion.is_leap_year(year), JalaliDate(year, 1, 1).isleap)
+
+    def test_every_day_of_the_year_window_is_equivalent_to_khayyam(self):
+        first_year, last_year = conversion.get_year_window()
+        self.assert_equivalent_to_khayyam(
+            conversion.year_start_ordinal(first_year - 1), conversion.year_start_ordinal(last_year + 2) - 1
+        )
+
+    def test_days_outside_of_the_year_window_are_equivalent_to_khayyam(self):
+        conversion.set_year_window(1400, 1401)
+        self.assert_equivalent_to_khayyam(JalaliDate(1, 1, 1).todate().toordinal(), JalaliDate(3, 1, 1).todate().toordinal())
+        self.assert_equivalent_to_khayyam(
+            JalaliDate(1395, 1, 1).todate().toordinal(), JalaliDate(1405, 1, 1).todate().toordinal()
+        )
+        self.assert_equivalent_to_khayyam(
+            JalaliDate(3177, 1, 1).todate().toordinal(), JalaliDate(3178, 12, 29).todate().toordinal()
+        )
+
+    def test_invalid_dates_raise_value_error(self):
+        for year, month, day in [(1402, 12, 30), (1402, 13, 1), (1402, 0, 1), (0, 1, 1), (3179, 1, 1), (1402, 7, 31)]:
+            with self.assertRaises(ValueError):
+                conversion.jalali_to_ordinal(year, month, day)
+        self.assertEqual(conversion.jalali_to_ordinal(1404, 12, 30), date(2026, 3, 20).toordinal())
+
+    def test_utils_are_equivalent_to_khayyam(self):
+        self.assertEqual(
+            int_jalali_date_to_jalali_datetime(14010105),
+            JalaliDatetime(year=1401, month=1, day=5, tzinfo=TehranTimezone()).todatetime(),
+        )
+        self.assertEqual(
+            str_of_int_to_jalali_datetime("14020202", "101010"),
+            JalaliDatetime(1402, 2, 2, 10, 10, 10, tzinfo=TehranTimezone()).todatetime(),
+        )
+        for value in ["1402/01/09 10:20:30", "1401/06/01 12:00:00"]:
+            parsed = get_jalali_tehran_datetime_from_date_string(value)
+            self.assertEqual(parsed, JalaliDatetime.strptime(value, "%Y/%m/%d %H:%M:%S").replace(
+                tzinfo=TehranTimezone).todatetime())
+            self.assertEqual(parsed.utcoffset(), timedelta(hours=3, minutes=30))
+            self.assertIsNot(parsed.tzinfo, get_jalali_tehran_datetime_from_date_string(value).tzinfo)
+        moments = [datetime(2023, 3, 20, 20, 29, 59, tzinfo=pytz.utc), datetime(2023, 3, 20, 20, 30, tzinfo=pytz.utc),
+                   datetime(2022, 3, 21, 19, 30, tzinfo=pytz.utc), datetime(2022, 9, 21, 19, 29, tzinfo=pytz.utc)]
+        for moment in moments:
+            expected = int(JalaliDatetime(moment.astimezone(TEHRAN_ZONE)).strftime("%Y%m%d"))
+            self.assertEqual(convert_datetime_to_custom_jalali_date(moment), expected)
+
+
+class CalendarCoreTestMixin:
+    """
+    the tests of the calendar core, which is implemented in python and optionally compiled (django_jalalify._speedups).
+    """
+    implementation = None
+
+    def test_ordinals_are_equivalent_to_khayyam(self):
+        first, last = JalaliDate(1, 1, 1).todate().toordinal(), JalaliDate(3178, 12, 29).todate().toordinal()
+        ordinals = list(range(first, first + 400)) + list(range(last - 400, last + 1))
+        ordinals += list(range(JalaliDate(1398, 1, 1).todate().toordinal(), JalaliDate(1406, 1, 1).todate().toordinal()))
+        ordinals += list(range(first, last, 997))
+        for ordinal in ordinals:
+            jalali_date = JalaliDate(date.fromordinal(ordinal))
+            expected = (jalali_date.year, jalali_date.month, jalali_date.day)
+            self.assertEqual(self.implementation.ordinal_to_jalali(ordinal), expected)
+            self.assertEqual(self.implementation.ordinal_to_int_jalali_date(ordinal),
+                             int(jalali_date.strftime("%Y%m%d")))
+            self.assertEqual(self.implementation.jalali_to_ordinal(*expected), ordinal)
+
+    def test_invalid_dates(self):
+        for year, month, day in [(1402, 12, 30), (1402, 13, 1), (1402, 0, 1), (0, 1, 1), (3179, 1, 1), (1402, 7, 31),
+                                 (1402, 1, 0), (1402, 1, 32)]:
+            with self.assertRaises(ValueError):
+                self.implementation.jalali_to_ordinal(year, month, day)
+        with self.assertRaisesMessage(ValueError, "Day must be between 1 and 29, but it is: 30"):
+            self.implementation.jalali_to_ordinal(1402, 12, 30)
+        for ordinal in [JalaliDate(1, 1, 1).todate().toordinal() - 1, JalaliDate(3178, 12, 29).todate().toordinal() + 1]:
+            with self.assertRaises(ValueError):
+                self.implementation.ordinal_to_jalali(ordinal)
+
+    def test_packing(self):
+        self.assertEqual(self.implementation.jalali_date_to_int(1402, 1, 9), 14020109)
+        self.assertEqual(self.implementation.int_to_jalali_date(14020109), (1402, 1, 9))
+        self.assertEqual(self.implementation.time_to_int(10, 20, 30), 102030)
+        self.assertEqual(self.implementation.int_to_time(102030), (10, 20, 30))
+        self.assertEqual(self.implementation.int_to_time(5), (0, 0, 5))
+
+    def test_parsing(self):
+        self.assertEqual(self.implementation.parse_date_ordinal("1402/01/09"), 738608)
+        self.assertEqual(self.implementation.parse_datetime_parts("1404/12/30 23:59:59"), (739695, 23, 59, 59))
+        for value in ["1402/1/9", "", "1402/01/09 10:20:30"]:
+            self.assertIsNone(self.implementation.parse_date_ordinal(value))
+        for value in ["1402/01/09T10:20:30", "1402/01/09 10:2:300", "1402/01/09 ۱۰:20:30", "1402/01/09"]:
+            self.assertIsNone(self.implementation.parse_datetime_parts(value))
+        for value in ["1402/13/01", "1402-01-09", "1402/01/ 9", "1402/01/+9", "۱۴۰۲/۰۱/۰۹"]:
+            with self.assertRaises(ValueError, msg=value):
+                self.implementation.parse_date_ordinal(value)
+            with self.assertRaises(ValueError, msg=value):
+                self.implementation.parse_datetime_parts(value + " 10:20:30")
+
+
+class PythonCalendarCoreTestCase(CalendarCoreTestMixin, TestCase):
+    implementation = SimpleNamespace(**conversion.PYTHON_IMPLEMENTATION, **parsing.PYTHON_IMPLEMENTATION)
+
+
+@skipUnless(_speedups is not None, "django_jalalify._speedups is not built")
+class SpeedupsCalendarCoreTestCase(CalendarCoreTestMixin, TestCase):
+    implementation = _speedups
+
+    def test_speedups_are_used(self):
+        self.assertTrue(conversion.SPEEDUPS)
+        self.assertIs(conversion.jalali_to_ordinal, _speedups.jalali_to_ordinal)
+        self.assertIs(parsing.parse_datetime_parts, _speedups.parse_datetime_parts)
+
+
+@skipUnless(np is not None, "numpy is not installed")
+class VectorizedTestCase(TestCase):
+
+    def test_to_jalali_ints_is_equivalent_to_scalar_helpers(self):
+        moments = [datetime(1978, 8, 4, 20, tzinfo=pytz.utc), datetime(2022, 3, 21, 20, 29, 59, tzinfo=pytz.utc)]
+        moments += [datetime(2022, 3, 21, 20, 30, tzinfo=pytz.utc) + timedelta(hours=7 * i) for i in range(2000)]
+        dates, times = vectorized.to_jalali_ints(np.array([moment.timestamp() for moment in moments]))
+        self.assertEqual(dates.dtype, np.int32)
+        for moment, jalali_date, jalali_time in zip(moments, dates, times):
+            self.assertEqual(jalali_date, convert_datetime_to_custom_jalali_date(moment))
+            self.assertEqual(jalali_time, int(moment.astimezone(TEHRAN_ZONE).strftime("%H%M%S")))
+
+    def test_from_jalali_ints(self):
+        utc_datetimes = np.array(["2023-03-29T06:30:00", "2022-06-01T19:30:00"], dtype="datetime64[s]")
+        dates, times = vectorized.to_jalali_ints(utc_datetimes)
+        self.assertEqual(dates.tolist(), [14020109, 14010312])
+        self.assertEqual(times.tolist(), [100000, 0])
+        self.assertTrue((vectorized.from_jalali_ints(dates, times) == utc_datetimes).all())
+        with self.assertRaises(ValueError):
+            vectorized.from_jalali_ints([14021230])
+        for time_int in [246099, 240000, 106000, 100060, -1]:
+            with self.assertRaisesMessage(ValueError, "Invalid time"):
+                vectorized.from_jalali_ints([14020109, 14020109], [100000, time_int])
+
+
+class LRUCacheTestCase(TestCase):
+
+    def test_least_recently_used_item_is_evicted(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.get("b", "missing"), "missing")
+        self.assertEqual(cache.info(), {"hits": 1, "misses": 1, "maxsize": 2, "currsize": 2})
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertIn("c", cache)
+
+    def test_get_or_set(self):
+        cache = LRUCache()
+        self.assertEqual(cache.get_or_set(2, lambda key: key * 2), 4)
+        self.assertEqual(cache.get_or_set(2, lambda key: key * 3), 4)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class TehranDayCacheTestCase(TestCase):
+
+    def setUp(self):
+        tehran_day_cache.clear()
+
+    def assert_same_as_astimezone(self, moment):
+        expected = conversion.ordinal_to_int_jalali_date(moment.astimezone(TEHRAN_ZONE).toordinal())
+        self.assertEqual(get_tehran_jalali_date_int(moment), expected, moment)
+
+    def test_day_boundaries_around_dst_transitions(self):
+        for transition in get_tehran_utc_transitions()[0][3:]:
+            for seconds in (-3601, -1, 0, 1, 3600):
+                self.assert_same_as_astimezone(datetime.fromtimestamp(transition + seconds, pytz.utc))
+
+    def test_local_midnights_in_and_out_of_dst(self):
+        for local_date in [datetime(2022, 3, 22), datetime(2022, 6, 1), datetime(2022, 9, 22), datetime(1978, 11, 11),
+                           datetime(1925, 1, 1), datetime(2023, 6, 1)]:
+            midnight = local_date.replace(tzinfo=TEHRAN_ZONE).astimezone(pytz.utc)
+            for seconds in (-1, 0, 1):
+                self.assert_same_as_astimezone(midnight + timedelta(seconds=seconds))
+                self.assert_same_as_astimezone((midnight + timedelta(seconds=seconds)).astimezone(TEHRAN_LMT_ZONE))
+
+    def test_rows_of_the_same_day_hit_the_cache(self):
+        moment = datetime(2023, 3, 29, 6, 30, tzinfo=pytz.utc)
+        for minutes in range(10):
+            self.assertEqual(get_tehran_jalali_date_int(moment + timedelta(minutes=minutes)), 14020109)
+        self.assertEqual((tehran_day_cache.hits, tehran_day_cache.misses), (9, 1))
+
+    def test_cache_is_keyed_by_the_local_date(self):
+        # the same UTC day, on both sides of the Tehran midnight
+        self.assertEqual(get_tehran_jalali_date_int(datetime(2023, 3, 29, 20, 29, tzinfo=pytz.utc)), 14020109)
+        self.assertEqual(get_tehran_jalali_date_int(datetime(2023, 3, 29, 20, 30, tzinfo=pytz.utc)), 14020110)
+        # 1400/06/30 23:30 in DST (+04:30), the same local time once more after DST ended, and 1400/06/31 00:15
+        self.assertEqual(get_tehran_jalali_date_int(datetime(2021, 9, 21, 19, 0, tzinfo=pytz.utc)), 14000630)
+        self.assertEqual(get_tehran_jalali_date_int(datetime(2021, 9, 21, 20, 0, tzinfo=pytz.utc)), 14000630)
+        self.assertEqual(get_tehran_jalali_date_int(datetime(2021, 9, 21, 20, 45, tzinfo=pytz.utc)), 14000631)
+        self.assertIn(date(2023, 3, 30).toordinal(), tehran_day_cache)
+        self.assertIn(date(2021, 9, 22).toordinal(), tehran_day_cache)
+        self.assertEqual(len(tehran_day_cache), 4)
+
+
+class JalaliIntFieldsTestCase(ModelTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for jalali_date in [14011229, 14020101, 14020109, 14020215, 14021229, 14030101]:
+            Transaction.objects.create(jalali_date=jalali_date, jalali_time=101010)
+
+    def filtered_dates(self, **lookups):
+        return [
+            transaction.jalali_date.strftime("%Y%m%d")
+            for transaction in Transaction.objects.filter(**lookups).order_by("jalali_date")
+        ]
+
+    def test_values_are_stored_as_integers_and_loaded_as_jalali_date_and_time(self):
+        transaction = Transaction.objects.create(jalali_date=JalaliDate(1402, 1, 9), jalali_time=time(9, 5, 1))
+        self.assertEqual(Transaction.objects.filter(pk=transaction.pk).values_list("jalali_date", "jalali_time").get(),
+                         (JalaliDate(1402, 1, 9), time(9, 5, 1)))
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT jalali_date, jalali_time FROM django_jalalify_transaction WHERE id = %s",
+                           [transaction.pk])
+            self.assertEqual(cursor.fetchone(), (14020109, 90501))
+        Transaction.objects.filter(pk=transaction.pk).update(jalali_date=date(2023, 3, 30), jalali_time="10:11:12")
+        transaction.refresh_from_db()
+        self.assertEqual((transaction.jalali_date, transaction.jalali_time), (JalaliDate(1402, 1, 10), time(10, 11, 12)))
+
+    def test_year_lookups_are_compiled_to_column_ranges(self):
+        self.assertEqual(self.filtered_dates(jalali_date__year=1402),
+                         ["14020101", "14020109", "14020215", "14021229"])
+        self.assertEqual(self.filtered_dates(jalali_date__year__gt=1402), ["14030101"])
+        self.assertEqual(self.filtered_dates(jalali_date__year__lte=1401), ["14011229"])
+        self.assertEqual(self.filtered_dates(jalali_date__year__gte=1403), ["14030101"])
+        self.assertEqual(self.filtered_dates(jalali_date__year__lt=1402), ["14011229"])
+        query = str(Transaction.objects.filter(jalali_date__year=1402).query)
+        self.assertIn('"jalali_date" BETWEEN 14020000 AND 14029999', query)
+
+    def test_year_month_lookups_are_compiled_to_column_ranges(self):
+        self.assertEqual(self.filtered_dates(jalali_date__year_month=140201), ["14020101", "14020109"])
+        self.assertEqual(self.filtered_dates(jalali_date__year_month__gt=140202), ["14021229", "14030101"])
+        self.assertEqual(self.filtered_dates(jalali_date__year_month__lte=140112), ["14011229"])
+        self.assertEqual(self.filtered_dates(jalali_date__year_month__gte=140212), ["14021229", "14030101"])
+        self.assertEqual(self.filtered_dates(jalali_date__year_month__lt=140202), ["14011229", "14020101", "14020109"])
+        query = str(Transaction.objects.filter(jalali_date__year_month=140207).query)
+        self.assertIn('"jalali_date" BETWEEN 14020700 AND 14020799', query)
+        query = str(Transaction.objects.filter(jalali_date__year_month__gt=140212).query)
+        self.assertIn('"jalali_date" >= 14021300', query)
+
+    def test_year_and_month_transforms(self):
+        self.assertEqual(self.filtered_dates(jalali_date__month=1), ["14020101", "14020109", "14030101"])
+        self.assertEqual(self.filtered_dates(jalali_date__year=1402, jalali_date__month=12), ["14021229"])
+        self.assertEqual(self.filtered_dates(jalali_date__year__in=[1401, 1403]), ["14011229", "14030101"])
+        self.assertEqual(self.filtered_dates(jalali_date__year_month__in=[140112, 140202]), ["14011229", "14020215"])
+        years = Transaction.objects.annotate(year=models.F("jalali_date__year")).values_list("year", flat=True)
+        self.assertEqual(sorted(set(years)), [1401, 1402, 1403])
+
+    def test_range_lookup_accepts_jalali_and_gregorian_dates(self):
+        self.assertEqual(self.filtered_dates(jalali_date__range=(JalaliDate(1402, 1, 1), "1402/02/15")),
+                         ["14020101", "14020109", "14020215"])
+        self.assertEqual(self.filtered_dates(jalali_date__range=(date(2023, 3, 22), date(2023, 3, 29))),
+                         ["14020109"])
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValidationError):
+            JalaliIntDateField().clean("1402/13/01", None)
+        with self.assertRaises(ValidationError):
+            JalaliIntTimeField().clean("25:00:00", None)
+        self.assertEqual(JalaliIntDateField().clean("1402/01/09", None), JalaliDate(1402, 1, 9))
+
+    def test_naive_datetimes_are_in_the_current_timezone(self):
+        # 21:00 UTC is 00:30 of the next day in Tehran
+        naive = datetime(2023, 3, 28, 21, 0)
+        self.assertEqual(JalaliIntDateField().get_prep_value(naive), 14020109)
+        with timezone.override("Asia/Tehran"):
+            self.assertEqual(JalaliIntDateField().get_prep_value(naive), 14020108)
+
+
+class JalaliDatabaseFunctionsTestCase(ModelTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        moments = [
+            datetime(2023, 3, 20, 20, 29, 59, tzinfo=pytz.utc),  # 1401/12/29 23:59:59 in Tehran
+            datetime(2023, 3, 20, 20, 30, tzinfo=pytz.utc),  # 1402/01/01 00:00:00 in Tehran
+            datetime(2023, 3, 29, 6, 30, tzinfo=pytz.utc),
+            datetime(2022, 6, 1, 19, 30, tzinfo=pytz.utc),  # midnight in Tehran, during DST
+            datetime(2023, 4, 21, 10, tzinfo=pytz.utc),
+        ]
+        for amount, moment in enumerate(moments, start=1):
+            Transaction.objects.create(created_at=moment, amount=amount)
+
+    def test_parts_are_computed_in_tehran(self):
+        rows = Transaction.objects.order_by("amount").values_list(
+            JalaliYear("created_at"), JalaliMonth("created_at"), JalaliDay("created_at"), JalaliDateInt("created_at")
+        )
+        self.assertEqual(list(rows), [
+            (1401, 12, 29, 14011229),
+            (1402, 1, 1, 14020101),
+            (1402, 1, 9, 14020109),
+            (1401, 3, 12, 14010312),
+            (1402, 2, 1, 14020201),
+        ])
+        for transaction in Transaction.objects.annotate(jalali_date_int=JalaliDateInt("created_at")):
+            self.assertEqual(transaction.jalali_date_int, convert_datetime_to_custom_jalali_date(transaction.created_at))
+
+    def test_aggregate_by_jalali_month_in_a_single_query(self):
+        with self.assertNumQueries(1):
+            totals = list(
+                Transaction.objects.values(year=JalaliYear("created_at"), month=JalaliMonth("created_at"))
+                .annotate(total=models.Sum("amount"))
+                .order_by("year", "month")
+            )
+        self.assertEqual(totals, [
+            {"year": 1401, "month": 3, "total": 4},
+            {"year": 1401, "month": 12, "total": 1},
+            {"year": 1402, "month": 1, "total": 5},
+            {"year": 1402, "month": 2, "total": 5},
+        ])
+
+    def test_filter_and_other_zones(self):
+        self.assertEqual(Transaction.objects.filter(created_at__isnull=False).annotate(
+            month=JalaliMonth("created_at")).filter(month=1).count(), 2)
+        self.assertEqual(
+            Transaction.objects.filter(amount=2).values_list(JalaliDateInt("created_at", tzname="UTC"), flat=True).get(),
+            14011229,
+        )
+
+    def test_trunc_to_the_first_day_of_jalali_periods(self):
+        rows = Transaction.objects.order_by("amount").values_list(
+            JalaliTruncYear("created_at"), JalaliTruncMonth("created_at"), JalaliTruncWeek("created_at")
+        )
+        self.assertEqual(list(rows), [
+            (14010101, 14011201, 14011227),
+            # weeks start on shanbeh, even across the new year
+            (14020101, 14020101, 14011227),
+            (14020101, 14020101, 14020105),
+            (14010101, 14010301, 14010307),
+            (14020101, 14020201, 14020126),
+        ])
+        with self.assertNumQueries(1):
+            totals = list(
+                Transaction.objects.values(week=JalaliTruncWeek("created_at", output_field=JalaliIntDateField()))
+                .annotate(total=models.Sum("amount"))
+                .order_by("week")
+            )
+        self.assertEqual(totals, [
+            {"week": JalaliDate(1401, 3, 7), "total": 4},
+            {"week": JalaliDate(1401, 12, 27), "total": 3},
+            {"week": JalaliDate(1402, 1, 5), "total": 3},
+            {"week": JalaliDate(1402, 1, 26), "total": 5},
+        ])
+
+    def test_postgresql_sql_computes_the_ordinal_once(self):
+        for function in (JalaliYear, JalaliMonth, JalaliDay, JalaliDateInt, JalaliTruncYear, JalaliTruncMonth,
+                         JalaliTruncWeek):
+            query = Transaction.objects.annotate(part=function("created_at")).query
+            sql, params = query.annotations["part"].as_postgresql(query.get_compiler(connection=connection), connection)
+            self.assertEqual(sql.count("created_at"), 1, function)
+            self.assertEqual(params, ["Asia/Tehran"])
+            self.assertEqual(sql.count("width_bucket"), 1, function)
+
+    def test_trunc_week_matches_khayyam_weekdays(self):
+        Transaction.objects.all().delete()
+        for day in range(15):
+            Transaction.objects.create(created_at=datetime(2023, 3, 14, 21, tzinfo=pytz.utc) + timedelta(days=day),
+                                       amount=day)
+        query = Transaction.objects.annotate(week=JalaliTruncWeek("created_at")).query
+        sql, params = query.annotations["week"].as_postgresql(query.get_compiler(connection=connection), connection)
+        self.assertEqual(sql.count("MOD(o + 1, 7)"), 1)
+        for created_at, week in Transaction.objects.values_list("created_at", JalaliTruncWeek("created_at")):
+            jalali_date = JalaliDatetime(created_at.astimezone(TEHRAN_ZONE)).date()
+            week_start = jalali_date - timedelta(days=jalali_date.weekday())
+            self.assertEqual(week, int(week_start.strftime("%Y%m%d")), created_at)
+
+    @skipUnless(connection.vendor == "postgresql", "the year window only limits the PostgreSQL functions")
+    def test_dates_outside_the_postgresql_year_window_raise(self):
+        Transaction.objects.create(created_at=datetime(2200, 1, 1, tzinfo=pytz.utc), amount=6)
+        with self.assertRaisesMessage(DatabaseError, "jalali date out of the year window"):
+            with db_transaction.atomic():
+                list(Transaction.objects.values_list(JalaliMonth("created_at")))
+        self.assertEqual(Transaction.objects.filter(amount=5).values_list(JalaliYear("created_at"), flat=True).get(),
+                         1402)
+
+
+class DateRangeFilterTestCase(ModelTestCase):
+
+    def get_filter(self, request, params=None, filter_class=DateRangeFilter, field_path="created_at"):
+        model_admin = admin.ModelAdmin(Transaction, admin.site)
+        field = Transaction._meta.get_field(field_path)
+        return filter_class(field, request, dict(params or {}), Transaction, model_admin, field_path)
+
+    def test_form_class_is_built_once_per_filter_class_and_field(self):
+        first_request, second_request = RequestFactory().get("/"), RequestFactory().get("/")
+        first_filter = self.get_filter(first_request)
+        second_filter = self.get_filter(second_request, {"created_at__range__gte": "1402/01/01"})
+        self.assertIs(type(first_filter.form), type(second_filter.form))
+        self.assertIsNot(first_filter.form.fields["created_at__range__gte"],
+                         second_filter.form.fields["created_at__range__gte"])
+        self.assertEqual(second_filter.form.data, {"created_at__range__gte": "1402/01/01"})
+        self.assertIsNot(type(self.get_filter(first_request, filter_class=DateTimeRangeFilter).form),
+                         type(first_filter.form))
+
+    def test_js_is_set_once_per_request_on_the_form_instance(self):
+        request = RequestFactory().get("/")
+        first_filter, second_filter = self.get_filter(request), self.get_filter(request)
+        self.assertEqual(first_filter.form.js, DateRangeFilter.get_js())
+        self.assertEqual(second_filter.form.js, [])
+        self.assertEqual(self.get_filter(RequestFactory().get("/")).form.js, DateRangeFilter.get_js())
+        self.assertFalse(hasattr(type(first_filter.form), "js"))
+
+
+@override_settings(TIME_ZONE="Asia/Tehran")
+class HalfOpenRangeFilterTestCase(ModelTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for moment in [
+            datetime(2023, 3, 20, 20, 29, 59, 999999, tzinfo=pytz.utc),  # 1401/12/29 23:59:59.999999 in Tehran
+            datetime(2023, 3, 20, 20, 30, tzinfo=pytz.utc),  # 1402/01/01 00:00:00 in Tehran
+            datetime(2023, 3, 29, 20, 29, 59, 999999, tzinfo=pytz.utc),  # 1402/01/09 23:59:59.999999 in Tehran
+            datetime(2023, 3, 29, 20, 30, tzinfo=pytz.utc),  # 1402/01/10 00:00:00 in Tehran
+        ]:
+            Transaction.objects.create(created_at=moment)
+
+    def filter_admin(self, filter_class, params):
+        model_admin = admin.ModelAdmin(Transaction, admin.site)
+        request = RequestFactory().get("/")
+        field = Transaction._meta.get_field("created_at")
+        range_filter = filter_class(field, request, dict(params), Transaction, model_admin, "created_at")
+        return range_filter.queryset(request, Transaction.objects.order_by("created_at"))
+
+    def test_admin_filters_are_the_same_in_both_modes(self):
+        params = {"created_at__range__gte": "1402-01-01", "created_at__range__lte": "1402-01-09"}
+        expected = list(Transaction.objects.order_by("created_at")[1:3])
+        self.assertEqual(list(self.filter_admin(DateRangeFilter, params)), expected)
+        for filter_class in [DateRangeFilter, jDateRangeFilter]:
+            half_open_filter_class = type("HalfOpen", (filter_class,), {"half_open_range": True})
+            queryset = self.filter_admin(half_open_filter_class, params)
+            self.assertEqual(list(queryset), expected)
+            self.assertIn('"created_at" < 2023-03-29 20:30:00', str(queryset.query))
+
+    @override_settings(JALALIFY_HALF_OPEN_RANGES=True)
+    def test_setting_enables_half_open_ranges(self):
+        queryset = self.filter_admin(DateRangeFilter, {"created_at__range__lte": "1402-01-09"})
+        self.assertEqual(queryset.count(), 3)
+        self.assertIn('"created_at" < 2023-03-29 20:30:00', str(queryset.query))
+
+    @override_settings(JALALIFY_HALF_OPEN_RANGES=True)
+    def test_django_filter_range(self):
+        range_filter = JalaliDateFromToRangeFilter(field_name="created_at")
+        value = range_filter.field.clean(["1402/01/01", "1402/01/09"])
+        self.assertEqual(list(range_filter.filter(Transaction.objects.order_by("created_at"), value)),
+                         list(Transaction.objects.order_by("created_at")[1:3]))
+        value = range_filter.field.clean(["1402/01/10", ""])
+        self.assertEqual(range_filter.filter(Transaction.objects.all(), value).count(), 1)
+
+    @override_settings(JALALIFY_HALF_OPEN_RANGES=True)
+    def test_django_filter_range_of_a_date_field_uses_dates(self):
+        range_filter = JalaliDateFromToRangeFilter(field_name="jalali_date")
+        value = range_filter.field.clean(["1402/01/01", "1402/01/09"])
+        # the midnight of 1402/01/01 in Tokyo is still 1401/12/29 in Tehran
+        with timezone.override("Asia/Tokyo"):
+            query = str(range_filter.filter(Transaction.objects.all(), value).query)
+        self.assertIn('"jalali_date" >= 14020101', query)
+        self.assertIn('"jalali_date" < 14020110', query)
+
+
+class JalaliPeriodTestCase(ModelTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for moment in [
+            datetime(2023, 9, 22, 20, 29, 59, 999999, tzinfo=pytz.utc),  # 1402/06/31 23:59:59.999999 in Tehran
+            datetime(2023, 9, 22, 20, 30, tzinfo=pytz.utc),  # 1402/07/01 00:00:00 in Tehran
+            datetime(2023, 12, 21, 20, 29, 59, 999999, tzinfo=pytz.utc),  # 1402/09/30 23:59:59.999999 in Tehran
+            datetime(2023, 12, 21, 20, 30, tzinfo=pytz.utc),  # 1402/10/01 00:00:00 in Tehran
+        ]:
+            Transaction.objects.create(created_at=moment)
+
+    def test_bounds_are_the_tehran_midnights(self):
+        tehran = pytz.timezone("Asia/Tehran")
+        for year in [1357, 1390, 1399, 1400, 1402]:
+            for month in range(1, 13):
+                next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+                self.assertEqual(jalali_period_bounds(year, month), (
+                    tehran.localize(JalaliDatetime(year, month, 1).todatetime()),
+                    tehran.localize(JalaliDatetime(next_year, next_month, 1).todatetime()),
+                ))
+        # 1400/01/02 to 1400/06/31 were in DST
+        self.assertEqual(jalali_period_bounds(1400, month=2), (
+            datetime(2021, 4, 20, 19, 30, tzinfo=pytz.utc), datetime(2021, 5, 21, 19, 30, tzinfo=pytz.utc)
+        ))
+        self.assertEqual(jalali_period_bounds(1400, quarter=3), (
+            datetime(2021, 9, 22, 20, 30, tzinfo=pytz.utc), datetime(2021, 12, 21, 20, 30, tzinfo=pytz.utc)
+        ))
+        self.assertEqual(jalali_period_bounds(1402), (
+            datetime(2023, 3, 20, 20, 30, tzinfo=pytz.utc), datetime(2024, 3, 19, 20, 30, tzinfo=pytz.utc)
+        ))
+        for kwargs in [{"month": 13}, {"quarter": 0}, {"month": 1, "quarter": 1}]:
+            with self.assertRaises(ValueError):
+                jalali_period_bounds(1402, **kwargs)
+
+    def test_months_are_contiguous(self):
+        months = list(iter_jalali_months((1399, 11), (1400, 2)))
+        self.assertEqual([(year, month) for year, month, _, _ in months], [(1399, 11), (1399, 12), (1400, 1), (1400, 2)])
+        for (_, _, _, end), (_, _, start, _) in zip(months, months[1:]):
+            self.assertEqual(end, start)
+        self.assertEqual(list(iter_jalali_months((1402, 2), (1402, 1))), [])
+        self.assertIn((1400, 1), month_start_cache)
+
+    def test_filter_jalali_period(self):
+        queryset = Transaction.objects.order_by("created_at")
+        self.assertEqual(list(filter_jalali_period(queryset, "created_at", 1402, quarter=3)), list(queryset[1:3]))
+        self.assertEqual(filter_jalali_period(queryset, "created_at", 1402, month=10).count(), 1)
+        self.assertEqual(filter_jalali_period(queryset, "created_at", 1402).count(), 4)
+        self.assertIn('"created_at" < 2023-12-21 20:30:00', str(
+            filter_jalali_period(queryset, "created_at", 1402, quarter=3).query
+        ))
+
+
+@override_settings(TIME_ZONE="Asia/Tehran")
+@freeze_time("2023-03-29 06:50:00")  # 1402/01/09 10:20:00 in Tehran, a chaharshanbeh
+class DateRangeShortcutTestCase(ModelTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for moment in [
+            datetime(2023, 3, 20, 20, 29, 59, tzinfo=pytz.utc),  # 1401/12/29 23:59:59 in Tehran
+            datetime(2023, 3, 20, 20, 30, tzinfo=pytz.utc),  # 1402/01/01 00:00:00 in Tehran
+            datetime(2023, 3, 24, 20, 29, 59, tzinfo=pytz.utc),  # 1402/01/04 23:59:59 in Tehran, a jomeh
+            datetime(2023, 3, 24, 20, 30, tzinfo=pytz.utc),  # 1402/01/05 00:00:00 in Tehran, a shanbeh
+            datetime(2023, 3, 27, 21, 0, tzinfo=pytz.utc),  # 1402/01/08 00:30:00 in Tehran
+            datetime(2023, 3, 28, 20, 30, tzinfo=pytz.utc),  # 1402/01/09 00:00:00 in Tehran
+            datetime(2023, 3, 29, 6, 0, tzinfo=pytz.utc),  # 1402/01/09 09:30:00 in Tehran
+        ]:
+            Transaction.objects.create(created_at=moment)
+
+    def setUp(self):
+        tehran_clock.reset()
+
+    def get_filter(self, params):
+        model_admin = admin.ModelAdmin(Transaction, admin.site)
+        field = Transaction._meta.get_field("created_at")
+        return DateRangeFilter(field, RequestFactory().get("/"), dict(params), Transaction, model_admin, "created_at")
+
+    def filter_admin(self, params):
+        range_filter = self.get_filter(params)
+        return range_filter.queryset(range_filter.request, Transaction.objects.all())
+
+    def test_shortcuts(self):
+        for shortcut, count in [
+            ("today", 2), ("yesterday", 1), ("this_week", 4), ("this_month", 6), ("this_quarter", 6),
+            ("this_year", 6), ("last_7_days", 5), ("last_30_days", 7),
+        ]:
+            queryset = self.filter_admin({"created_at__range__shortcut": shortcut})
+            self.assertEqual(queryset.count(), count, shortcut)
+        queryset = self.filter_admin({"created_at__range__shortcut": "this_week"})
+        self.assertIn('"created_at" < 2023-03-31 20:30:00', str(queryset.query))
+        # the free-form range narrows the shortcut
+        params = {"created_at__range__shortcut": "this_week", "created_at__range__gte": "1402-01-08"}
+        self.assertEqual(self.filter_admin(params).count(), 3)
+        self.assertEqual(self.filter_admin({"created_at__range__shortcut": "last_week"}).count(), 7)
+
+    def test_choices(self):
+        params = {"created_at__range__shortcut": "this_month", "created_at__range__gte": "1402-01-05"}
+        range_filter = self.get_filter(params)
+
+        def get_query_string(new_params=None, remove=None):
+            query = {key: value for key, value in params.items() if key not in (remove or [])}
+            return "?%s" % "&".join("%s=%s" % item for item in sorted({**query, **(new_params or {})}.items()))
+
+        choices = list(range_filter.choices(SimpleNamespace(get_query_string=get_query_string)))
+        self.assertNotIn("shortcut", choices[0])
+        # the form keeps the selected shortcut, which its range narrows, and the reset button removes it
+        self.assertEqual(choices[0]["query_string"], "?created_at__range__shortcut=this_month")
+        self.assertEqual(choices[0]["reset_query_string"], "?")
+        self.assertEqual([choice["shortcut"] for choice in choices[1:]], DateRangeFilter.shortcuts)
+        self.assertEqual([choice["shortcut"] for choice in choices if choice.get("selected")], ["this_month"])
+        self.assertEqual(choices[3]["query_string"], "?created_at__range__shortcut=this_week")
+        self.assertEqual(str(choices[-1]["display"]), "Last 30 days")
+        self.assertIn("created_at__range__shortcut", range_filter.expected_parameters())
+
+    def test_custom_shortcuts_are_validated(self):
+        model_admin = admin.ModelAdmin(Transaction, admin.site)
+        field = Transaction._meta.get_field("created_at")
+
+        def define(shortcuts):
+            return type("CustomShortcuts", (DateRangeFilter,), {"shortcuts": shortcuts})
+
+        filter_class = define(["last_14_days"])
+        list_filter = filter_class(field, RequestFactory().get("/"), {}, Transaction, model_admin, "created_at")
+        self.assertEqual(str(list_filter.get_shortcut_label("last_14_days")), "Last 14 days")
+        # an unknown shortcut fails when the class is defined, not on a request
+        for shortcuts in [["last_week"], ["today", "custom"]]:
+            with self.assertRaisesMessage(ImproperlyConfigured, "unknown date range shortcut"):
+                define(shortcuts)
+
+    def test_shortcut_bounds(self):
+        today = date(2023, 3, 29).toordinal()
+        self.assertEqual(get_shortcut_days("this_week", today), (date(2023, 3, 25).toordinal(),
+                                                                 date(2023, 4, 1).toordinal()))
+        self.assertEqual(get_shortcut_days("this_quarter", today), (date(2023, 3, 21).toordinal(),
+                                                                    date(2023, 6, 22).toordinal()))
+        self.assertIn(("this_week", today), shortcut_cache)
+        self.assertEqual(get_shortcut_bounds("today"), (datetime(2023, 3, 28, 20, 30, tzinfo=pytz.utc),
+                                                        datetime(2023, 3, 29, 20, 30, tzinfo=pytz.utc)))
+        # 1400/06/31 is the last day of DST
+        self.assertEqual(get_shortcut_bounds("this_quarter", date(2021, 9, 1).toordinal()), (
+            datetime(2021, 6, 21, 19, 30, tzinfo=pytz.utc), datetime(2021, 9, 22, 20, 30, tzinfo=pytz.utc)
+        ))
+        for shortcut in ["last_week", "last_0_days", "last_x_days"]:
+            with self.assertRaises(ValueError):
+                get_shortcut_days(shortcut, today)
+
+
+class JalaliParsingTestCase(TestCase):
+
+    def test_fixed_formats_are_equivalent_to_khayyam(self):
+        for value in ["1402/01/09 10:20:30", "1403/12/29 23:59:59", "1404/12/30 00:00:00", "1300/07/01 12:00:00"]:
+            self.assertEqual(parse_jalali_datetime(value), JalaliDatetime.strptime(value, "%Y/%m/%d %H:%M:%S").todatetime())
+            self.assertEqual(parse_jalali_date(value[:10]), JalaliDate.strptime(value[:10], "%Y/%m/%d").todate())
+
+    def test_persian_and_arabic_indic_digits(self):
+        self.assertEqual(parse_jalali_datetime("۱۴۰۲/۰۱/۰۹ ۱۰:۲۰:۳۰"), datetime(2023, 3, 29, 10, 20, 30))
+        self.assertEqual(parse_jalali_date("١٤٠٢/٠١/٠٩"), date(2023, 3, 29))
+
+    def test_other_formats_fall_back_to_khayyam(self):
+        self.assertEqual(parse_jalali_datetime("1402/1/9 10:2:3"), datetime(2023, 3, 29, 10, 2, 3))
+        self.assertEqual(parse_jalali_date("1402/1/9"), date(2023, 3, 29))
+
+    def test_invalid_values(self):
+        for value in ["1402/13/01 10:00:00", "1402/12/30 10:00:00", "1402/01/09 24:00:00", "1402/01/09 10:60:00",
+                      "1402-01-09 10:00:00", "1402/01/+9 10:00:00", "1402/01/09", ""]:
+            with self.assertRaises(ValueError, msg=value):
+                parse_jalali_datetime(value)
+        for value in ["1402/07/31", "1402-01-09", "14020109", "1402/01/ 9"]:
+            with self.assertRaises(ValueError, msg=value):
+                parse_jalali_date(value)
+
+    @override_settings(TIME_ZONE="Asia/Tehran")
+    def test_form_fields(self):
+        self.assertEqual(JalaliDateTimeField().clean("۱۴۰۲/۰۱/۰۹ ۱۰:۲۰:۳۰"),
+                         datetime(2023, 3, 29, 6, 50, 30, tzinfo=pytz.utc))
+        self.assertEqual(JalaliDateField().clean("1402/01/09"), date(2023, 3, 29))
+        with self.assertRaises(ValidationError):
+            JalaliDateTimeField().clean("1402/12/30 10:00:00")
+        with self.assertRaises(ValidationError):
+            JalaliDateField().clean("1402/12/30")
+
+
+@override_settings(TIME_ZONE="UTC")
+class JalalifyIterTestCase(ModelTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Transaction.objects.create(created_at=datetime(2023, 3, 29, 6, 30, tzinfo=pytz.utc), amount=1)
+        Transaction.objects.create(created_at=None, amount=2)
+
+    def test_queryset_is_streamed_in_a_single_query(self):
+        with self.assertNumQueries(1):
+            rows = list(jalalify_iter(Transaction.objects.order_by("amount"), ["amount", "created_at"], chunk_size=1))
+        self.assertEqual(rows, [{"amount": 1, "created_at": "1402/01/09 10:00:00"}, {"amount": 2, "created_at": None}])
+
+    def test_instances_dicts_and_tuples(self):
+        instances = list(Transaction.objects.order_by("amount"))
+        self.assertEqual(list(jalalify_iter(instances, ["created_at", "amount"], fmt="%Y-%m-%d", as_tuples=True)),
+                         [("1402-01-09", 1), (None, 2)])
+        rows = [{"day": date(2023, 3, 29), "at": datetime(2023, 3, 29, 10, 0)}]
+        # the naive datetime is in TIME_ZONE (UTC)
+        self.assertEqual(list(jalalify_iter(rows, ["day", "at"])), [{"day": "1402/01/09", "at": "1402/01/09 13:30:00"}])
+        self.assertEqual(list(jalalify_iter([], ["created_at"])), [])
+
+    def test_khayyam_values_are_formatted(self):
+        Transaction.objects.filter(amount=1).update(jalali_date=14020109)
+        self.assertEqual(list(jalalify_iter(Transaction.objects.order_by("amount"), ["jalali_date"], as_tuples=True)),
+                         [("1402/01/09",), (None,)])
+        aware = JalaliDatetime(datetime(2023, 3, 29, 6, 30, tzinfo=pytz.utc))
+        self.assertEqual(list(jalalify_iter([{"at": aware, "naive": JalaliDatetime(1402, 1, 9, 10)}], ["at", "naive"])),
+                         [{"at": "1402/01/09 10:00:00", "naive": "1402/01/09 13:30:00"}])
+
+    def test_naive_datetimes_are_in_the_current_timezone(self):
+        # the process zone follows TIME_ZONE (UTC), the activated zone wins
+        rows = [{"at": datetime(2023, 3, 29, 10, 0), "khayyam": JalaliDatetime(1402, 1, 9, 10)}]
+        with timezone.override("Asia/Tehran"):
+            self.assertEqual(list(jalalify_iter(rows, ["at", "khayyam"], as_tuples=True)),
+                             [("1402/01/09 10:00:00", "1402/01/09 10:00:00")])
+
+
+class JalaliFormatterTestCase(TestCase):
+
+    def test_matches_khayyam_strftime(self):
+        formats = ["%Y/%m/%d %H:%M:%S", "%y%m%d-%j", "%Y-%m-%d %H:%M:%S.%f", "%A %d %B %Y", "%a %b %p %I", "%x %X",
+                   "%c", "100%% %Y %K %", "%e/%n/%R %T", "no directives", ""]
+        values = [datetime(2023, 3, 29, 10, 20, 30, 123456), datetime(2025, 3, 20, 23, 59, 59), datetime(1990, 1, 1)]
+        for fmt in formats:
+            for value in values:
+                self.assertEqual(jalali_strftime(value, fmt), JalaliDatetime(value).strftime(fmt), (fmt, value))
+                self.assertEqual(jalali_strftime(value.date(), fmt), JalaliDate(value.date()).strftime(fmt))
+                self.assertEqual(jalali_strftime(JalaliDatetime(value), fmt), JalaliDatetime(value).strftime(fmt))
+
+    def test_formatter(self):
+        formatter = JalaliFormatter("%Y/%m/%d %H:%M:%S")
+        self.assertEqual(formatter.format(1402, 1, 9, 10, 20, 30), "1402/01/09 10:20:30")
+        self.assertEqual(JalaliFormatter("%Y/%m/%d %H:%M", date_only=True).format(1402, 1, 9), "1402/01/09 %H:%M")
+        self.assertEqual(jalali_strftime(datetime(2023, 3, 29, 6, 30, tzinfo=pytz.utc).astimezone(TEHRAN_ZONE),
+                                         "%Y/%m/%d %H:%M:%S"), "1402/01/09 10:00:00")
+
+    def test_format_strings_are_cached(self):
+        formatter_cache.clear()
+        self.assertIs(get_formatter("%Y/%m/%d"), get_formatter("%Y/%m/%d"))
+        self.assertIsNot(get_formatter("%Y/%m/%d"), get_formatter("%Y/%m/%d", date_only=True))
+        self.assertEqual(formatter_cache.info()["hits"], 2)
+
+
+class TehranClockTestCase(TestCase):
+
+    def setUp(self):
+        tehran_clock.reset()
+
+    def test_now_helpers(self):
+        with freeze_time("2023-03-29 06:30:15.5"):
+            self.assertEqual(get_now_tehran_jalali_date_intftime(), 14020109)
+            self.assertEqual(get_now_tehran_jalali_time_intftime(), 100015)
+            self.assertEqual(get_now_tehran_jalali_date_strftime(), "1402/01/09")
+            self.assertEqual(get_now_tehran_jalali_date_strftime("%Y-%m-%d"), "1402-01-09")
+            self.assertEqual(get_now_tehran_jalali_time_strftime("%H:%M:%S.%f"), "10:00:15.500000")
+        with freeze_time("2023-03-29 06:30:15.25") as frozen_time:
+            self.assertEqual(get_now_tehran_jalali_time_strftime(), "10:00:15")
+            frozen_time.tick(0.5)
+            # the snapshot of the tick serves the seconds and the microseconds of one instant
+            self.assertEqual(get_now_tehran_jalali_time_strftime(), "10:00:15")
+            self.assertEqual(get_now_tehran_jalali_time_strftime("%H:%M:%S.%f"), "10:00:15.250000")
+            frozen_time.tick(0.5)
+            self.assertEqual(get_now_tehran_jalali_time_strftime("%H:%M:%S.%f"), "10:00:16.250000")
+        with freeze_time("2022-06-01 19:29:59"):  # during DST
+            self.assertEqual((get_now_tehran_jalali_date_intftime(), get_now_tehran_jalali_time_intftime()),
+                             (14010311, 235959))
+
+    def test_snapshot_is_served_until_the_end_of_the_tick(self):
+        clock = TehranClock(tick=1)
+        with freeze_time("2023-03-29 20:29:59.2") as frozen_time:
+            snapshot = clock.now()
+            frozen_time.tick(0.5)
+            self.assertIs(clock.now(), snapshot)
+            frozen_time.tick(0.3)
+            # the date and the time of the next snapshot both come from the new instant, after the local midnight
+            self.assertEqual((clock.now().date_int, clock.now().time_int), (14020110, 0))
+            frozen_time.move_to("2023-03-29 10:00:00")
+            self.assertEqual(clock.now().time_int, 133000)
+            snapshot = clock.now()
+            clock.reset()
+            self.assertIsNot(clock.now(), snapshot)
+
+    def test_zero_tick_takes_a_snapshot_on_every_call(self):
+        clock = TehranClock(tick=0)
+        with freeze_time("2023-03-29 06:30:00"):
+            self.assertIsNot(clock.now(), clock.now())
+
+
+class ImportTimeTestCase(TestCase):
+    """
+    the integer helpers are imported by short lived processes, khayyam, pytz and the tzdata file must be loaded on first
+    use.
+    """
+
+    def import_fresh(self, statement):
+        """
+        (sys.modules, names of django_jalalify.timezone) after running statement in a fresh interpreter.
+        """
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, os.environ.get("PYTHONPATH", "")]))
+        report = "import json, sys; print(json.dumps([sorted(sys.modules), sorted(vars(django_jalalify.timezone))]))"
+        stdout = subprocess.run(
+            [sys.executable, "-c", "%s; import django_jalalify.timezone; %s" % (statement, report)], env=env,
+            stdout=subprocess.PIPE, universal_newlines=True, check=True,
+        ).stdout
+        modules, names = json.loads(stdout)
+        return set(modules), set(names)
+
+    def test_base_import_is_lazy(self):
+        modules, names = self.import_fresh("import django_jalalify.utils")
+        for module in ["khayyam", "pytz", "jdatetime", "django_jalali", "django"]:
+            self.assertNotIn(module, modules)
+        # the zone is built on first use
+        self.assertNotIn("TEHRAN_ZONE", names)
+        modules, names = self.import_fresh("import django_jalalify.utils; django_jalalify.utils.tehran_now()")
+        self.assertIn("TEHRAN_ZONE", names)
+        self.assertNotIn("khayyam", modules)
+
+    def test_fields_do_not_import_khayyam(self):
+        modules, _ = self.import_fresh("import django_jalalify.model_fields")
+        self.assertIn("django_jalalify.fields", modules)
+        self.assertNotIn("khayyam", modules)
+
+    def test_khayyam_classes_are_loaded_on_first_use(self):
+        import django_jalalify
+        import khayyam
+
+        self.assertIs(django_jalalify.JalaliDatetime, khayyam.JalaliDatetime)
+        self.assertIn("JalaliDate", dir(django_jalalify))
+        with self.assertRaises(AttributeError):
+            django_jalalify.JalaliTime
+
+
+class JalaliSerializerFieldsTestCase(TestCase):
+
+    def test_render(self):
+        serializer = TransactionSerializer([
+            {"created_at": datetime(2023, 3, 29, 6, 50, 30, tzinfo=pytz.utc), "jalali_date": date(2023, 3, 29)},
+            # 1402/01/10 00:10:00 in Tehran
+            {"created_at": datetime(2023, 3, 29, 20, 40, tzinfo=pytz.utc), "jalali_date": JalaliDate(1402, 1, 10)},
+            {"created_at": None, "jalali_date": date(2023, 3, 29)},
+        ], many=True)
+        self.assertEqual(serializer.data, [
+            {"created_at": "1402/01/09 10:20:30", "jalali_date": "1402/01/09"},
+            {"created_at": "1402/01/10 00:10:00", "jalali_date": "1402/01/10"},
+            {"created_at": None, "jalali_date": "1402/01/09"},
+        ])
+        # the dates are converted once per serializer instance
+        self.assertEqual(len(serializer.child.fields["created_at"]._dates), 2)
+        self.assertEqual(len(serializer.child.fields["jalali_date"]._dates), 2)
+        self.assertEqual(TransactionSerializer(object).fields["created_at"]._dates, {})
+
+    def test_custom_format_and_timezone(self):
+        field = JalaliDateTimeSerializerField(format="%Y-%m-%d %H:%M %B", default_timezone=pytz.utc)
+        self.assertEqual(field.to_representation(datetime(2023, 3, 29, 6, 50, 30, tzinfo=pytz.utc)),
+                         "1402-01-09 06:50 فروردین")
+
+    def test_parse(self):
+        serializer = TransactionSerializer(data={"created_at": "۱۴۰۲/۰۱/۰۹ ۱۰:۲۰:۳۰", "jalali_date": "1402/01/09"})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["created_at"], datetime(2023, 3, 29, 6, 50, 30, tzinfo=pytz.utc))
+        self.assertEqual(serializer.validated_data["jalali_date"], date(2023, 3, 29))
+        tehran = pytz.timezone("Asia/Tehran")
+        field = JalaliDateTimeSerializerField(default_timezone=tehran)
+        # a pytz zone is localized, instead of getting the LMT offset of the zone
+        self.assertEqual(field.to_internal_value("1402/01/09 10:20:30"),
+                         datetime(2023, 3, 29, 6, 50, 30, tzinfo=pytz.utc))
+        self.assertEqual(field.to_internal_value("1401/06/01 12:00:00").utcoffset(), timedelta(hours=4, minutes=30))
+        # the clocks of Tehran moved from 00:00 to 01:00 on 1401/01/02 and from 24:00 back to 23:00 on 1401/06/30
+        for data in ["1401/01/02 00:30:00", "1401/06/30 23:30:00"]:
+            with self.assertRaisesMessage(serializers.ValidationError, "Invalid datetime for the timezone"):
+                field.to_internal_value(data)
+        serializer = TransactionSerializer(data={"created_at": "1402/01/32 10:20:30", "jalali_date": "1402-1"})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(set(serializer.errors), {"created_at", "jalali_date"})
+
+
+class InstrumentationTestCase(ModelTestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+        self.addCleanup(instrumentation.disable)
+
+    def test_nothing_is_wrapped_until_enabled(self):
+        original = utils.convert_datetime_to_custom_jalali_date
+        queryset = DateRangeFilter.queryset
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertFalse(hasattr(original, "__wrapped__"))
+        instrumentation.enable()
+        instrumentation.enable()
+        self.assertIs(utils.convert_datetime_to_custom_jalali_date.__wrapped__, original)
+        self.assertIs(DateRangeFilter.queryset.__wrapped__, queryset)
+        instrumentation.disable()
+        self.assertIs(utils.convert_datetime_to_custom_jalali_date, original)
+        self.assertIs(DateRangeFilter.queryset, queryset)
+
+    def test_calls_and_cache_hits_are_counted(self):
+        instrumentation.enable()
+        measured = []
+
+        def receiver(sender, name, duration, **kwargs):
+            measured.append(name)
+
+        call_measured.connect(receiver)
+        self.addCleanup(call_measured.disconnect, receiver)
+        for _ in range(3):
+            utils.convert_datetime_to_custom_jalali_date(datetime(2023, 3, 29, 6, 30, tzinfo=pytz.utc))
+        JalaliDateTimeField().clean("1402/01/09 10:20:30")
+        model_admin = admin.ModelAdmin(Transaction, admin.site)
+        request = RequestFactory().get("/")
+        range_filter = DateTimeRangeFilter(
+            Transaction._meta.get_field("created_at"), request, {"created_at__range__gte_0": "1402/01/09"},
+            Transaction, model_admin, "created_at",
+        )
+        range_filter.queryset(request, Transaction.objects.all())
+        snapshot = instrumentation.snapshot()
+        functions = snapshot["functions"]
+        self.assertEqual(functions["django_jalalify.utils.convert_datetime_to_custom_jalali_date"]["calls"], 3)
+        self.assertEqual(functions["django_jalalify.fields.JalaliDateTimeField.to_python"]["calls"], 1)
+        self.assertEqual(functions["django_jalalify.admin.filters.DateRangeFilter.queryset"]["calls"], 1)
+        self.assertGreater(functions["django_jalalify.utils.convert_datetime_to_custom_jalali_date"]["total_time"], 0)
+        self.assertEqual(measured.count("django_jalalify.utils.convert_datetime_to_custom_jalali_date"), 3)
+        day_cache = snapshot["caches"]["django_jalalify.cache.tehran_day_cache"]
+        self.assertGreaterEqual(day_cache["hits"], 2)
+        self.assertEqual(day_cache["hit_rate"], day_cache["hits"] / (day_cache["hits"] + day_cache["misses"]))
+        self.assertIn("django_jalalify.timezone.get_tehran_utc_transitions", snapshot["caches"])
+
+    def test_targets_of_missing_modules_are_skipped(self):
+        targets = instrumentation.INSTRUMENTED_TARGETS + [("django_jalalify.missing", "Missing.method")]
+        with mock.patch.object(instrumentation, "INSTRUMENTED_TARGETS", targets):
+            instrumentation.enable()
+        self.assertTrue(hasattr(utils.convert_datetime_to_custom_jalali_date, "__wrapped__"))
+
+    def test_report_is_registered_at_exit_once(self):
+        with mock.patch.object(instrumentation, "_report_at_exit", False), \
+                mock.patch.object(instrumentation.atexit, "register") as register, \
+                tempfile.TemporaryDirectory() as directory:
+            for subdirectory in ["first", "second", "first"]:
+                path = os.path.join(directory, subdirectory)
+                instrumentation.save_snapshots(path)
+                self.addCleanup(stats_reported.disconnect, dispatch_uid=("django_jalalify.save_snapshots", path))
+        register.assert_called_once_with(instrumentation.report)
+
+    def test_report_and_stats_command(self):
+        instrumentation.enable()
+        utils.convert_datetime_to_custom_jalali_date(datetime(2023, 3, 29, 6, 30, tzinfo=pytz.utc))
+        reported = []
+
+        def receiver(sender, snapshot, **kwargs):
+            reported.append(snapshot)
+
+        stats_reported.connect(receiver)
+        self.addCleanup(stats_reported.disconnect, receiver)
+        with tempfile.TemporaryDirectory() as directory:
+            instrumentation.save_snapshots(directory)
+            self.addCleanup(stats_reported.disconnect, dispatch_uid=("django_jalalify.save_snapshots", directory))
+            snapshot = instrumentation.report()
+            self.assertEqual(reported, [snapshot])
+            # the snapshot of another process
+            with open(instrumentation.snapshot_path(directory, 1), "w") as file:
+                json.dump(snapshot, file)
+            stdout = StringIO()
+            call_command("jalalify_stats", "--dir", directory, "--json", "--reset", stdout=stdout)
+            stats = json.loads(stdout.getvalue())
+            self.assertEqual(stats["processes"], 2)
+            functions = stats["functions"]
+            self.assertEqual(functions["django_jalalify.utils.convert_datetime_to_custom_jalali_date"]["calls"], 2)
+            self.assertEqual(os.listdir(directory), [])
+        stdout = StringIO()
+        call_command("jalalify_stats", "--dir", "", stdout=stdout)
+        self.assertIn("django_jalalify.utils.convert_datetime_to_custom_jalali_date", stdout.getvalue())
+        self.assertIn("django_jalalify.cache.tehran_day_cache", stdout.getvalue())
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+class AsyncBatchTestCase(TestCase):
+
+    def setUp(self):
+        self.executor = RecordingExecutor()
+        asynchronous.set_executor(self.executor)
+        self.addCleanup(self.executor.shutdown)
+        self.addCleanup(asynchronous.set_executor, None)
+        self.datetimes = [datetime(2023, 3, 20, 20, 29, tzinfo=pytz.utc) + timedelta(minutes=minutes)
+                          for minutes in range(10)]
+
+    async def test_small_batches_run_inline(self):
+        self.assertEqual(await asynchronous.aconvert_many(self.datetimes[:2]), [14011229, 14020101])
+        self.assertEqual(self.executor.submitted, 0)
+
+    async def test_large_batches_are_offloaded_in_chunks(self):
+        self.assertEqual(await asynchronous.aconvert_many(iter(self.datetimes), chunk_size=3),
+                         asynchronous.convert_many(self.datetimes))
+        self.assertEqual(self.executor.submitted, 4)
+        self.assertEqual(await asynchronous.aformat_many(self.datetimes + [date(2023, 3, 29), 1], chunk_size=3),
+                         ["1401/12/29 23:59:00"] + ["1402/01/01 00:0%d:00" % minute for minute in range(9)] +
+                         ["1402/01/09", 1])
+        strings = ["1402/01/09 10:20:%02d" % second for second in range(5)]
+        self.assertEqual(await asynchronous.aparse_many(strings, chunk_size=2),
+                         [datetime(2023, 3, 29, 10, 20, second) for second in range(5)])
+        with self.assertRaises(ValueError):
+            await asynchronous.aparse_many(strings + ["1402/01/32 10:20:30"], chunk_size=2)
+
+    async def test_hot_helpers_do_no_io(self):
+        # the database is not touched, or django would raise SynchronousOnlyOperation in a coroutine
+        self.assertEqual(utils.get_now_tehran_jalali_datetime().tzinfo, TEHRAN_ZONE)
+        self.assertEqual(JalaliDateTimeField().clean("1402/01/09 10:20:30").year, 2023)
+        instance = Transaction(created_at=datetime(2023, 3, 29, 6, 50, 30, tzinfo=pytz.utc))
+        self.assertEqual(FieldDateTimeInJalaliGeneratorMixin._field_datetime_in_jalali(instance, "created_at"),
+                         "1402/01/09 10:20:30")
+
+
+class BackfillTestCase(ModelTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for minutes in range(7):
+            Transaction.objects.create(created_at=datetime(2023, 3, 20, 20, 28, 30, tzinfo=pytz.utc) +
+                                       timedelta(minutes=minutes))
+        Transaction.objects.create(created_at=None)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = os.path.join(directory.name, "checkpoint.json")
+
+    def assert_backfilled(self):
+        for transaction in Transaction.objects.all():
+            if transaction.created_at is None:
+                self.assertIsNone(transaction.jalali_date)
+                continue
+            date_string, time_string = utils.jalali_datetime_to_int(
+                JalaliDatetime(transaction.created_at.astimezone(TEHRAN_ZONE)))
+            self.assertEqual(transaction.jalali_date.strftime("%Y%m%d"), date_string)
+            self.assertEqual(transaction.jalali_time.strftime("%H%M%S"), time_string)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command("jalalify_backfill", "django_jalalify.Transaction", "created_at", "jalali_date", "jalali_time",
+                     "--chunk-size", "3", "--checkpoint", self.checkpoint, stdout=stdout)
+        self.assert_backfilled()
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("3/8 rows (37.5%)"))
+        self.assertTrue(lines[-1].startswith("8 rows backfilled"))
+        self.assertFalse(os.path.exists(self.checkpoint))
+        self.assertEqual(Transaction.objects.filter(jalali_date=JalaliDate(1402, 1, 1)).count(), 5)
+
+    def test_resume_from_checkpoint(self):
+        def interrupt(progress):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            backfill(Transaction, "created_at", "jalali_date", chunk_size=2, checkpoint=self.checkpoint,
+                     progress=interrupt)
+        first_pks = list(Transaction.objects.order_by("pk").values_list("pk", flat=True)[:2])
+        task = {"model": "django_jalalify.Transaction", "source": "created_at", "date_field": "jalali_date",
+                "time_field": None, "only_null": False}
+        self.assertEqual(read_checkpoint(self.checkpoint, task), first_pks[-1])
+        self.assertEqual(Transaction.objects.filter(jalali_date__isnull=False).count(), 2)
+        with self.assertRaises(ValueError):
+            # the checkpoint of the date only backfill
+            backfill(Transaction, "created_at", "jalali_date", "jalali_time", checkpoint=self.checkpoint)
+        result = backfill(Transaction, "created_at", "jalali_date", chunk_size=2, workers=2,
+                          checkpoint=self.checkpoint)
+        self.assertEqual((result.done, result.total), (6, 6))
+        self.assertEqual(Transaction.objects.filter(jalali_date__isnull=False).count(), 7)
+
+    def test_next_batch_is_converted_while_a_batch_is_written(self):
+        events = []
+
+        class Executor(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                events.append("submit")
+                return super().submit(*args, **kwargs)
+
+        with mock.patch("django_jalalify.backfill.ProcessPoolExecutor", Executor):
+            backfill(Transaction, "created_at", "jalali_date", "jalali_time", chunk_size=2, workers=2,
+                     progress=lambda progress: events.append(progress.done))
+        # the chunks of the second batch are submitted before the first one is written
+        self.assertEqual(events, ["submit"] * 4 + [2, 4, 6, 8])
+        self.assert_backfilled()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            call_command("jalalify_backfill", "django_jalalify.Missing", "created_at", "jalali_date")
+        with self.assertRaises(CommandError):
+            call_command("jalalify_backfill", "django_jalalify.Transaction", "missing", "jalali_date",
+                         "--checkpoint", self.checkpoint)
+
+
+class JalaliStampTestCase(TestCase):
+    def setUp(self):
+        self.stamp = JalaliStamp.from_datetime(datetime(2023, 3, 29, 6, 50, 30, 5, tzinfo=pytz.utc))
+
+    def test_from_datetime(self):
+        self.assertEqual(self.stamp, JalaliStamp(14020109, 102030000005))
+        self.assertEqual(self.stamp.to_ints(), (14020109, 102030))
+        self.assertEqual((self.stamp.year, self.stamp.month, self.stamp.day), (1402, 1, 9))
+        self.assertEqual((self.stamp.hour, self.stamp.minute, self.stamp.second, self.stamp.microsecond),
+                         (10, 20, 30, 5))
+        # naive datetimes are in the current timezone, TIME_ZONE (UTC) by default
+        self.assertEqual(JalaliStamp.from_datetime(datetime(2023, 3, 29, 6, 50, 30, 5)), self.stamp)
+        with timezone.override("Asia/Tehran"):
+            self.assertEqual(JalaliStamp.from_datetime(datetime(2023, 3, 29, 10, 20, 30, 5)), self.stamp)
+        self.assertEqual(JalaliStamp.from_jalali(JalaliDate(1402, 1, 9)), JalaliStamp(14020109))
+
+    def test_from_ints(self):
+        self.assertEqual(JalaliStamp.from_ints(14020109, 102030, 5), self.stamp)
+        self.assertEqual(JalaliStamp.from_ints(14041230), JalaliStamp(14041230, 0))
+        with self.assertRaises(ValueError):
+            JalaliStamp.from_ints(14021230)
+        with self.assertRaises(ValueError):
+            JalaliStamp.from_ints(14021301)
+
+    def test_conversions(self):
+        value = self.stamp.todatetime()
+        self.assertEqual(value, datetime(2023, 3, 29, 6, 50, 30, 5, tzinfo=pytz.utc))
+        self.assertEqual(self.stamp.todatetime(tzinfo=None), datetime(2023, 3, 29, 10, 20, 30, 5))
+        self.assertEqual(self.stamp.toordinal(), date(2023, 3, 29).toordinal())
+        jalali = self.stamp.tojalali()
+        self.assertEqual(jalali.strftime("%Y/%m/%d %H:%M:%S"), "1402/01/09 10:20:30")
+        self.assertEqual(JalaliStamp.from_jalali(jalali), self.stamp)
+        self.assertEqual(str(self.stamp), "1402/01/09 10:20:30.000005")
+        self.assertEqual(str(JalaliStamp(14020109, 102030000000)), "1402/01/09 10:20:30")
+        self.assertEqual(self.stamp.strftime("%Y%m%d"), "14020109")
+
+    def test_arithmetic(self):
+        self.assertEqual(self.stamp + timedelta(hours=14), JalaliStamp(14020110, 2030000005))
+        self.assertEqual(timedelta(days=1) + self.stamp, JalaliStamp(14020110, 102030000005))
+        # across the end of the leap year 1404
+        end_of_year = JalaliStamp.from_ints(14041230, 233000)
+        self.assertEqual(end_of_year + timedelta(hours=1), JalaliStamp.from_ints(14050101, 3000))
+        self.assertEqual(JalaliStamp.from_ints(14050101, 3000) - timedelta(hours=1), end_of_year)
+        self.assertEqual(JalaliStamp.from_ints(14050101, 3000) - end_of_year, timedelta(hours=1))
+        self.assertEqual(self.stamp - JalaliStamp.from_ints(14010109), timedelta(days=365, seconds=37230,
+                                                                                   microseconds=5))
+
+    def test_ordering_and_hashing(self):
+        stamps = [JalaliStamp.from_ints(14020110), self.stamp, JalaliStamp.from_ints(14020109, 235959)]
+        self.assertEqual(sorted(stamps), [self.stamp, stamps[2], stamps[0]])
+        self.assertTrue(self.stamp < stamps[0] and self.stamp <= stamps[2] and stamps[0] >= stamps[2])
+        self.assertNotEqual(self.stamp, stamps[2])
+        self.assertEqual(len({self.stamp, JalaliStamp(14020109, 102030000005), stamps[0]}), 2)
+        self.assertNotEqual(self.stamp, self.stamp.todatetime())
+
+    def test_repeated_hour_keeps_the_fold(self):
+        # 1400/06/30 23:00-24:00 was repeated in Tehran, at 19:00 UTC with DST and at 20:00 UTC without
+        first = JalaliStamp.from_datetime(datetime(2021, 9, 21, 19, 0, tzinfo=pytz.utc))
+        second = JalaliStamp.from_datetime(datetime(2021, 9, 21, 20, 0, tzinfo=pytz.utc))
+        self.assertEqual((first.to_ints(), first.fold, second.to_ints(), second.fold),
+                         ((14000630, 233000), 0, (14000630, 233000), 1))
+        self.assertEqual(second, JalaliStamp(14000630, FOLD + 233000000000))
+        self.assertEqual(len({first, second}), 2)
+        later = JalaliStamp.from_datetime(datetime(2021, 9, 21, 19, 20, tzinfo=pytz.utc))  # the first 23:50
+        self.assertEqual(sorted([second, later, first]), [first, later, second])
+        # the times of the repeated hour are never equal to the datetimes of other zones, see PEP 495
+        self.assertEqual(first.todatetime().astimezone(pytz.utc), datetime(2021, 9, 21, 19, 0, tzinfo=pytz.utc))
+        self.assertEqual(second.todatetime().astimezone(pytz.utc), datetime(2021, 9, 21, 20, 0, tzinfo=pytz.utc))
+        with timezone.override(TEHRAN_ZONE):
+            self.assertEqual(JalaliStamp.from_datetime(second.todatetime(tzinfo=None)), second)
+        self.assertEqual((second.hour, second.minute, str(second)), (23, 30, "1400/06/30 23:30:00"))
+        self.assertEqual(second + timedelta(minutes=40), JalaliStamp.from_ints(14000631, 1000))
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.stamp.date = 14020110
+        with self.assertRaises(AttributeError):
+            del self.stamp.time
+        with self.assertRaises(AttributeError):
+            self.stamp.extra = 1
+        self.assertEqual(pickle.loads(pickle.dumps(self.stamp)), self.stamp)
+        self.assertEqual(repr(self.stamp), "JalaliStamp(14020109, 102030000005)")
@@ -1,14 +1,129 @@
 # -*- coding: utf-8 -*-
+import os
+import struct
+from bisect import bisect_right
 from datetime import tzinfo, timedelta, datetime
-
-import pytz
-from khayyam.helpers import force_encoded_string_output
+from functools import lru_cache
+from typing import Tuple
 
 ZERO_DELTA = timedelta(0)
 TEHRAN_OFFSET = timedelta(hours=3, minutes=30)
+TEHRAN_ZONE_NAME = "Asia/Tehran"
+
+# datetime(1, 1, 1) in seconds since epoch, the start of the first period of the zone
+FIRST_INSTANT = -62135596800
+
+_TZIF_HEADER = struct.Struct(">4sc15x6l")
+
+
+def _zoneinfo():
+    try:
+        import zoneinfo
+    except ImportError:  # python < 3.9
+        from backports import zoneinfo
+    return zoneinfo
 
-TEHRAN_LMT_ZONE = pytz.timezone("Asia/Tehran")
-TEHRAN_ZONE = datetime(2000, 1, 1).astimezone(pytz.timezone("Asia/Tehran")).tzinfo
+
+class TehranZoneInfo(_zoneinfo().ZoneInfo):
+    """
+    zoneinfo.ZoneInfo("Asia/Tehran") which also takes khayyam.JalaliDatetime objects in utcoffset, dst and tzname, so
+    it can be the tzinfo of khayyam objects. astimezone() goes through ZoneInfo's own fromutc.
+    """
+
+    def utcoffset(self, dt):
+        if dt is not None and not isinstance(dt, datetime):
+            dt = dt.todatetime()
+        return super().utcoffset(dt)
+
+    def dst(self, dt):
+        if dt is not None and not isinstance(dt, datetime):
+            dt = dt.todatetime()
+        return super().dst(dt)
+
+    def tzname(self, dt):
+        if dt is not None and not isinstance(dt, datetime):
+            dt = dt.todatetime()
+        return super().tzname(dt)
+
+
+def __getattr__(name):
+    if name == "TEHRAN_ZONE":
+        # built, and its tzdata file read, on first use rather than on import
+        globals()[name] = TehranZoneInfo(TEHRAN_ZONE_NAME)
+        return globals()[name]
+    if name == "TEHRAN_LMT_ZONE":
+        # the pytz zone it has always been, only built (and pytz imported) when it is used
+        import pytz
+
+        globals()[name] = pytz.timezone(TEHRAN_ZONE_NAME)
+        return globals()[name]
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def _open_tzif(name):
+    # the same places zoneinfo looks in: the TZPATH directories, then the tzdata package
+    for directory in _zoneinfo().TZPATH:
+        path = os.path.join(directory, *name.split("/"))
+        if os.path.isfile(path):
+            return open(path, "rb")
+    from importlib import resources
+
+    package, _, resource = ("tzdata.zoneinfo." + name.replace("/", ".")).rpartition(".")
+    if hasattr(resources, "files"):
+        return resources.files(package).joinpath(resource).open("rb")
+    return resources.open_binary(package, resource)
+
+
+def _read_tzif_transitions(file) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    # RFC 8536, the 64 bit data block of version 2+ files, the 32 bit one of version 1 files
+    magic, version, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = _TZIF_HEADER.unpack(
+        file.read(_TZIF_HEADER.size)
+    )
+    if magic != b"TZif":
+        raise ValueError("Not a TZif file")
+    time_format = "l"
+    if version >= b"2":
+        file.read(timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 + isstdcnt + isutcnt)
+        _, _, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = _TZIF_HEADER.unpack(
+            file.read(_TZIF_HEADER.size)
+        )
+        time_format = "q"
+    times = struct.unpack(">%d%s" % (timecnt, time_format), file.read(timecnt * struct.calcsize(time_format)))
+    indexes = file.read(timecnt)
+    type_offsets = [struct.unpack(">lBB", file.read(6))[0] for _ in range(typecnt)]
+    # the local time before the first transition is of the first type
+    return (FIRST_INSTANT,) + times, tuple(type_offsets[index] for index in (0,) + tuple(indexes))
+
+
+@lru_cache(maxsize=None)
+def get_tehran_utc_transitions() -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    return the instants (seconds since epoch in UTC) at which the utc offset of Tehran changes, and the offsets
+    (in seconds) which are in effect from each of those instants on, read from the same tzdata file as TEHRAN_ZONE.
+    the first offset applies to any time before. Asia/Tehran has no DST rule after its last transition (2022).
+    """
+    with _open_tzif(TEHRAN_ZONE_NAME) as file:
+        return _read_tzif_transitions(file)
+
+
+def get_tehran_utc_offset(epoch_seconds) -> int:
+    """
+    utc offset of Tehran in seconds at the given UTC instant (seconds since epoch).
+    """
+    instants, offsets = get_tehran_utc_transitions()
+    return offsets[max(bisect_right(instants, epoch_seconds) - 1, 0)]
+
+
+def make_aware(value: datetime) -> datetime:
+    """
+    make a naive datetime aware in the current django timezone (TIME_ZONE by default), the same as the django fields
+    take them. aware datetimes are returned as they are.
+    """
+    if value.utcoffset() is not None:
+        return value
+    from django.utils import timezone
+
+    return timezone.make_aware(value, timezone.get_current_timezone())
 
 
 class Timezone(tzinfo):
@@ -40,7 +155,7 @@ class Timezone(tzinfo):
     def dst(self, dt):
         return ZERO_DELTA
 
-    def __unicode__(self):
+    def __repr__(self):
         off = self._offset
         return '%s%.2d:%.2d' % (
             '+' if off.total_seconds() >= 0 else '-',
@@ -48,8 +163,6 @@ class Timezone(tzinfo):
             int((off.total_seconds() % 3600) / 60),
         )
 
-    __repr__ = force_encoded_string_output(__unicode__)
-
     def tzname(self, dt):
         if self._name:
             return self._name
@@ -60,9 +173,18 @@ class Timezone(tzinfo):
         return hash(self._offset)
 
 
+def get_zone(name) -> tzinfo:
+    """
+    the tzinfo of an IANA time zone name, TEHRAN_ZONE for Asia/Tehran.
+    """
+    if name == TEHRAN_ZONE_NAME:
+        return globals().get("TEHRAN_ZONE") or __getattr__("TEHRAN_ZONE")
+    return _zoneinfo().ZoneInfo(name)
+
+
 class TehranTimezone(Timezone):
     """
-    Tehran timezone with a fixed +3:30 GMT offset.
+    Tehran timezone with a fixed +3:30 GMT offset. It ignores the historical DST periods, TEHRAN_ZONE does not.
     """
 
     def __init__(self):
@@ -1,26 +1,35 @@
 from datetime import datetime
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 
-import pytz
+from django_jalalify import timezone as jalalify_timezone
+from django_jalalify.cache import get_tehran_jalali_date_int
+from django_jalalify.clock import tehran_clock
+from django_jalalify.conversion import jalali_to_ordinal
+from django_jalalify.formatting import get_formatter
+from django_jalalify.parsing import parse_jalali_datetime
+from django_jalalify.timezone import TehranTimezone
 
-from django_jalalify import JalaliDatetime
-from django_jalalify.functions import convert_date_to_int, convert_time_to_int
-from django_jalalify.timezone import TEHRAN_ZONE, TEHRAN_LMT_ZONE,  TehranTimezone
+if TYPE_CHECKING:
+    from khayyam import JalaliDatetime
 
 
-def tehran_now() -> datetime: return datetime.now(pytz.timezone('Asia/Tehran'))
+def tehran_now() -> datetime: return datetime.now(jalalify_timezone.TEHRAN_ZONE)
 
 
-def get_now_tehran_jalali_datetime() -> JalaliDatetime:
-    return JalaliDatetime.now(TehranTimezone())
+def get_now_tehran_jalali_datetime() -> "JalaliDatetime":
+    from django_jalalify import JalaliDatetime
+
+    return JalaliDatetime.now(jalalify_timezone.TEHRAN_ZONE)
 
 
 def get_now_tehran_jalali_date_strftime(string_format="%Y/%m/%d") -> str:
-    return get_now_tehran_jalali_datetime().date().strftime(string_format)
+    now = tehran_clock.now()
+    return get_formatter(string_format, date_only=True).format(now.year, now.month, now.day)
 
 
 def get_now_tehran_jalali_time_strftime(string_format="%H:%M:%S") -> str:
-    return get_now_tehran_jalali_datetime().time().strftime(string_format)
+    # %f is the microseconds of the instant the snapshot of the tick was taken at, like the rest of the time
+    return tehran_clock.now().datetime.time().strftime(string_format)
 
 
 def get_now_tehran_jalali_date_intftime() -> int:
@@ -28,21 +37,23 @@ def get_now_tehran_jalali_date_intftime() -> int:
     convert today Jalali date as a integer date
     e.g: datetime(2023-03-29) => 1402/01/09 => 14020109
     """
-    today_jalali_date_strftime = get_now_tehran_jalali_date_strftime(string_format="%Y-%m-%d")
-    return convert_date_to_int(today_jalali_date_strftime)
+    return tehran_clock.now().date_int
 
 
 def get_now_tehran_jalali_time_intftime() -> int:
-    today_jalali_time_strftime = get_now_tehran_jalali_time_strftime(string_format="%H:%M:%S")
-    return convert_time_to_int(today_jalali_time_strftime)
+    return tehran_clock.now().time_int
 
 
 def get_tehran_timestamp_with_three_digits_of_microsecond_accuracy(timestamp) -> str:
-    return timestamp.astimezone(TEHRAN_ZONE).strftime("%Y/%m/%d %H:%M:%S:%f")[:-3]
+    return timestamp.astimezone(jalalify_timezone.TEHRAN_ZONE).strftime("%Y/%m/%d %H:%M:%S:%f")[:-3]
 
 
 def get_jalali_tehran_datetime_from_date_string(time) -> datetime:
-    return JalaliDatetime.strptime(time, "%Y/%m/%d %H:%M:%S").replace(tzinfo=TehranTimezone).todatetime()
+    """
+    parse "1402/01/09 10:20:30" to datetime.datetime(2023, 3, 29, 10, 20, 30, tzinfo=+03:30), with a new fixed offset
+    TehranTimezone like the other jalali string and integer parsers.
+    """
+    return parse_jalali_datetime(time).replace(tzinfo=TehranTimezone())
 
 
 def int_jalali_date_to_jalali_datetime(date) -> datetime:
@@ -53,16 +64,16 @@ def int_jalali_date_to_jalali_datetime(date) -> datetime:
     date //= 100
     month = date % 100
     year = date // 100
-    return JalaliDatetime(year=year, month=month, day=day, tzinfo=TehranTimezone()).todatetime()
+    return datetime.fromordinal(jalali_to_ordinal(year, month, day)).replace(tzinfo=TehranTimezone())
 
 
 def str_of_int_to_jalali_datetime(date, time) -> datetime:
     """
     convert "14020202", "101010" to datetime.datetime(2022, 3, 25, 0, 0, tzinfo=+03:30 dst:60).
     """
-    return JalaliDatetime(year=int(date[:4]), month=int(date[4:6]), day=int(date[6:8]),
-                          hour=int(time[:2]), minute=int(time[2:4]), second=int(time[4:6]),
-                          tzinfo=TehranTimezone()).todatetime()
+    gregorian_date = datetime.fromordinal(jalali_to_ordinal(int(date[:4]), int(date[4:6]), int(date[6:8])))
+    return gregorian_date.replace(hour=int(time[:2]), minute=int(time[2:4]), second=int(time[4:6]),
+                                  tzinfo=TehranTimezone())
 
 
 def jalali_datetime_to_int(jalali_datetime) -> Tuple:
@@ -80,5 +91,4 @@ def convert_datetime_to_custom_jalali_date(date_time: datetime) -> int:
     Convert input date to Jalali integer date
     e.g: datetime(2023-03-29) => 1402/01/09 => 14020109
     """
-    date_in_jalali = JalaliDatetime(date_time.astimezone(TEHRAN_LMT_ZONE)).strftime(format_string="%Y%m%d")
-    return convert_date_to_int(date_in_jalali)
+    return get_tehran_jalali_date_int(date_time)
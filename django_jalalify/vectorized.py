@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+NumPy batch versions of the integer jalali helpers.
+
+Dates are handled as ``int32`` arrays of YYYYMMDD (e.g. 14020109) and times as ``int32`` arrays of HHMMSS, both in
+Tehran local time, the same as :func:`django_jalalify.utils.convert_datetime_to_custom_jalali_date` and
+:func:`django_jalalify.utils.get_now_tehran_jalali_time_intftime`. Install the ``numpy`` extra to use this module::
+
+    pip install django-jalalify[numpy]
+"""
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("django_jalalify.vectorized requires numpy, install it with: pip install django-jalalify[numpy]")
+
+from django_jalalify.conversion import _MONTH_OFFSETS, get_year_starts
+from django_jalalify.timezone import get_tehran_utc_transitions
+
+SECONDS_PER_DAY = 86400
+# date(1970, 1, 1).toordinal()
+EPOCH_ORDINAL = 719163
+
+_MONTH_OFFSETS_ARRAY = np.array(_MONTH_OFFSETS, dtype=np.int64)
+
+
+def _to_epoch_seconds(values) -> np.ndarray:
+    """
+    datetime64 arrays (naive values are taken as UTC) are truncated to seconds, numbers are taken as epoch seconds.
+    """
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[s]").astype(np.int64)
+    return np.floor(values).astype(np.int64)
+
+
+def _tehran_offsets(epoch_seconds) -> np.ndarray:
+    instants, offsets = get_tehran_utc_transitions()
+    index = np.searchsorted(np.array(instants, dtype=np.int64), epoch_seconds, side="right") - 1
+    return np.array(offsets, dtype=np.int64)[np.maximum(index, 0)]
+
+
+def _ordinals_to_jalali_ints(ordinals) -> np.ndarray:
+    first_year, starts = get_year_starts()
+    starts = np.array(starts, dtype=np.int64)
+    if ordinals.size and (ordinals.min() < starts[0] or ordinals.max() >= starts[-1]):
+        raise ValueError("Dates must be inside the jalali year window, see conversion.set_year_window()")
+    index = np.searchsorted(starts, ordinals, side="right") - 1
+    day_of_year = ordinals - starts[index]
+    first_half = day_of_year < 186
+    month = np.where(first_half, day_of_year // 31 + 1, (day_of_year - 186) // 30 + 7)
+    day = np.where(first_half, day_of_year % 31 + 1, (day_of_year - 186) % 30 + 1)
+    return ((first_year + index) * 10000 + month * 100 + day).astype(np.int32)
+
+
+def to_jalali_ints(values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    convert an array of UTC datetime64 values or epoch seconds to Tehran jalali (YYYYMMDD, HHMMSS) int32 arrays.
+    e.g: np.datetime64("2023-03-29T06:30:00") => (14020109, 100000)
+    """
+    local_seconds = _to_epoch_seconds(values)
+    local_seconds = local_seconds + _tehran_offsets(local_seconds)
+    days, seconds_of_day = np.divmod(local_seconds, SECONDS_PER_DAY)
+    dates = _ordinals_to_jalali_ints(days + EPOCH_ORDINAL)
+    hours, seconds_of_hour = np.divmod(seconds_of_day, 3600)
+    minutes, seconds = np.divmod(seconds_of_hour, 60)
+    return dates, (hours * 10000 + minutes * 100 + seconds).astype(np.int32)
+
+
+def to_jalali_date_ints(values) -> np.ndarray:
+    return to_jalali_ints(values)[0]
+
+
+def to_jalali_time_ints(values) -> np.ndarray:
+    return to_jalali_ints(values)[1]
+
+
+def from_jalali_ints(dates, times: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    convert arrays of Tehran jalali YYYYMMDD dates and HHMMSS times (midnight when omitted) to UTC datetime64[s].
+    e.g: (14020109, 100000) => np.datetime64("2023-03-29T06:30:00")
+    local times repeated at the end of a DST period are resolved to the standard time (later) instant.
+    :raise ValueError: when a date does not exist or is outside the year window, or a time is invalid.
+    """
+    dates = np.asarray(dates, dtype=np.int64)
+    year, month, day = dates // 10000, dates // 100 % 100, dates % 100
+    first_year, starts = get_year_starts()
+    year_index = year - first_year
+    if dates.size and (year_index.min() < 0 or year_index.max() >= len(starts) - 1):
+        raise ValueError("Dates must be inside the jalali year window, see conversion.set_year_window()")
+    starts = np.array(starts, dtype=np.int64)
+    leap = starts[year_index + 1] - starts[year_index] == 366
+    month_days = np.where(month <= 6, 31, np.where(month <= 11, 30, np.where(leap, 30, 29)))
+    if np.any((month < 1) | (month > 12) | (day < 1) | (day > month_days)):
+        raise ValueError("Invalid jalali date in %s" % dates[(month < 1) | (month > 12) | (day < 1) | (day > month_days)])
+    ordinals = starts[year_index] + _MONTH_OFFSETS_ARRAY[np.clip(month, 0, 12)] + day - 1
+    local_seconds = (ordinals - EPOCH_ORDINAL) * SECONDS_PER_DAY
+    if times is not None:
+        times = np.asarray(times, dtype=np.int64)
+        hour, minute, second = times // 10000, times // 100 % 100, times % 100
+        invalid = (times < 0) | (hour > 23) | (minute > 59) | (second > 59)
+        if np.any(invalid):
+            raise ValueError("Invalid time in %s" % times[invalid])
+        local_seconds = local_seconds + hour * 3600 + minute * 60 + second
+    # look the offset up with a guess of the instant, and once more to settle at the offset in effect at that instant
+    utc_seconds = local_seconds - _tehran_offsets(local_seconds - 12600)
+    utc_seconds = local_seconds - _tehran_offsets(utc_seconds)
+    return utc_seconds.astype("datetime64[s]")
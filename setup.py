@@ -1,3 +1,8 @@
-from setuptools import setup
+from setuptools import Extension, setup
 
-setup()
\ No newline at end of file
+setup(
+    ext_modules=[
+        # optional: when it can not be built (no compiler, PyPy, ...) the pure python implementation is used
+        Extension("django_jalalify._speedups", ["django_jalalify/_speedups.c"], optional=True),
+    ],
+)